@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+VGGT stage별 latency 벤치마크 (device / precision / torch.compile 비교)
+
+demo_colmap.run_VGGT와 같은 순서로 aggregator → camera head → depth head를 실행하고
+stage별 시간을 잰다. precision마다 fp32 결과 대비 depth / pose 오차도 함께 출력해서
+CPU 워커에서 bf16을 써도 되는지 판단할 수 있게 함.
+
+사용법:
+    # GPU: bf16 / fp16 / fp32 비교
+    PYTHONPATH=./libs/vggt python bench_vggt_stages.py --device cuda --precision bf16 fp16 fp32
+
+    # CPU 워커: 작은 scene (8 frames), 가중치 다운로드 없이 랜덤 초기화
+    PYTHONPATH=./libs/vggt python bench_vggt_stages.py --device cpu --num_frames 8 --random_init \\
+        --precision fp32 bf16 --compile
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+
+import demo_colmap
+from demo_colmap import autocast_context, compile_model, select_device, select_dtype
+
+STAGES = ("aggregator", "camera_head", "depth_head")
+PRECISIONS = {"bf16": torch.bfloat16, "fp16": torch.float16, "fp32": torch.float32}
+
+
+def _sync(device):
+    if torch.device(device).type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def run_stages(model, images, dtype):
+    """run_VGGT의 forward 부분을 stage별로 시간 측정 (images: [S, 3, H, W], 이미 device 위)"""
+    device = images.device
+    timings = {}
+    with torch.no_grad():
+        _sync(device)
+        start = time.perf_counter()
+        with autocast_context(device, dtype):
+            aggregated_tokens_list, ps_idx = model.aggregator(images[None])
+        _sync(device)
+        timings["aggregator"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pose_enc = model.camera_head(aggregated_tokens_list)[-1]
+        _sync(device)
+        timings["camera_head"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        depth_map, depth_conf = model.depth_head(aggregated_tokens_list, images[None], ps_idx)
+        _sync(device)
+        timings["depth_head"] = time.perf_counter() - start
+    return timings, pose_enc.float().cpu(), depth_map.float().cpu()
+
+
+def benchmark(model, images, dtype, warmup, repeats):
+    """warmup 후 repeats회 측정, stage별 median (초)과 마지막 출력 반환"""
+    for _ in range(warmup):
+        run_stages(model, images, dtype)
+    if torch.device(images.device).type == "cuda":
+        torch.cuda.reset_peak_memory_stats(images.device)
+
+    samples = {stage: [] for stage in STAGES}
+    for _ in range(repeats):
+        timings, pose_enc, depth_map = run_stages(model, images, dtype)
+        for stage in STAGES:
+            samples[stage].append(timings[stage])
+
+    result = {stage: float(np.median(values)) for stage, values in samples.items()}
+    if torch.device(images.device).type == "cuda":
+        result["peak_mem_gb"] = torch.cuda.max_memory_allocated(images.device) / 1024 ** 3
+    return result, pose_enc, depth_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description='VGGT per-stage latency benchmark')
+    parser.add_argument('--device', type=str, default='auto', help='auto / cuda / cuda:N / cpu')
+    parser.add_argument('--precision', type=str, nargs='+', default=['auto', 'fp32'],
+                        choices=['auto'] + list(PRECISIONS), help='비교할 precision (여러 개 지정 가능)')
+    parser.add_argument('--compile', action='store_true', help='torch.compile 적용 결과도 측정')
+    parser.add_argument('--num_frames', type=int, default=16, help='frame 수 (default: 16)')
+    parser.add_argument('--resolution', type=int, default=demo_colmap.VGGT_FIXED_RESOLUTION,
+                        help='입력 해상도 (default: 518)')
+    parser.add_argument('--checkpoint', type=str, default=None, help='로컬 체크포인트 (None = hub)')
+    parser.add_argument('--random_init', action='store_true',
+                        help='가중치 로드 생략 (latency만 측정, 오차 비교는 의미 없음)')
+    parser.add_argument('--warmup', type=int, default=2, help='warmup 반복 수 (default: 2)')
+    parser.add_argument('--repeats', type=int, default=5, help='측정 반복 수 (default: 5)')
+    args = parser.parse_args()
+
+    device = select_device(args.device)
+    if args.random_init:
+        model = demo_colmap.VGGT().eval().to(device)
+    else:
+        model = demo_colmap.load_model(device, args.checkpoint)
+
+    torch.manual_seed(0)
+    images = torch.rand(args.num_frames, 3, args.resolution, args.resolution, device=device)
+    print(f"🖥️  device: {device}, {args.num_frames} frames @ {args.resolution}, torch {torch.__version__}")
+
+    # precision 이름이 달라도 같은 dtype이면 한 번만 측정 (예: CPU에서 auto == fp32)
+    configs, seen_dtypes = [], set()
+    for precision in args.precision:
+        dtype = select_dtype(device, precision)
+        if dtype not in seen_dtypes:
+            seen_dtypes.add(dtype)
+            configs.append((precision, False))
+    if args.compile:
+        configs += [(precision, True) for precision, _ in configs]
+
+    results = []
+    reference = None
+    eager_stages = {stage: getattr(model, stage) for stage in STAGES}
+    for precision, compiled in configs:
+        for stage, module in eager_stages.items():
+            setattr(model, stage, module)
+        if compiled:
+            compile_model(model)
+        dtype = select_dtype(device, precision)
+        try:
+            timings, pose_enc, depth_map = benchmark(model, images, dtype, args.warmup, args.repeats)
+        except RuntimeError as e:  # 예: CPU에서 지원하지 않는 fp16 커널
+            print(f"⚠️  {precision}{' +compile' if compiled else ''} 실패: {e}")
+            continue
+        if dtype == torch.float32 and not compiled and reference is None:
+            reference = (pose_enc, depth_map)
+        results.append((precision, dtype, compiled, timings, pose_enc, depth_map))
+    for stage, module in eager_stages.items():
+        setattr(model, stage, module)
+
+    if not results:
+        return
+    baseline = sum(results[0][3][stage] for stage in STAGES)
+    print()
+    print(f"{'precision':<16}{'aggregator':>12}{'camera':>10}{'depth':>10}{'total':>10}{'speedup':>9}"
+          f"{'depth err':>11}{'pose err':>10}{'mem GB':>8}")
+    for precision, dtype, compiled, timings, pose_enc, depth_map in results:
+        name = f"{precision}({str(dtype).replace('torch.', '')})" + ('+c' if compiled else '')
+        total = sum(timings[stage] for stage in STAGES)
+        if reference is not None:
+            depth_err = f"{(depth_map - reference[1]).abs().median().item() / reference[1].abs().median().item():.2e}"
+            pose_err = f"{(pose_enc - reference[0]).abs().max().item():.2e}"
+        else:
+            depth_err = pose_err = '-'
+        mem = f"{timings['peak_mem_gb']:.2f}" if 'peak_mem_gb' in timings else '-'
+        print(f"{name:<16}{timings['aggregator'] * 1000:>10.1f}ms{timings['camera_head'] * 1000:>8.1f}ms"
+              f"{timings['depth_head'] * 1000:>8.1f}ms{total * 1000:>8.1f}ms{baseline / total:>8.2f}x"
+              f"{depth_err:>11}{pose_err:>10}{mem:>8}")
+
+
+if __name__ == '__main__':
+    main()
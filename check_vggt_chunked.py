@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+run_VGGT_chunked 검증: CPU stub 모델로 chunk 병합이 unchunked 결과와 같은지 확인
+
+StubVGGT는 aggregator / camera_head / depth_head만 가진 작은 CPU 모델로,
+이미지 값에 넣어 둔 frame id로 프레임별 고정 pose / depth를 내보낸다.
+VGGT처럼 호출의 첫 프레임(anchor)이 world frame이고, 호출마다 (frame 구성에 따라) 다른
+scale이 곱해지므로 chunk 사이 scale 불일치를 재현한다.
+
+확인 항목:
+    1. chunk_size >= N: chunked 결과 == run_VGGT 한 번 (scale 1, 그대로 복사)
+    2. 겹치는 chunk: 회전 / intrinsic은 그대로, translation / depth는 모든 프레임에서
+       같은 global scale 하나 차이 (estimate_depth_scale로 chunk scale 복원)
+
+사용법:
+    PYTHONPATH=./libs/vggt python check_vggt_chunked.py
+    PYTHONPATH=./libs/vggt python check_vggt_chunked.py --num_frames 40 --chunk_size 12 --overlap 4
+"""
+import argparse
+import contextlib
+import io
+import sys
+
+import numpy as np
+import torch
+
+from demo_colmap import make_chunk_indices, run_VGGT, run_VGGT_chunked
+
+
+class StubVGGT(torch.nn.Module):
+    """
+    aggregator / camera_head / depth_head만 흉내 내는 CPU stub (가중치 없음)
+
+    - frame id = 이미지의 [0, 0, 0] 값
+    - frame i의 GT: 작은 랜덤 회전 (quaternion) + translation + 양수 depth map, frame 0은 identity
+    - 출력은 absT_quaR_FoV pose encoding (quaternion은 real part 마지막)
+    - 호출마다 frame id 구성으로 정해지는 scale을 translation / depth에 곱함
+    """
+
+    def __init__(self, fov=1.0):
+        super().__init__()
+        self.fov = fov
+        self.scales = []  # 호출별 scale (검증용)
+
+    @staticmethod
+    def ground_truth(frame_id, height, width):
+        rng = np.random.default_rng(1000 + frame_id)
+        if frame_id == 0:
+            quat, trans = np.array([0.0, 0.0, 0.0, 1.0]), np.zeros(3)
+        else:
+            quat = np.concatenate([rng.normal(scale=0.1, size=3), [1.0]])
+            quat /= np.linalg.norm(quat)
+            trans = rng.normal(size=3)
+        depth = rng.uniform(1.0, 5.0, size=(height, width, 1))
+        conf = rng.uniform(1.0, 3.0, size=(height, width))
+        return quat, trans, depth, conf
+
+    def aggregator(self, images):
+        frame_ids = images[0, :, 0, 0, 0].round().long().tolist()
+        if frame_ids[0] != 0:
+            raise ValueError(f"stub world frame is frame 0, but the call starts with frame {frame_ids[0]}")
+        self._frame_ids = frame_ids
+        self._hw = tuple(images.shape[-2:])
+        scale = float(np.random.default_rng(sum(frame_ids) * 31 + len(frame_ids)).uniform(0.5, 2.0))
+        self.scales.append(scale)
+        return [images], 0
+
+    def camera_head(self, aggregated_tokens_list):
+        scale = self.scales[-1]
+        pose_enc = []
+        for frame_id in self._frame_ids:
+            quat, trans, _, _ = self.ground_truth(frame_id, *self._hw)
+            pose_enc.append(np.concatenate([trans * scale, quat, [self.fov, self.fov]]))
+        return [torch.tensor(np.array(pose_enc), dtype=torch.float32)[None]]
+
+    def depth_head(self, aggregated_tokens_list, images, ps_idx):
+        scale = self.scales[-1]
+        gts = [self.ground_truth(frame_id, *self._hw) for frame_id in self._frame_ids]
+        depth = torch.tensor(np.stack([gt[2] for gt in gts]) * scale, dtype=torch.float32)
+        conf = torch.tensor(np.stack([gt[3] for gt in gts]), dtype=torch.float32)
+        return depth[None], conf[None]
+
+
+def make_images(num_frames, size):
+    """frame id를 픽셀 값으로 가진 [S, 3, size, size] 이미지"""
+    return torch.arange(num_frames, dtype=torch.float32).view(-1, 1, 1, 1).expand(-1, 3, size, size).contiguous()
+
+
+def check(num_frames, chunk_size, overlap, size, atol=1e-4):
+    images = make_images(num_frames, size)
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = run_VGGT(StubVGGT(), images, torch.float32, resolution=size)
+        model = StubVGGT()
+        chunked = run_VGGT_chunked(model, images, torch.float32, resolution=size,
+                                   chunk_size=chunk_size, overlap=overlap)
+    ref_extrinsic, ref_intrinsic, ref_depth, _ = reference
+    extrinsic, intrinsic, depth, conf = chunked
+
+    # chunk 하나면 global scale도 1 (그대로 복사), 아니면 첫 chunk scale / 전체 scale
+    global_scale = float(np.median(depth / ref_depth))
+    errors = {
+        "rotation": np.abs(extrinsic[:, :, :3] - ref_extrinsic[:, :, :3]).max(),
+        "translation": np.abs(extrinsic[:, :, 3] - ref_extrinsic[:, :, 3] * global_scale).max(),
+        "intrinsic": np.abs(intrinsic - ref_intrinsic).max(),
+        "depth": np.abs(depth - ref_depth * global_scale).max(),
+    }
+    ok = all(error <= atol for error in errors.values())
+    if chunk_size >= num_frames:
+        ok &= np.array_equal(depth, ref_depth) and np.array_equal(extrinsic, ref_extrinsic)
+
+    num_chunks = len(make_chunk_indices(num_frames, chunk_size, overlap))
+    scale_range = f"{min(model.scales):.2f}-{max(model.scales):.2f}"
+    print(f"{'✅' if ok else '❌'} N={num_frames:<3} chunk_size={chunk_size:<3} overlap={overlap:<2} "
+          f"{num_chunks} chunks (raw scales {scale_range}), global scale {global_scale:.4f} | "
+          + ", ".join(f"{name} {error:.1e}" for name, error in errors.items()))
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check run_VGGT_chunked against run_VGGT with a CPU stub model")
+    parser.add_argument("--num_frames", type=int, default=20)
+    parser.add_argument("--chunk_size", type=int, default=8)
+    parser.add_argument("--overlap", type=int, default=3)
+    parser.add_argument("--size", type=int, default=14, help="stub 이미지 해상도")
+    args = parser.parse_args()
+
+    cases = [
+        (args.num_frames, args.num_frames, args.overlap),  # chunk 하나
+        (args.num_frames, args.num_frames + 5, args.overlap),  # chunk_size > N
+        (args.num_frames, args.chunk_size, args.overlap),
+        (args.num_frames, args.chunk_size, 0),  # anchor만 공유
+    ]
+    ok = all([check(n, c, o, args.size) for n, c, o in cases])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,6 @@ import random
 import numpy as np
 import glob
 import os
-import copy
 import torch
 import torch.nn.functional as F
 
@@ -18,19 +17,29 @@ torch.backends.cudnn.benchmark = True
 torch.backends.cudnn.deterministic = False
 
 import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import trimesh
+from PIL import Image
 import pycolmap
 
 
 from vggt.models.vggt import VGGT
-from vggt.utils.load_fn import load_and_preprocess_images_square
 from vggt.utils.pose_enc import pose_encoding_to_extri_intri
 from vggt.utils.geometry import unproject_depth_map_to_point_map
 from vggt.utils.helper import create_pixel_coordinate_grid, randomly_limit_trues
 from vggt.dependency.track_predict import predict_tracks
 from vggt.dependency.np_to_pycolmap import batch_np_matrix_to_pycolmap, batch_np_matrix_to_pycolmap_wo_track
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "export"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "utils"))
+from colmap_binary import write_colmap_model_wo_track
+from ply_io import write_point_cloud_ply
+from point_filtering import adaptive_conf_threshold, multiview_consistency_mask, voxel_limit_trues
+
 
 # TODO: add support for masks
 # TODO: add iterative BA
@@ -39,10 +48,58 @@ from vggt.dependency.np_to_pycolmap import batch_np_matrix_to_pycolmap, batch_np
 # TODO: test different camera types
 
 
-def parse_args():
+VGGT_URL = "https://huggingface.co/facebook/VGGT-1B/resolve/main/model.pt"
+
+# Load Image in 1024 (only needed for BA tracking), while running VGGT with 518
+VGGT_FIXED_RESOLUTION = 518
+IMG_LOAD_RESOLUTION = 1024
+
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="VGGT Demo")
-    parser.add_argument("--scene_dir", type=str, required=True, help="Directory containing the scene images")
+    scene_group = parser.add_mutually_exclusive_group(required=True)
+    scene_group.add_argument("--scene_dir", type=str, help="Directory containing the scene images")
+    scene_group.add_argument(
+        "--scene_list",
+        type=str,
+        nargs="+",
+        help="Several scenes in one run (model loaded once): scene directories, glob patterns "
+        "(e.g. 'datasets/DTU/scan*_standard') or text files with one scene directory per line",
+    )
+    parser.add_argument(
+        "--summary_jsonl",
+        type=str,
+        default="scene_summary.jsonl",
+        help="With --scene_list, append per-scene timing and point counts to this JSONL file",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="Local VGGT checkpoint (.safetensors or .pt), loaded memory-mapped (default: download from the hub)",
+    )
+    parser.add_argument(
+        "--server_socket",
+        type=str,
+        default=None,
+        help="Send the scene to a running vggt_server.py worker on this socket instead of loading the model "
+        "(fails if no worker is listening)",
+    )
     parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility")
+    ######### Device and precision #########
+    parser.add_argument(
+        "--device", type=str, default="auto", help="Device to run VGGT on: auto (CUDA if available), cuda, cuda:N or cpu"
+    )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        default="auto",
+        choices=["auto", "bf16", "fp16", "fp32"],
+        help="Autocast precision (auto: bf16 on Ampere+, fp16 on older GPUs, fp32 on CPU)",
+    )
+    parser.add_argument(
+        "--compile", action="store_true", default=False, help="torch.compile the aggregator and the heads"
+    )
     parser.add_argument("--use_ba", action="store_true", default=False, help="Use BA for reconstruction")
     ######### BA parameters #########
     parser.add_argument(
@@ -59,7 +116,101 @@ def parse_args():
     parser.add_argument(
         "--conf_thres_value", type=float, default=5.0, help="Confidence threshold value for depth filtering (wo BA)"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--conf_target_points",
+        type=int,
+        default=0,
+        help="Pick the confidence threshold from the depth_conf histogram so that about this many points pass "
+        "(wo BA, overrides --conf_thres_value, 0 = off)",
+    )
+    parser.add_argument(
+        "--conf_percentile",
+        type=float,
+        default=0.0,
+        help="Pick the confidence threshold as this percentile of depth_conf, e.g. 80 keeps the top 20%% "
+        "(wo BA, used when --conf_target_points is 0, 0 = off)",
+    )
+    ######### Multi-view consistency filter (wo BA) #########
+    parser.add_argument(
+        "--consistency_views",
+        type=int,
+        default=0,
+        help="Reproject each point into its K nearest views and drop depth disagreements (0 = off)",
+    )
+    parser.add_argument(
+        "--consistency_thresh", type=float, default=0.05, help="Maximum relative depth error to count a view as agreeing"
+    )
+    parser.add_argument(
+        "--consistency_min_views", type=int, default=1, help="Number of agreeing views needed to keep a point"
+    )
+    parser.add_argument(
+        "--max_points", type=int, default=100000, help="Maximum number of 3D points written to COLMAP (wo BA)"
+    )
+    parser.add_argument(
+        "--point_sampler",
+        type=str,
+        default="voxel",
+        choices=["voxel", "random"],
+        help="How to keep at most --max_points points: highest-confidence point per voxel, or uniformly at random",
+    )
+    parser.add_argument(
+        "--voxel_size",
+        type=float,
+        default=0.0,
+        help="Voxel size for --point_sampler voxel, in VGGT world units (0 = pick the size that fits --max_points)",
+    )
+    parser.add_argument(
+        "--colmap_writer",
+        type=str,
+        default="numpy",
+        choices=["numpy", "pycolmap"],
+        help="How to write the feed-forward (wo BA) reconstruction: NumPy binary writer or pycolmap.Reconstruction",
+    )
+    ######### Image loading #########
+    parser.add_argument("--load_workers", type=int, default=8, help="Number of threads decoding and resizing images")
+    parser.add_argument(
+        "--load_batch_size", type=int, default=16, help="Number of images decoded ahead of the consumer at most"
+    )
+    ######### Chunked inference #########
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=0,
+        help="Run VGGT on overlapping windows of at most this many frames (0 = whole scene in one batch)",
+    )
+    parser.add_argument(
+        "--chunk_overlap", type=int, default=8, help="Number of frames shared by consecutive chunks (besides the anchor)"
+    )
+    return parser.parse_args(argv)
+
+
+def select_device(device="auto"):
+    """Resolve --device; auto picks CUDA when available."""
+    if device == "auto":
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    if device.startswith("cuda") and not torch.cuda.is_available():
+        raise ValueError(f"--device {device} requested but CUDA is not available")
+    return device
+
+
+def select_dtype(device, precision="auto"):
+    """
+    Resolve --precision to the autocast dtype for the device.
+
+    auto keeps the previous CUDA behaviour (bf16 on compute capability >= 8, fp16 otherwise) and uses fp32 on CPU,
+    where bf16 autocast only pays off on CPUs with native bf16 support (AVX512-BF16 / AMX); request it with bf16.
+    torch.float32 means autocast disabled.
+    """
+    if precision == "auto":
+        if torch.device(device).type == "cuda":
+            return torch.bfloat16 if torch.cuda.get_device_capability(device)[0] >= 8 else torch.float16
+        return torch.float32
+    return {"bf16": torch.bfloat16, "fp16": torch.float16, "fp32": torch.float32}[precision]
+
+
+def autocast_context(device, dtype):
+    """torch.autocast for any device type; a no-op for fp32."""
+    return torch.autocast(device_type=torch.device(device).type, dtype=dtype, enabled=dtype != torch.float32)
 
 
 def run_VGGT(model, images, dtype, resolution=518):
@@ -69,10 +220,11 @@ def run_VGGT(model, images, dtype, resolution=518):
     assert images.shape[1] == 3
 
     # hard-coded to use 518 for VGGT
-    images = F.interpolate(images, size=(resolution, resolution), mode="bilinear", align_corners=False)
+    if tuple(images.shape[-2:]) != (resolution, resolution):
+        images = F.interpolate(images, size=(resolution, resolution), mode="bilinear", align_corners=False)
 
     with torch.no_grad():
-        with torch.cuda.amp.autocast(dtype=dtype):
+        with autocast_context(images.device, dtype):
             images = images[None]  # add batch dimension
             aggregated_tokens_list, ps_idx = model.aggregator(images)
 
@@ -90,61 +242,458 @@ def run_VGGT(model, images, dtype, resolution=518):
     return extrinsic, intrinsic, depth_map, depth_conf
 
 
-def demo_fn(args):
+def load_square_image(image_path, resolutions, coords_resolution):
+    """
+    Decode one image, pad it to a square and resize it to every requested resolution.
+
+    Follows load_and_preprocess_images_square (white background for RGBA, black padding,
+    bicubic resize), but resizes the padded image straight to each target resolution
+    instead of going through a 1024 px intermediate.
+
+    Returns:
+        dict resolution -> (res, res, 3) uint8 array, and the original coords
+        [x1, y1, x2, y2, width, height] of the image inside the coords_resolution square
+    """
+    img = Image.open(image_path)
+    if img.mode == "RGBA":
+        background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img)
+    img = img.convert("RGB")
+
+    width, height = img.size
+    max_dim = max(width, height)
+    left = (max_dim - width) // 2
+    top = (max_dim - height) // 2
+
+    scale = coords_resolution / max_dim
+    coords = np.array(
+        [left * scale, top * scale, (left + width) * scale, (top + height) * scale, width, height]
+    )
+
+    square_img = Image.new("RGB", (max_dim, max_dim), (0, 0, 0))
+    square_img.paste(img, (left, top))
+    resized = {
+        res: np.asarray(square_img.resize((res, res), Image.Resampling.BICUBIC)) for res in resolutions
+    }
+    return resized, coords
+
+
+def iter_square_image_batches(image_path_list, resolutions, coords_resolution, batch_size=16, num_workers=8):
+    """
+    Decode images in a thread pool and yield them in order, in batches of at most batch_size.
+
+    At most 2 * batch_size images are decoded ahead of the consumer, so the decoder's own memory
+    stays bounded no matter how many images the scene has. Only consumers that process a batch
+    and drop it get bounded peak memory overall.
+
+    Yields:
+        start index, dict resolution -> [B, 3, res, res] float tensor in [0, 1], [B, 6] coords
+    """
+    max_pending = 2 * batch_size
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        pending = deque()
+        next_path = 0
+        start = 0
+        while start < len(image_path_list):
+            while next_path < len(image_path_list) and len(pending) < max_pending:
+                pending.append(
+                    executor.submit(load_square_image, image_path_list[next_path], resolutions, coords_resolution)
+                )
+                next_path += 1
+
+            batch = [pending.popleft().result() for _ in range(min(batch_size, len(pending)))]
+            images = {
+                res: torch.from_numpy(np.stack([item[0][res] for item in batch])).permute(0, 3, 1, 2).float() / 255.0
+                for res in resolutions
+            }
+            coords = torch.from_numpy(np.stack([item[1] for item in batch])).float()
+            yield start, images, coords
+            start += len(batch)
+
+
+def load_images_square_multires(image_path_list, resolutions, coords_resolution, batch_size=16, num_workers=8):
+    """
+    Load all images at each of the given square resolutions with a streaming thread-pool decoder.
+
+    Output tensors are preallocated once and filled batch by batch. Peak memory is therefore still
+    the full [S, 3, res, res] stack for every requested resolution (518 and, with BA, 1024):
+    streaming only bounds the number of images being decoded at once and skips the 1024 -> 518
+    intermediate. Unchunked VGGT inference and the BA tracker both need every frame at once; consumers
+    that can work batch by batch should use iter_square_image_batches directly.
+
+    Returns:
+        dict resolution -> [S, 3, res, res] float tensor, and [S, 6] original coords
+        (expressed in the coords_resolution square, like load_and_preprocess_images_square)
+    """
+    num_images = len(image_path_list)
+    images = {res: torch.empty((num_images, 3, res, res), dtype=torch.float32) for res in resolutions}
+    original_coords = torch.empty((num_images, 6), dtype=torch.float32)
+
+    for start, batch_images, batch_coords in iter_square_image_batches(
+        image_path_list, resolutions, coords_resolution, batch_size, num_workers
+    ):
+        end = start + len(batch_coords)
+        for res in resolutions:
+            images[res][start:end] = batch_images[res]
+        original_coords[start:end] = batch_coords
+
+    return images, original_coords
+
+
+def make_chunk_indices(num_frames, chunk_size, overlap):
+    """
+    Split frames into overlapping windows for chunked VGGT inference.
+
+    Frame 0 is the shared anchor and is the first frame of every chunk, so every chunk
+    predicts poses in the same world frame (the anchor camera) up to scale. Consecutive
+    chunks additionally share `overlap` frames, which are used to align the scale.
+    """
+    if num_frames <= chunk_size:
+        return [list(range(num_frames))]
+
+    body = chunk_size - 1  # frames per chunk besides the anchor
+    if overlap >= body:
+        raise ValueError(f"chunk_overlap ({overlap}) must be smaller than chunk_size - 1 ({body})")
+
+    chunks = []
+    start = 1
+    while True:
+        end = min(start + body, num_frames)
+        chunks.append([0] + list(range(start, end)))
+        if end >= num_frames:
+            return chunks
+        start = end - overlap
+
+
+def estimate_depth_scale(ref_depth, ref_conf, depth, conf):
+    """
+    Robust scale s such that s * depth ~= ref_depth, from pixels confident in both predictions.
+    """
+    ref_depth = ref_depth.reshape(-1)
+    depth = depth.reshape(-1)
+    valid = (ref_depth > 0) & (depth > 0)
+    if not valid.any():
+        return 1.0
+
+    # keep the more confident half of the valid pixels
+    joint_conf = np.minimum(ref_conf.reshape(-1), conf.reshape(-1))[valid]
+    keep = joint_conf >= np.median(joint_conf)
+    ratios = ref_depth[valid][keep] / depth[valid][keep]
+    return float(np.median(ratios))
+
+
+def run_VGGT_chunked(model, images, dtype, resolution=518, chunk_size=32, overlap=8, device=None):
+    """
+    Run VGGT on overlapping windows of frames and merge them into one global frame.
+
+    Every chunk starts with the anchor frame (frame 0), so all chunks share its camera as
+    world frame. The remaining per-chunk scale ambiguity is resolved by matching the depth of
+    the frames a chunk shares with already-merged chunks (anchor + overlap frames).
+    Peak memory is bounded by chunk_size instead of the number of frames.
+
+    Args:
+        model: VGGT model (or any module with aggregator / camera_head / depth_head)
+        images: [S, 3, H, W] tensor, may stay on CPU; each chunk is moved to `device` on its own
+        dtype: autocast dtype
+        resolution: VGGT input resolution
+        chunk_size: maximum number of frames per forward pass (including the anchor)
+        overlap: frames shared by consecutive chunks (besides the anchor)
+        device: device to run the model on (defaults to the device of the images)
+
+    Returns:
+        extrinsic [S, 3, 4], intrinsic [S, 3, 3], depth_map [S, h, w, 1], depth_conf [S, h, w]
+    """
+    num_frames = images.shape[0]
+    device = device if device is not None else images.device
+
+    extrinsic = intrinsic = depth_map = depth_conf = None
+    done = np.zeros(num_frames, dtype=bool)
+
+    for chunk_id, chunk in enumerate(make_chunk_indices(num_frames, chunk_size, overlap)):
+        chunk_images = images[chunk].to(device)
+        c_extrinsic, c_intrinsic, c_depth, c_conf = run_VGGT(model, chunk_images, dtype, resolution)
+        del chunk_images
+
+        if extrinsic is None:
+            extrinsic = np.zeros((num_frames,) + c_extrinsic.shape[1:], dtype=c_extrinsic.dtype)
+            intrinsic = np.zeros((num_frames,) + c_intrinsic.shape[1:], dtype=c_intrinsic.dtype)
+            depth_map = np.zeros((num_frames,) + c_depth.shape[1:], dtype=c_depth.dtype)
+            depth_conf = np.zeros((num_frames,) + c_conf.shape[1:], dtype=c_conf.dtype)
+            scale = 1.0
+        else:
+            # align scale on the frames already merged (anchor + overlap)
+            shared = [i for i, f in enumerate(chunk) if done[f]]
+            shared_frames = [chunk[i] for i in shared]
+            scale = estimate_depth_scale(
+                depth_map[shared_frames], depth_conf[shared_frames], c_depth[shared], c_conf[shared]
+            )
+
+        # world -> camera translation and depth scale together, rotation is unchanged
+        c_extrinsic = c_extrinsic.copy()
+        c_extrinsic[:, :, 3] *= scale
+        c_depth = c_depth * scale
+
+        new = [i for i, f in enumerate(chunk) if not done[f]]
+        new_frames = [chunk[i] for i in new]
+        extrinsic[new_frames] = c_extrinsic[new]
+        intrinsic[new_frames] = c_intrinsic[new]
+        depth_map[new_frames] = c_depth[new]
+        depth_conf[new_frames] = c_conf[new]
+        done[new_frames] = True
+
+        print(f"Chunk {chunk_id}: {len(chunk)} frames ({len(new)} new), scale {scale:.4f}")
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    return extrinsic, intrinsic, depth_map, depth_conf
+
+
+def load_vggt_state_dict(checkpoint=None):
+    """
+    Load the VGGT weights from a local checkpoint, or download them from the hub if None.
+
+    Local checkpoints are memory-mapped: .safetensors through safetensors, .pt through
+    torch.load(mmap=True, weights_only=True), so loading costs little more than the page cache reads.
+    """
+    if checkpoint is None:
+        return torch.hub.load_state_dict_from_url(VGGT_URL)
+    if checkpoint.endswith(".safetensors"):
+        from safetensors.torch import load_file
+
+        return load_file(checkpoint, device="cpu")
+    return torch.load(checkpoint, map_location="cpu", mmap=True, weights_only=True)
+
+
+def load_model(device, checkpoint=None, use_compile=False):
+    model = VGGT()
+    # with a local checkpoint, take over the memory-mapped tensors instead of copying them into the model
+    model.load_state_dict(load_vggt_state_dict(checkpoint), assign=checkpoint is not None)
+    model.eval()
+    model = model.to(device)
+    if use_compile:
+        compile_model(model)
+    return model
+
+
+def compile_model(model):
+    """
+    torch.compile the stages run_VGGT calls one by one (the model's own forward is never used).
+
+    dynamic=True since the number of frames changes from scene to scene (and from chunk to chunk).
+    """
+    model.aggregator = torch.compile(model.aggregator, dynamic=True)
+    model.camera_head = torch.compile(model.camera_head, dynamic=True)
+    model.depth_head = torch.compile(model.depth_head, dynamic=True)
+    return model
+
+
+def set_seed(seed):
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    random.seed(seed)
+    if torch.cuda.is_available():
+        torch.cuda.manual_seed(seed)
+        torch.cuda.manual_seed_all(seed)  # for multi-GPU
+
+
+def load_scene_images(scene_dir, use_ba, load_batch_size=16, load_workers=8):
+    """
+    Find and decode the images of a scene.
+
+    Images are decoded straight to 518 for VGGT; the 1024 copy is only materialized for BA tracking.
+    Both are full in-memory stacks (see load_images_square_multires).
+
+    Returns:
+        dict with image_dir, image_path_list, base_image_path_list, images_by_res and original_coords
+    """
+    image_dir = os.path.join(scene_dir, "images")
+    image_path_list = glob.glob(os.path.join(image_dir, "*"))
+    if len(image_path_list) == 0:
+        raise ValueError(f"No images found in {image_dir}")
+    base_image_path_list = [os.path.basename(path) for path in image_path_list]
+
+    resolutions = [VGGT_FIXED_RESOLUTION, IMG_LOAD_RESOLUTION] if use_ba else [VGGT_FIXED_RESOLUTION]
+    images_by_res, original_coords = load_images_square_multires(
+        image_path_list, resolutions, IMG_LOAD_RESOLUTION, load_batch_size, load_workers
+    )
+    return {
+        "image_dir": image_dir,
+        "image_path_list": image_path_list,
+        "base_image_path_list": base_image_path_list,
+        "images_by_res": images_by_res,
+        "original_coords": original_coords,
+    }
+
+
+def demo_fn(args, model=None):
     # Print configuration
     print("Arguments:", vars(args))
 
     # Set seed for reproducibility
-    np.random.seed(args.seed)
-    torch.manual_seed(args.seed)
-    random.seed(args.seed)
-    if torch.cuda.is_available():
-        torch.cuda.manual_seed(args.seed)
-        torch.cuda.manual_seed_all(args.seed)  # for multi-GPU
+    set_seed(args.seed)
     print(f"Setting seed as: {args.seed}")
 
     # Set device and dtype
-    dtype = torch.bfloat16 if torch.cuda.get_device_capability()[0] >= 8 else torch.float16
-    device = "cuda" if torch.cuda.is_available() else "cpu"
+    device = select_device(args.device)
+    if model is not None:
+        # an already loaded (resident) model stays where it is
+        param = next(model.parameters(), None)
+        device = str(param.device) if param is not None else device
+    dtype = select_dtype(device, args.precision)
     print(f"Using device: {device}")
     print(f"Using dtype: {dtype}")
 
     # Run VGGT for camera and depth estimation
-    model = VGGT()
-    _URL = "https://huggingface.co/facebook/VGGT-1B/resolve/main/model.pt"
-    model.load_state_dict(torch.hub.load_state_dict_from_url(_URL))
-    model.eval()
-    model = model.to(device)
-    print(f"Model loaded")
+    if model is None:
+        model = load_model(device, args.checkpoint, use_compile=args.compile)
+        print(f"Model loaded")
 
-    # Get image paths and preprocess them
-    image_dir = os.path.join(args.scene_dir, "images")
-    image_path_list = glob.glob(os.path.join(image_dir, "*"))
-    if len(image_path_list) == 0:
-        raise ValueError(f"No images found in {image_dir}")
-    base_image_path_list = [os.path.basename(path) for path in image_path_list]
+    if args.scene_list:
+        return reconstruct_scene_list(model, args, device, dtype)
 
-    # Load images and original coordinates
-    # Load Image in 1024, while running VGGT with 518
-    vggt_fixed_resolution = 518
-    img_load_resolution = 1024
+    # Get image paths and preprocess them
+    scene = load_scene_images(args.scene_dir, args.use_ba, args.load_batch_size, args.load_workers)
+    return reconstruct_scene(model, scene, args, device, dtype)
+
+
+def resolve_scene_list(entries):
+    """
+    Expand --scene_list entries (directories, glob patterns or text files listing directories)
+    into an ordered list of scene directories without duplicates.
+    """
+    scene_dirs = []
+    for entry in entries:
+        if os.path.isfile(entry):
+            with open(entry) as f:
+                lines = [line.strip() for line in f]
+            scene_dirs.extend(line for line in lines if line and not line.startswith("#"))
+        elif any(char in entry for char in "*?["):
+            scene_dirs.extend(path for path in sorted(glob.glob(entry)) if os.path.isdir(path))
+        else:
+            scene_dirs.append(entry)
+    # the same scene reached through several entries is processed once
+    unique_scene_dirs = {}
+    for scene_dir in scene_dirs:
+        unique_scene_dirs.setdefault(os.path.abspath(scene_dir), scene_dir)
+    return list(unique_scene_dirs.values())
+
+
+def _timed_load_scene_images(*load_args):
+    start = time.perf_counter()
+    scene = load_scene_images(*load_args)
+    scene["load_time"] = time.perf_counter() - start
+    return scene
+
+
+def reconstruct_scene_list(model, args, device, dtype):
+    """
+    Reconstruct every scene of args.scene_list with the same model.
+
+    The images of the next scene are decoded in a background thread while VGGT runs on the current one.
+    One JSON line per scene (timings, image / point counts, or the error) is appended to args.summary_jsonl,
+    and a failing scene does not stop the others.
+
+    Returns:
+        list of the per-scene summaries
+    """
+    scene_dirs = resolve_scene_list(args.scene_list)
+    if len(scene_dirs) == 0:
+        raise ValueError(f"No scenes found for {args.scene_list}")
+    print(f"Processing {len(scene_dirs)} scenes, summary: {args.summary_jsonl}")
+
+    def submit_load(scene_dir):
+        return loader.submit(
+            _timed_load_scene_images, scene_dir, args.use_ba, args.load_batch_size, args.load_workers
+        )
 
-    images, original_coords = load_and_preprocess_images_square(image_path_list, img_load_resolution)
-    images = images.to(device)
-    original_coords = original_coords.to(device)
-    print(f"Loaded {len(images)} images from {image_dir}")
+    summaries = []
+    run_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=1) as loader, open(args.summary_jsonl, "a") as summary_file:
+        next_scene = submit_load(scene_dirs[0])
+        for scene_idx, scene_dir in enumerate(scene_dirs):
+            print(f"[{scene_idx + 1}/{len(scene_dirs)}] {scene_dir}")
+            summary = {"scene_dir": scene_dir}
+            scene_start = time.perf_counter()
+            try:
+                scene = next_scene.result()
+                summary["load_wait_time"] = time.perf_counter() - scene_start
+                summary["load_time"] = scene.pop("load_time")
+            except Exception as e:
+                scene = None
+                summary.update(ok=False, error=f"{type(e).__name__}: {e}")
+
+            # decode the next scene while this one is on the GPU
+            if scene_idx + 1 < len(scene_dirs):
+                next_scene = submit_load(scene_dirs[scene_idx + 1])
+
+            if scene is not None:
+                try:
+                    # same seed as a single-scene run, so the results do not depend on the position in the list
+                    set_seed(args.seed)
+                    scene_args = argparse.Namespace(**{**vars(args), "scene_dir": scene_dir, "scene_list": None})
+                    summary.update(reconstruct_scene(model, scene, scene_args, device, dtype), ok=True)
+                except Exception as e:
+                    summary.update(ok=False, error=f"{type(e).__name__}: {e}")
+                del scene
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+
+            summary["total_time"] = time.perf_counter() - scene_start
+            if not summary["ok"]:
+                print(f"Failed {scene_dir}: {summary['error']}")
+            summary_file.write(json.dumps(summary) + "\n")
+            summary_file.flush()
+            summaries.append(summary)
+
+    num_ok = sum(summary["ok"] for summary in summaries)
+    print(f"Done: {num_ok}/{len(summaries)} scenes in {time.perf_counter() - run_start:.1f}s")
+    return summaries
+
+
+def reconstruct_scene(model, scene, args, device, dtype):
+    """
+    Run VGGT (+ optional BA) on already decoded scene images and write the COLMAP reconstruction
+    to args.scene_dir/sparse.
+
+    Returns:
+        dict with the number of images and 3D points and the inference / reconstruction / write times
+    """
+    start = time.perf_counter()
+    vggt_fixed_resolution = VGGT_FIXED_RESOLUTION
+    img_load_resolution = IMG_LOAD_RESOLUTION
+    base_image_path_list = scene["base_image_path_list"]
+    images_by_res = scene["images_by_res"]
+    original_coords = scene["original_coords"]
+
+    vggt_images = images_by_res[vggt_fixed_resolution]
+    use_chunks = args.chunk_size > 0 and len(vggt_images) > args.chunk_size
+    print(f"Loaded {len(vggt_images)} images from {scene['image_dir']}")
 
     # Run VGGT to estimate camera and depth
     # Run with 518x518 images
-    extrinsic, intrinsic, depth_map, depth_conf = run_VGGT(model, images, dtype, vggt_fixed_resolution)
+    if use_chunks:
+        # images stay on CPU, each chunk is moved to the device on its own
+        extrinsic, intrinsic, depth_map, depth_conf = run_VGGT_chunked(
+            model, vggt_images, dtype, vggt_fixed_resolution, args.chunk_size, args.chunk_overlap, device
+        )
+    else:
+        extrinsic, intrinsic, depth_map, depth_conf = run_VGGT(
+            model, vggt_images.to(device), dtype, vggt_fixed_resolution
+        )
     points_3d = unproject_depth_map_to_point_map(depth_map, extrinsic, intrinsic)
+    inference_end = time.perf_counter()
 
     if args.use_ba:
+        # the 518 stack is not needed after inference; release it before the 1024 stack goes to the tracker
+        del vggt_images
+        images_by_res.pop(vggt_fixed_resolution)
+        images = images_by_res.pop(img_load_resolution).to(device)  # the tracker needs every frame at once
         image_size = np.array(images.shape[-2:])
         scale = img_load_resolution / vggt_fixed_resolution
         shared_camera = args.shared_camera
 
-        with torch.cuda.amp.autocast(dtype=dtype):
+        with autocast_context(device, dtype):
             # Predicting Tracks
             # Using VGGSfM tracker instead of VGGT tracker for efficiency
             # VGGT tracker requires multiple backbone runs to query different frames (this is a problem caused by the training process)
@@ -193,96 +742,165 @@ def demo_fn(args):
         reconstruction_resolution = img_load_resolution
     else:
         conf_thres_value = args.conf_thres_value
-        max_points_for_colmap = 100000  # randomly sample 3D points
+        if args.conf_target_points > 0 or args.conf_percentile > 0:
+            # adapt the threshold to the data instead of a fixed value
+            if args.conf_target_points > 0:
+                conf_thres_value = adaptive_conf_threshold(depth_conf, target_count=args.conf_target_points)
+                target = f"target {args.conf_target_points} points"
+            else:
+                conf_thres_value = adaptive_conf_threshold(depth_conf, percentile=args.conf_percentile)
+                target = f"percentile {args.conf_percentile}"
+            print(
+                f"Adaptive confidence threshold: {conf_thres_value:.4f} ({target}, "
+                f"keeps {(depth_conf >= conf_thres_value).sum()} / {depth_conf.size} points)"
+            )
+        max_points_for_colmap = args.max_points
         shared_camera = False  # in the feedforward manner, we do not support shared camera
         camera_type = "PINHOLE"  # in the feedforward manner, we only support PINHOLE camera
 
         image_size = np.array([vggt_fixed_resolution, vggt_fixed_resolution])
         num_frames, height, width, _ = points_3d.shape
 
-        points_rgb = F.interpolate(
-            images, size=(vggt_fixed_resolution, vggt_fixed_resolution), mode="bilinear", align_corners=False
-        )
-        points_rgb = (points_rgb.cpu().numpy() * 255).astype(np.uint8)
+        points_rgb = (vggt_images.numpy() * 255).astype(np.uint8)
         points_rgb = points_rgb.transpose(0, 2, 3, 1)
 
         # (S, H, W, 3), with x, y coordinates and frame indices
         points_xyf = create_pixel_coordinate_grid(num_frames, height, width)
 
         conf_mask = depth_conf >= conf_thres_value
-        # at most writing 100000 3d points to colmap reconstruction object
-        conf_mask = randomly_limit_trues(conf_mask, max_points_for_colmap)
+        if args.consistency_views > 0:
+            # drop floaters whose depth disagrees with the nearest views
+            num_candidates = conf_mask.sum()
+            conf_mask = multiview_consistency_mask(
+                points_3d,
+                depth_map,
+                extrinsic,
+                intrinsic,
+                mask=conf_mask,
+                num_views=args.consistency_views,
+                rel_thresh=args.consistency_thresh,
+                min_consistent=args.consistency_min_views,
+            )
+            print(f"Multi-view consistency: kept {conf_mask.sum()} / {num_candidates} points")
+        # at most writing max_points 3d points to colmap reconstruction object
+        if args.point_sampler == "voxel":
+            # keep the most confident point per voxel so dense near-camera regions do not take the whole budget
+            conf_mask = voxel_limit_trues(points_3d, depth_conf, conf_mask, max_points_for_colmap, args.voxel_size)
+        else:
+            conf_mask = randomly_limit_trues(conf_mask, max_points_for_colmap)
 
         points_3d = points_3d[conf_mask]
         points_xyf = points_xyf[conf_mask]
         points_rgb = points_rgb[conf_mask]
 
-        print("Converting to COLMAP format")
-        reconstruction = batch_np_matrix_to_pycolmap_wo_track(
-            points_3d,
-            points_xyf,
-            points_rgb,
-            extrinsic,
-            intrinsic,
-            image_size,
-            shared_camera=shared_camera,
-            camera_type=camera_type,
-        )
+        if args.colmap_writer == "numpy":
+            reconstruction = None  # the binaries are written straight from the arrays below
+        else:
+            print("Converting to COLMAP format")
+            reconstruction = batch_np_matrix_to_pycolmap_wo_track(
+                points_3d,
+                points_xyf,
+                points_rgb,
+                extrinsic,
+                intrinsic,
+                image_size,
+                shared_camera=shared_camera,
+                camera_type=camera_type,
+            )
 
         reconstruction_resolution = vggt_fixed_resolution
 
-    reconstruction = rename_colmap_recons_and_rescale_camera(
-        reconstruction,
-        base_image_path_list,
-        original_coords.cpu().numpy(),
-        img_size=reconstruction_resolution,
-        shift_point2d_to_original_res=True,
-        shared_camera=shared_camera,
-    )
-
-    print(f"Saving reconstruction to {args.scene_dir}/sparse")
+    reconstruction_end = time.perf_counter()
     sparse_reconstruction_dir = os.path.join(args.scene_dir, "sparse")
     os.makedirs(sparse_reconstruction_dir, exist_ok=True)
-    reconstruction.write(sparse_reconstruction_dir)
+    print(f"Saving reconstruction to {sparse_reconstruction_dir}")
+
+    if reconstruction is None:
+        # NumPy writer, no pycolmap.Reconstruction in between
+        rescaled_intrinsic, original_image_size, rescaled_points_xyf = rescale_np_matrix_to_original_res(
+            intrinsic, points_xyf, original_coords.numpy(), img_size=reconstruction_resolution
+        )
+        write_colmap_model_wo_track(
+            sparse_reconstruction_dir,
+            points_3d,
+            rescaled_points_xyf,
+            points_rgb,
+            extrinsic,
+            rescaled_intrinsic,
+            original_image_size,
+            image_names=base_image_path_list,
+            camera_type=camera_type,
+            shared_camera=shared_camera,
+        )
+    else:
+        reconstruction = rename_colmap_recons_and_rescale_camera(
+            reconstruction,
+            base_image_path_list,
+            original_coords.numpy(),
+            img_size=reconstruction_resolution,
+            shift_point2d_to_original_res=True,
+            shared_camera=shared_camera,
+        )
+        reconstruction.write(sparse_reconstruction_dir)
 
     # Save point cloud for fast visualization
-    trimesh.PointCloud(points_3d, colors=points_rgb).export(os.path.join(args.scene_dir, "sparse/points.ply"))
+    write_point_cloud_ply(os.path.join(sparse_reconstruction_dir, "points.ply"), points_3d, points_rgb)
 
-    return True
+    return {
+        "num_images": len(base_image_path_list),
+        "num_points": len(points_3d) if reconstruction is None else len(reconstruction.points3D),
+        "inference_time": inference_end - start,
+        "reconstruction_time": reconstruction_end - inference_end,
+        "write_time": time.perf_counter() - reconstruction_end,
+    }
 
 
 def rename_colmap_recons_and_rescale_camera(
     reconstruction, image_paths, original_coords, img_size, shift_point2d_to_original_res=False, shared_camera=False
 ):
+    """
+    Rename the images to their original names, rescale the cameras from the padded square
+    resolution (img_size) to the original image size and, optionally, shift the 2D observations
+    to the original resolution.
+
+    The 2D observations of each image are transformed as one (N, 2) array instead of point by point;
+    only reading and writing back the pycolmap Point2D objects remains per point.
+    """
+    image_ids = list(reconstruction.images.keys())
+
+    # Per-image resize ratio (original size / square size); with a shared camera the ratio of the
+    # first image is kept for every image, as its camera is the only one that gets rescaled
+    resize_ratios = [max(original_coords[pyimageid - 1, -2:]) / img_size for pyimageid in image_ids]
+    if shared_camera:
+        resize_ratios = resize_ratios[:1] * len(image_ids)
     rescale_camera = True
 
-    for pyimageid in reconstruction.images:
+    for pyimageid, resize_ratio in zip(image_ids, resize_ratios):
         # Reshaped the padded&resized image to the original size
         # Rename the images to the original names
         pyimage = reconstruction.images[pyimageid]
-        pycamera = reconstruction.cameras[pyimage.camera_id]
         pyimage.name = image_paths[pyimageid - 1]
 
         if rescale_camera:
             # Rescale the camera parameters
-            pred_params = copy.deepcopy(pycamera.params)
-
+            pycamera = reconstruction.cameras[pyimage.camera_id]
             real_image_size = original_coords[pyimageid - 1, -2:]
-            resize_ratio = max(real_image_size) / img_size
-            pred_params = pred_params * resize_ratio
-            real_pp = real_image_size / 2
-            pred_params[-2:] = real_pp  # center of the image
+            pred_params = pycamera.params * resize_ratio
+            pred_params[-2:] = real_image_size / 2  # center of the image
 
             pycamera.params = pred_params
             pycamera.width = real_image_size[0]
             pycamera.height = real_image_size[1]
 
-        if shift_point2d_to_original_res:
-            # Also shift the point2D to original resolution
+        points2D = pyimage.points2D
+        if shift_point2d_to_original_res and len(points2D) > 0:
+            # Also shift the point2D to original resolution, all points of the image at once
             top_left = original_coords[pyimageid - 1, :2]
+            xy = np.array([point2D.xy for point2D in points2D])
+            xy = (xy - top_left) * resize_ratio
 
-            for point2D in pyimage.points2D:
-                point2D.xy = (point2D.xy - top_left) * resize_ratio
+            for point2D, new_xy in zip(points2D, xy):
+                point2D.xy = new_xy
 
         if shared_camera:
             # If shared_camera, all images share the same camera
@@ -292,8 +910,50 @@ def rename_colmap_recons_and_rescale_camera(
     return reconstruction
 
 
+def rescale_np_matrix_to_original_res(intrinsic, points_xyf, original_coords, img_size, shared_camera=False):
+    """
+    Array counterpart of rename_colmap_recons_and_rescale_camera, applied before writing.
+
+    Returns intrinsics rescaled to the original image size (principal point at the image center),
+    the per-image original [width, height], and points_xyf with x, y shifted to the original resolution.
+    """
+    num_frames = len(intrinsic)
+    resize_ratios = [max(original_coords[fidx, -2:]) / img_size for fidx in range(num_frames)]
+    if shared_camera:
+        resize_ratios = resize_ratios[:1] * num_frames
+    resize_ratios = np.array(resize_ratios)
+
+    real_image_size = original_coords[:, -2:]
+    rescaled_intrinsic = intrinsic.astype(np.float64) * resize_ratios[:, None, None]
+    rescaled_intrinsic[:, 2, :] = intrinsic[:, 2, :]
+    rescaled_intrinsic[:, :2, 2] = real_image_size / 2  # center of the image
+
+    frame_idx = points_xyf[:, 2].astype(np.int32)
+    rescaled_points_xyf = points_xyf.astype(np.float64)
+    rescaled_points_xyf[:, :2] = (rescaled_points_xyf[:, :2] - original_coords[frame_idx, :2]) * resize_ratios[
+        frame_idx, None
+    ]
+    return rescaled_intrinsic, real_image_size, rescaled_points_xyf
+
+
 if __name__ == "__main__":
     args = parse_args()
+    if args.server_socket is not None:
+        # the model is already resident in a vggt_server.py worker; never fall back to a local load,
+        # which would hide a dead worker (and load a second model next to it)
+        from vggt_server import submit_scene
+
+        if not os.path.exists(args.server_socket):
+            sys.exit(
+                f"VGGT worker socket {args.server_socket} not found (is `vggt_server.py serve` running?). "
+                "Drop --server_socket to load the model locally."
+            )
+        try:
+            ok = submit_scene(args.server_socket, sys.argv[1:])
+        except (ConnectionRefusedError, FileNotFoundError) as e:
+            sys.exit(f"Cannot reach the VGGT worker on {args.server_socket}: {e}")
+        sys.exit(0 if ok else 1)
+
     with torch.no_grad():
         demo_fn(args)
 
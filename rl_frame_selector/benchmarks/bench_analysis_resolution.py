@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+벤치마크 + 상관관계 리포트: analysis 해상도(downscale)가 surrogate 메트릭 / SIFT overlap에 미치는 영향
+
+각 비디오에서 원본 해상도와 downscale 해상도(긴 변 --max-sides)로
+sharpness / brisque / brightness / SIFT 매칭 수를 계산하고,
+원본 대비 Pearson / Spearman 상관계수와 속도 향상을 출력한다.
+
+사용법:
+    cd rl_frame_selector/benchmarks
+    python bench_analysis_resolution.py --videos ../datasets/custom/cChair.mp4 --max-sides 480 640 960
+    python bench_analysis_resolution.py   # 비디오 미지정 시 합성 비디오 사용
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from utils.video_utils import extract_frames_uniformly, resize_to_max_side
+from utils.quality_metrics import compute_all_metrics_batch
+from utils.overlap_utils import SIFTFeatureStore
+from utils.frame_cache import METRIC_KEYS
+from bench_video_decode import write_synthetic_clip
+
+
+def pearson(a: np.ndarray, b: np.ndarray) -> float:
+    if np.std(a) == 0 or np.std(b) == 0:
+        return float('nan')
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    rank_a = np.argsort(np.argsort(a)).astype(np.float64)
+    rank_b = np.argsort(np.argsort(b)).astype(np.float64)
+    return pearson(rank_a, rank_b)
+
+
+def analyze(frames, window: int):
+    """메트릭 + banded SIFT 매칭 수 계산, 각각의 소요 시간 반환"""
+    start = time.perf_counter()
+    metrics = compute_all_metrics_batch(frames)
+    t_metrics = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = SIFTFeatureStore(frames)
+    matches = []
+    for i in range(len(frames)):
+        for d in range(1, window + 1):
+            if i + d < len(frames):
+                matches.append(store.num_matches(i, i + d))
+    t_overlap = time.perf_counter() - start
+
+    values = {k: np.array([m[k] for m in metrics]) for k in METRIC_KEYS}
+    values['overlap'] = np.array(matches, dtype=np.float64)
+    return values, t_metrics, t_overlap
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analysis resolution benchmark / correlation report')
+    parser.add_argument('--videos', type=str, nargs='*', default=None,
+                       help='비디오 파일 또는 이미지 디렉토리 (미지정 시 합성 비디오)')
+    parser.add_argument('--num-frames', type=int, default=60, help='비디오당 샘플 프레임 수 (default: 60)')
+    parser.add_argument('--max-sides', type=int, nargs='+', default=[480, 640, 960],
+                       help='비교할 analysis 해상도 (긴 변)')
+    parser.add_argument('--window', type=int, default=5, help='SIFT 매칭을 계산할 최대 프레임 gap (default: 5)')
+    parser.add_argument('--report', type=str, default=None, help='JSON 리포트 저장 경로')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    videos = args.videos
+    if not videos:
+        tmp_dir = tempfile.TemporaryDirectory(prefix='bench_res')
+        synthetic = str(Path(tmp_dir.name) / 'synthetic.mp4')
+        print("🎬 합성 비디오 생성 (1920x1080)")
+        write_synthetic_clip(synthetic, args.num_frames * 2, 1920, 1080)
+        videos = [synthetic]
+
+    report = []
+    for video_path in videos:
+        full_frames = extract_frames_uniformly(video_path, args.num_frames)
+        if len(full_frames) < 2:
+            print(f"⚠️  프레임 부족, 건너뜀: {video_path}")
+            continue
+
+        h, w = full_frames[0].shape[:2]
+        print(f"\n📹 {video_path} ({len(full_frames)} frames, {w}x{h})")
+        full, t_metrics_full, t_overlap_full = analyze(full_frames, args.window)
+
+        print(f"{'max_side':>9}{'metrics':>10}{'overlap':>10}" +
+              ''.join(f"{k + ' r/ρ':>22}" for k in full))
+        print(f"{'full':>9}{t_metrics_full:>9.2f}s{t_overlap_full:>9.2f}s")
+
+        for max_side in args.max_sides:
+            start = time.perf_counter()
+            small_frames = [resize_to_max_side(f, max_side) for f in full_frames]
+            t_resize = time.perf_counter() - start
+            small, t_metrics, t_overlap = analyze(small_frames, args.window)
+
+            entry = {
+                'video': video_path,
+                'resolution': [w, h],
+                'max_side': max_side,
+                'resize_seconds': t_resize,
+                'metrics_speedup': t_metrics_full / max(t_metrics, 1e-9),
+                'overlap_speedup': t_overlap_full / max(t_overlap, 1e-9),
+                'correlation': {
+                    k: {'pearson': pearson(full[k], small[k]), 'spearman': spearman(full[k], small[k])}
+                    for k in full
+                },
+            }
+            report.append(entry)
+
+            print(f"{max_side:>9}{t_metrics:>9.2f}s{t_overlap:>9.2f}s" +
+                  ''.join(f"{c['pearson']:>14.3f}/{c['spearman']:<7.3f}"
+                          for c in entry['correlation'].values()) +
+                  f"  ⚡ {entry['metrics_speedup']:.1f}x / {entry['overlap_speedup']:.1f}x")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 리포트 저장: {args.report}")
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+벤치마크: FrameSelectionEnv B개 vs BatchFrameSelectionVecEnv
+
+합성 비디오에서 같은 랜덤 action 시퀀스로 두 방식을 진행하면서
+observation / reward / done이 모든 step에서 같은지 확인하고 step 속도를 비교
+(FrameSelectionEnv 쪽은 DummyVecEnv처럼 done이면 바로 reset)
+
+추가로 video pool에서 max_loaded_videos=1 (매번 다시 로드)과 pool 전체 유지가
+같은 결과를 내는지 확인
+
+속도 회귀는 숫자만 찍지 않고 경고로 보고:
+    - BatchFrameSelectionVecEnv가 순차 FrameSelectionEnv보다 느린 경우
+      (overlap band 모드 + 작은 B에서는 step이 NumPy 호출 오버헤드 위주라 비슷하거나 느릴 수 있음,
+       train.py에서 대체하는 SubprocVecEnv는 step마다 env별 IPC가 있으므로 이 비교가 하한)
+    - max_loaded_videos=1의 다시 로드 비용이 pool 전체 유지보다 크게 느린 경우
+
+사용법:
+    cd rl_frame_selector/benchmarks
+    python bench_batch_vec_env.py --steps 3000 --num-envs 4
+    python bench_batch_vec_env.py --steps 3000 --overlap-window 10
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+import sys
+sys.path.append('..')
+sys.path.append('../phase1_surrogate')
+
+import numpy as np
+
+from bench_video_decode import write_synthetic_clip
+from env import FrameSelectionEnv
+from vec_env import BatchFrameSelectionVecEnv
+
+
+def run_single_envs(video_path: str, actions: np.ndarray, env_kwargs: dict):
+    """FrameSelectionEnv B개를 순서대로 step (done이면 reset), 출력은 숨김"""
+    num_steps, num_envs = actions.shape
+    with contextlib.redirect_stdout(io.StringIO()):
+        envs = [FrameSelectionEnv(video_path, **env_kwargs) for _ in range(num_envs)]
+        obs = np.stack([env.reset()[0] for env in envs])
+
+        start = time.perf_counter()
+        history = []
+        for t in range(num_steps):
+            step_obs, rewards, dones = np.empty_like(obs), np.zeros(num_envs), np.zeros(num_envs, dtype=bool)
+            for i, env in enumerate(envs):
+                o, r, terminated, truncated, _ = env.step(int(actions[t, i]))
+                if terminated or truncated:
+                    o, _ = env.reset()
+                step_obs[i], rewards[i], dones[i] = o, r, terminated or truncated
+            history.append((step_obs, rewards, dones))
+        elapsed = time.perf_counter() - start
+
+        for env in envs:
+            env.close()
+    return obs, history, elapsed
+
+
+def run_batch_env(video_paths, actions: np.ndarray, env_kwargs: dict, **batch_kwargs):
+    num_steps, num_envs = actions.shape
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = BatchFrameSelectionVecEnv(video_paths, num_envs, **env_kwargs, **batch_kwargs)
+        obs = env.reset()
+
+        start = time.perf_counter()
+        history = []
+        for t in range(num_steps):
+            step_obs, rewards, dones, _ = env.step(actions[t])
+            history.append((step_obs, rewards, dones))
+        elapsed = time.perf_counter() - start
+
+        env.close()
+    return obs, history, elapsed
+
+
+def compare(name: str, a, b) -> bool:
+    """(initial obs, history) 두 개가 step마다 같은지"""
+    obs_a, history_a = a
+    obs_b, history_b = b
+    ok = np.allclose(obs_a, obs_b)
+    max_reward_err = 0.0
+    for (oa, ra, da), (ob, rb, db) in zip(history_a, history_b):
+        ok &= np.allclose(oa, ob) and np.array_equal(da, db)
+        max_reward_err = max(max_reward_err, float(np.max(np.abs(ra - rb))))
+    ok &= max_reward_err <= 1e-5
+    episodes = sum(int(d.sum()) for _, _, d in history_a)
+    print(f"{'✅' if ok else '❌'} {name}: {episodes}개 episode, max |Δreward| = {max_reward_err:.2e}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FrameSelectionEnv vs BatchFrameSelectionVecEnv')
+    parser.add_argument('--steps', type=int, default=3000)
+    parser.add_argument('--num-envs', type=int, default=4)
+    parser.add_argument('--num-videos', type=int, default=3, help='pool 검증용 비디오 수')
+    parser.add_argument('--num-source-frames', type=int, default=40)
+    parser.add_argument('--target-frames', type=int, default=8)
+    parser.add_argument('--max-gap', type=int, default=6)
+    parser.add_argument('--overlap-window', type=int, default=None)
+    parser.add_argument('--select-prob', type=float, default=0.3)
+    args = parser.parse_args()
+
+    env_kwargs = dict(
+        num_source_frames=args.num_source_frames, target_frames=args.target_frames,
+        max_gap=args.max_gap, use_cache=False, overlap_window=args.overlap_window
+    )
+    rng = np.random.default_rng(0)
+    actions = (rng.random((args.steps, args.num_envs)) < args.select_prob).astype(np.int64)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        videos = []
+        for v in range(args.num_videos):
+            path = str(Path(tmp_dir) / f'clip_{v}.avi')
+            write_synthetic_clip(path, args.num_source_frames * 2, 320, 240, fourcc='MJPG')
+            videos.append(path)
+
+        print(f"🎬 {args.steps} steps x {args.num_envs} envs "
+              f"(overlap_window={args.overlap_window}, select_prob={args.select_prob})")
+
+        # 1. 단일 비디오: FrameSelectionEnv와 step 단위 비교
+        obs, history, t_single = run_single_envs(videos[0], actions, env_kwargs)
+        obs_b, history_b, t_batch = run_batch_env([videos[0]], actions, env_kwargs, seed=0)
+        ok = compare('FrameSelectionEnv == BatchFrameSelectionVecEnv', (obs, history), (obs_b, history_b))
+
+        # 2. video pool: 프레임 LRU 1개 (매번 다시 로드) vs pool 전체 유지
+        lru = run_batch_env(videos, actions, env_kwargs, seed=0, max_loaded_videos=1)
+        full = run_batch_env(videos, actions, env_kwargs, seed=0, max_loaded_videos=len(videos))
+        ok &= compare(f'pool {len(videos)}: max_loaded_videos=1 == {len(videos)}', lru[:2], full[:2])
+
+    print()
+    print(f"{'mode':<28}{'time (s)':>10}{'steps/s':>12}")
+    total_steps = args.steps * args.num_envs
+    print(f"{'FrameSelectionEnv x B':<28}{t_single:>10.3f}{total_steps / t_single:>12.0f}")
+    print(f"{'BatchFrameSelectionVecEnv':<28}{t_batch:>10.3f}{total_steps / t_batch:>12.0f}")
+    print(f"{'pool, max_loaded_videos=1':<28}{lru[2]:>10.3f}{total_steps / lru[2]:>12.0f}")
+    print(f"{f'pool, max_loaded_videos={len(videos)}':<28}{full[2]:>10.3f}{total_steps / full[2]:>12.0f}")
+
+    print()
+    if t_batch > t_single:
+        print(f"⚠️  BatchFrameSelectionVecEnv가 FrameSelectionEnv x {args.num_envs} (순차, IPC 없음)보다 "
+              f"{t_batch / t_single:.2f}x 느림 (SubprocVecEnv 대비 이득은 IPC 제거분)")
+    if lru[2] > 2 * full[2]:
+        print(f"⚠️  max_loaded_videos=1: pool 전체 유지보다 {lru[2] / full[2]:.1f}x 느림 "
+              f"(다시 로드할 때마다 프레임 디코딩, --no-cache가 아니면 memmap이라 기본값은 pool 전체 유지)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
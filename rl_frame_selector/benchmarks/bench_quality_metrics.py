@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+벤치마크: compute_all_metrics (프레임별) vs compute_all_metrics_batch
+
+합성 프레임에서 두 방식의 속도를 비교하고, 메트릭별 최대 절대 오차를 확인
+
+사용법:
+    cd rl_frame_selector/benchmarks
+    python bench_quality_metrics.py --num-frames 300 --width 1920 --height 1080 --workers 4
+"""
+import argparse
+import time
+import sys
+sys.path.append('..')
+
+import cv2
+import numpy as np
+
+from utils.quality_metrics import compute_all_metrics, compute_all_metrics_batch
+
+
+def make_frames(num_frames: int, width: int, height: int) -> np.ndarray:
+    """blur 강도가 다양한 합성 프레임 (N, H, W, 3) uint8"""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    frames = np.empty((num_frames, height, width, 3), dtype=np.uint8)
+    for i, blur in enumerate(np.linspace(0.3, 5.0, num_frames)):
+        frames[i] = cv2.GaussianBlur(base, (0, 0), float(blur))
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quality metrics benchmark (per-frame vs batch)')
+    parser.add_argument('--num-frames', type=int, default=100)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--chunk-size', type=int, default=8, help='thread pool 작업당 프레임 수')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--tolerance', type=float, default=1e-4)
+    args = parser.parse_args()
+
+    print(f"🎬 합성 프레임 생성: {args.num_frames} x {args.width}x{args.height}")
+    frames = make_frames(args.num_frames, args.width, args.height)
+
+    start = time.perf_counter()
+    reference = [compute_all_metrics(f) for f in frames]
+    t_ref = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = compute_all_metrics_batch(frames, chunk_size=args.chunk_size)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_mt = compute_all_metrics_batch(frames, chunk_size=args.chunk_size, num_workers=args.workers)
+    t_batch_mt = time.perf_counter() - start
+
+    print()
+    print("=" * 60)
+    print(f"{'mode':<24}{'time (s)':>12}{'speedup':>12}")
+    print("-" * 60)
+    print(f"{'per-frame':<24}{t_ref:>12.3f}{1.0:>12.2f}")
+    print(f"{'batch':<24}{t_batch:>12.3f}{t_ref / t_batch:>12.2f}")
+    print(f"{f'batch ({args.workers} threads)':<24}{t_batch_mt:>12.3f}{t_ref / t_batch_mt:>12.2f}")
+    print("-" * 60)
+
+    ok = True
+    for key in reference[0]:
+        err = max(
+            max(abs(r[key] - b[key]), abs(r[key] - m[key]))
+            for r, b, m in zip(reference, batch, batch_mt)
+        )
+        ok &= err <= args.tolerance
+        print(f"   max |Δ{key}| = {err:.2e}")
+    print(f"{'✅' if ok else '❌'} tolerance {args.tolerance:g}: {'통과' if ok else '실패'}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+벤치마크: seek 기반 vs sequential(grab/retrieve) 프레임 추출
+
+cv2.VideoWriter로 합성 비디오를 만든 뒤 두 방식의 속도와 결과 일치 여부를 비교
+
+사용법:
+    cd rl_frame_selector/benchmarks
+    python bench_video_decode.py --total-frames 900 --num-frames 300
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+import sys
+sys.path.append('..')
+
+import cv2
+import numpy as np
+
+from utils.video_utils import read_frames_seek, read_frames_sequential
+
+
+def write_synthetic_clip(path: str, total_frames: int, width: int, height: int,
+                         fps: float = 30.0, fourcc: str = 'mp4v'):
+    """움직이는 패턴이 있는 합성 비디오 생성"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"VideoWriter를 열 수 없음 (fourcc={fourcc})")
+
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 256, size=(height, width * 2, 3), dtype=np.uint8)
+
+    for i in range(total_frames):
+        offset = (i * 3) % width
+        frame = np.ascontiguousarray(texture[:, offset:offset + width])
+        cv2.putText(frame, f"{i:05d}", (20, 60), cv2.FONT_HERSHEY_SIMPLEX,
+                    2.0, (255, 255, 255), 3)
+        writer.write(frame)
+
+    writer.release()
+
+
+def time_extraction(video_path: str, indices, reader, repeats: int):
+    best = float('inf')
+    frames = []
+    for _ in range(repeats):
+        cap = cv2.VideoCapture(video_path)
+        start = time.perf_counter()
+        frames = reader(cap, indices)
+        best = min(best, time.perf_counter() - start)
+        cap.release()
+    return best, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Frame extraction benchmark (seek vs sequential)')
+    parser.add_argument('--total-frames', type=int, default=900, help='합성 비디오 길이 (default: 900)')
+    parser.add_argument('--num-frames', type=int, default=300, help='추출할 프레임 수 (default: 300)')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--fourcc', type=str, default='mp4v')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_decode') as tmp_dir:
+        video_path = str(Path(tmp_dir) / 'synthetic.mp4')
+        print(f"🎬 합성 비디오 생성: {args.total_frames} frames, {args.width}x{args.height}")
+        write_synthetic_clip(video_path, args.total_frames, args.width, args.height,
+                             fourcc=args.fourcc)
+
+        cap = cv2.VideoCapture(video_path)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        indices = np.linspace(0, total - 1, min(args.num_frames, total), dtype=int)
+
+        t_seek, frames_seek = time_extraction(video_path, indices, read_frames_seek, args.repeats)
+        t_seq, frames_seq = time_extraction(video_path, indices, read_frames_sequential, args.repeats)
+
+        identical = (
+            len(frames_seek) == len(frames_seq) and
+            all(np.array_equal(a, b) for a, b in zip(frames_seek, frames_seq))
+        )
+
+        print()
+        print("=" * 60)
+        print(f"{'mode':<12}{'frames':>10}{'time (s)':>14}{'fps':>12}")
+        print("-" * 60)
+        print(f"{'seek':<12}{len(frames_seek):>10}{t_seek:>14.3f}{len(frames_seek) / t_seek:>12.1f}")
+        print(f"{'sequential':<12}{len(frames_seq):>10}{t_seq:>14.3f}{len(frames_seq) / t_seq:>12.1f}")
+        print("-" * 60)
+        print(f"⚡ Speedup: {t_seek / t_seq:.2f}x")
+        print(f"{'✅' if identical else '⚠️ '} 동일한 프레임: {identical}")
+        print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,12 +4,144 @@ Frame Selection Gym Environment (with Overlap Constraints)
 """
 import gymnasium as gym
 import numpy as np
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Tuple, Optional, Union
 import sys
 sys.path.append('..')
-from utils.video_utils import extract_frames_uniformly
-from utils.quality_metrics import compute_all_metrics
-from utils.overlap_utils import compute_pairwise_overlap
+from utils.video_utils import extract_frames_uniformly, LazyFrameSequence
+from utils.quality_metrics import compute_all_metrics_batch, compute_all_metrics_stream
+from utils.overlap_utils import (
+    compute_pairwise_overlap, SIFTFeatureStore,
+    load_or_build_overlap_band, overlap_score_from_band
+)
+from utils.frame_cache import load_or_build_frame_cache, load_frame_cache, array_to_metrics
+
+
+def _load_lazy(video_path: str, num_source_frames: int, use_cache: bool,
+               cache_dir: Optional[str], frame_budget_mb: float,
+               analysis_max_side: Optional[int]) -> Tuple[LazyFrameSequence, List[Dict[str, float]]]:
+    """
+    Lazy 모드: 프레임은 LazyFrameSequence로 필요할 때만 디코딩, 메트릭은 캐시 또는 streaming 계산
+    """
+    frames = LazyFrameSequence(
+        video_path, num_source_frames,
+        max_cached_bytes=int(frame_budget_mb * 1024 ** 2),
+        max_side=analysis_max_side
+    )
+
+    if use_cache:
+        cached = load_frame_cache(video_path, num_source_frames, cache_dir, analysis_max_side)
+        if cached is not None and len(cached[1]) == len(frames):
+            return frames, array_to_metrics(cached[1])
+
+    print(f"📊 품질 메트릭 계산 중 (streaming)...")
+    quality_metrics = compute_all_metrics_stream(frames.iter_frames())
+    return frames, quality_metrics
+
+
+def load_video_data(video_path: str, num_source_frames: int, use_cache: bool = True,
+                    cache_dir: Optional[str] = None, overlap_window: Optional[int] = None,
+                    frame_budget_mb: Optional[float] = None,
+                    analysis_max_side: Optional[int] = None) -> Dict:
+    """
+    비디오 1개 로드: 프레임 + 품질 메트릭 (+ SIFT feature store, overlap band)
+
+    인자는 FrameSelectionEnv와 동일
+
+    Returns:
+        {'video_path', 'frames', 'quality_metrics', 'feature_store', 'overlap_band'}
+    """
+    # 비디오에서 프레임 추출 + 품질 메트릭 계산 (캐시 사용 시 memmap 로드)
+    print(f"🎬 비디오 로딩: {video_path}")
+    if frame_budget_mb is not None:
+        frames, quality_metrics = _load_lazy(
+            video_path, num_source_frames, use_cache, cache_dir,
+            frame_budget_mb, analysis_max_side
+        )
+    elif use_cache:
+        frames, quality_metrics = load_or_build_frame_cache(
+            video_path, num_source_frames, cache_dir, analysis_max_side
+        )
+    else:
+        frames = extract_frames_uniformly(
+            video_path, num_source_frames, max_side=analysis_max_side
+        )
+
+        print(f"📊 품질 메트릭 계산 중...")
+        quality_metrics = compute_all_metrics_batch(frames)
+
+    feature_store = SIFTFeatureStore(frames, video_path=video_path)
+
+    overlap_band = None
+    if overlap_window is not None:
+        overlap_band = load_or_build_overlap_band(
+            video_path, frames, num_source_frames,
+            overlap_window, feature_store, analysis_max_side
+        )
+
+    return {
+        'video_path': video_path,
+        'frames': frames,
+        'quality_metrics': quality_metrics,
+        'feature_store': feature_store,
+        'overlap_band': overlap_band,
+    }
+
+
+def compute_overlap_score(frames, selected_indices: List[int],
+                          feature_store: Optional[SIFTFeatureStore] = None,
+                          overlap_band: Optional[np.ndarray] = None) -> float:
+    """선택된 프레임들의 overlap score (overlap band가 있으면 lookup, 없으면 SIFT 매칭)"""
+    if overlap_band is not None:
+        return overlap_score_from_band(overlap_band, selected_indices, feature_store)
+    return compute_pairwise_overlap(frames, selected_indices, feature_store)
+
+
+def compute_surrogate_reward(qualities: np.ndarray, selected_indices: List[int],
+                             overlap_score: float) -> Dict[str, float]:
+    """
+    Surrogate reward 계산
+
+    Surrogate reward 구성:
+    1. Temporal coverage uniformity (20%)
+    2. Average quality (30%)
+    3. Quality diversity (10%)
+    4. Overlap score (40%) ← **가장 중요!**
+
+    Args:
+        qualities: 선택된 프레임들의 (sharpness + brisque), selected_indices 순서
+        selected_indices: 선택된 프레임 인덱스
+        overlap_score: compute_overlap_score 결과
+
+    Returns:
+        {'reward', 'temporal_uniformity', 'avg_quality', 'quality_diversity', 'overlap_score'}
+    """
+    # 1. Temporal coverage uniformity
+    selected_sorted = sorted(selected_indices)
+    gaps = np.diff(selected_sorted)
+    temporal_uniformity = 1.0 / (1.0 + np.std(gaps))
+
+    # 2. Average quality (sharpness + brisque)
+    avg_quality = np.mean(qualities)
+
+    # 3. Diversity (avoid selecting too similar frames)
+    quality_diversity = np.std(qualities) if len(qualities) > 1 else 0.0
+
+    # Weighted combination (Overlap 가장 중요!)
+    reward = (
+        0.2 * temporal_uniformity +
+        0.3 * avg_quality +
+        0.1 * quality_diversity +
+        0.4 * overlap_score  # ← COLMAP 성공에 가장 중요
+    )
+
+    return {
+        'reward': float(reward),
+        'temporal_uniformity': float(temporal_uniformity),
+        'avg_quality': float(avg_quality),
+        'quality_diversity': float(quality_diversity),
+        'overlap_score': float(overlap_score),
+    }
 
 
 class FrameSelectionEnv(gym.Env):
@@ -23,23 +155,50 @@ class FrameSelectionEnv(gym.Env):
     **중요**: COLMAP/3DGS 성공을 위해 overlap 제약 적용
     """
 
-    def __init__(self, video_path: str, num_source_frames: int = 300,
-                 target_frames: int = 60, max_gap: int = 10):
+    def __init__(self, video_path: Union[str, List[str]], num_source_frames: int = 300,
+                 target_frames: int = 60, max_gap: int = 10,
+                 use_cache: bool = True, cache_dir: Optional[str] = None,
+                 overlap_window: Optional[int] = None,
+                 frame_budget_mb: Optional[float] = None,
+                 analysis_max_side: Optional[int] = None):
         """
         Args:
-            video_path: 비디오 파일 경로
+            video_path: 비디오 파일 경로, 또는 비디오 pool (리스트)
+                    - pool이면 reset마다 랜덤하게 다음 비디오로 교체하고,
+                      다음 비디오는 episode 진행 중 background thread에서 미리 로드
             num_source_frames: 비디오에서 추출할 프레임 수
             target_frames: 최종 선택할 프레임 수
             max_gap: 연속 선택 프레임 간 최대 gap (overlap 보장)
                     - max_gap=10: 10프레임 이내에 다음 프레임 선택 필수
                     - 값이 작을수록 overlap 강화, 크면 자유도 증가
+            use_cache: 디코딩된 프레임/메트릭 디스크 캐시 사용 여부
+            cache_dir: 캐시 디렉토리 (None = RL_FRAME_CACHE_DIR 또는 ~/.cache/rl_frame_selector)
+            overlap_window: 설정 시 banded overlap 행렬(폭 overlap_window)을 미리 계산/로드하여
+                    reward를 live SIFT 매칭 대신 lookup으로 계산 (None = live 매칭)
+            frame_budget_mb: 설정 시 프레임을 메모리에 모두 올리지 않고 필요할 때 디코딩
+                    (LazyFrameSequence, 디코딩된 프레임 LRU 크기 = frame_budget_mb)
+            analysis_max_side: analysis 해상도 (긴 변, 예: 640). 로드 시 1회 downscale하여
+                    품질 메트릭과 SIFT overlap 모두 이 해상도에서 계산 (None = 원본 해상도)
         """
         super().__init__()
 
-        self.video_path = video_path
+        if isinstance(video_path, (list, tuple)):
+            if len(video_path) == 0:
+                raise ValueError("video_path pool is empty")
+            self.video_pool = list(video_path)
+        else:
+            self.video_pool = [video_path]
+        self.video_path = None  # 현재 episode의 비디오
         self.num_source_frames = num_source_frames
+        # 캐시 키는 요청한 프레임 수 기준 (reset 후 num_source_frames가 줄어들 수 있음)
+        self.requested_source_frames = num_source_frames
         self.target_frames = target_frames
         self.max_gap = max_gap
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.overlap_window = overlap_window
+        self.frame_budget_mb = frame_budget_mb
+        self.analysis_max_side = analysis_max_side
 
         # Action space: 0 (SKIP), 1 (SELECT)
         self.action_space = gym.spaces.Discrete(2)
@@ -52,33 +211,93 @@ class FrameSelectionEnv(gym.Env):
         # 초기화
         self.frames = []
         self.quality_metrics = []
+        self.feature_store = None  # 비디오 단위 SIFT descriptor / 매칭 캐시
+        self.overlap_band = None  # (N, overlap_window) 미리 계산된 매칭 수
+
+        # 비디오 pool prefetch (pool이 2개 이상일 때만 사용)
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetch_path: Optional[str] = None
+        self._prefetch_future: Optional[Future] = None
+
         self.reset()
 
-    def reset(self, seed=None, options=None):
-        """환경 리셋"""
-        super().reset(seed=seed)
+    def _load_video(self, video_path: str) -> Dict:
+        """
+        비디오 1개 로드 (load_video_data 참고)
 
-        # 비디오에서 프레임 추출
-        print(f"🎬 비디오 로딩: {self.video_path}")
-        self.frames = extract_frames_uniformly(
-            self.video_path, self.num_source_frames
+        prefetch thread에서도 호출되므로 self 상태를 변경하지 않음
+        """
+        return load_video_data(
+            video_path, self.requested_source_frames,
+            use_cache=self.use_cache, cache_dir=self.cache_dir,
+            overlap_window=self.overlap_window,
+            frame_budget_mb=self.frame_budget_mb,
+            analysis_max_side=self.analysis_max_side
         )
 
+    def _start_prefetch(self):
+        """다음 episode 비디오를 골라 background thread에서 로드 시작"""
+        next_path = self.video_pool[int(self.np_random.integers(len(self.video_pool)))]
+        if next_path == self.video_path:
+            # 같은 비디오 → 현재 데이터를 그대로 재사용
+            self._prefetch_path, self._prefetch_future = next_path, None
+            return
+
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        self._prefetch_path = next_path
+        self._prefetch_future = self._prefetch_executor.submit(self._load_video, next_path)
+
+    def _discard_prefetch(self):
+        """미리 고른 다음 비디오 취소 (seed로 reset할 때 다음 비디오를 새 np_random으로 다시 고르기 위함)"""
+        if self._prefetch_future is not None:
+            self._prefetch_future.cancel()  # 이미 로드 중이면 결과만 버림
+        self._prefetch_path, self._prefetch_future = None, None
+
+    def _switch_video(self):
+        """reset 시 사용할 비디오 결정 + 로드 (prefetch 결과가 있으면 대기 없이 사용)"""
+        if self._prefetch_path is None:
+            # 첫 reset (또는 단일 비디오가 아직 로드되지 않음)
+            next_path = self.video_pool[int(self.np_random.integers(len(self.video_pool)))]
+        else:
+            next_path = self._prefetch_path
+
+        if next_path == self.video_path:
+            loaded = None  # 같은 비디오: 프레임/메트릭/SIFT 캐시 그대로 사용
+        elif self._prefetch_future is not None and self._prefetch_path == next_path:
+            loaded = self._prefetch_future.result()
+        else:
+            loaded = self._load_video(next_path)
+        self._prefetch_path, self._prefetch_future = None, None
+
+        if loaded is not None:
+            self.video_path = loaded['video_path']
+            self.frames = loaded['frames']
+            self.quality_metrics = loaded['quality_metrics']
+            self.feature_store = loaded['feature_store']
+            self.overlap_band = loaded['overlap_band']
+
         # 실제 추출된 프레임 수에 맞춰 num_source_frames 업데이트
         # (DTU는 60개만 있을 수 있음)
         actual_frames = len(self.frames)
+        self.num_source_frames = self.requested_source_frames
         if actual_frames < self.num_source_frames:
             print(f"ℹ️  프레임 수 조정: {self.num_source_frames} → {actual_frames}")
             self.num_source_frames = actual_frames
 
-        # 품질 메트릭 미리 계산
-        print(f"📊 품질 메트릭 계산 중...")
-        self.quality_metrics = []
-        for frame in self.frames:
-            metrics = compute_all_metrics(frame)
-            self.quality_metrics.append(metrics)
+        if len(self.video_pool) > 1:
+            self._start_prefetch()
+
+    def reset(self, seed=None, options=None):
+        """환경 리셋 (pool 모드면 다음 비디오로 교체)"""
+        super().reset(seed=seed)
 
-        print(f"✅ 준비 완료: {len(self.frames)}개 프레임")
+        if seed is not None:
+            # __init__의 첫 reset은 seed 없는 np_random으로 다음 비디오를 골랐으므로,
+            # seed가 주어지면 그 선택을 버려야 비디오 순서가 seed로 재현됨
+            self._discard_prefetch()
+        self._switch_video()
+        print(f"✅ 준비 완료: {len(self.frames)}개 프레임 ({self.video_path})")
 
         # 상태 초기화
         self.current_step = 0
@@ -193,44 +412,38 @@ class FrameSelectionEnv(gym.Env):
         if len(self.selected_indices) == 0:
             return -10.0
 
-        # 1. Temporal coverage uniformity
-        selected_sorted = sorted(self.selected_indices)
-        gaps = np.diff(selected_sorted)
-        temporal_uniformity = 1.0 / (1.0 + np.std(gaps))
-
-        # 2. Average quality (sharpness + brisque)
         selected_qualities = [
             self.quality_metrics[i]['sharpness'] +
             self.quality_metrics[i]['brisque']
             for i in self.selected_indices
         ]
-        avg_quality = np.mean(selected_qualities)
-
-        # 3. Diversity (avoid selecting too similar frames)
-        quality_diversity = np.std(selected_qualities) if len(selected_qualities) > 1 else 0.0
 
-        # 4. Overlap score (SIFT feature matching)
-        print(f"🔍 Overlap 계산 중... (SIFT matching)")
-        overlap_score = compute_pairwise_overlap(self.frames, self.selected_indices)
+        # Overlap score (SIFT feature matching)
+        if self.overlap_band is None:
+            print(f"🔍 Overlap 계산 중... (SIFT matching)")
+        overlap_score = compute_overlap_score(
+            self.frames, self.selected_indices, self.feature_store, self.overlap_band
+        )
         print(f"   Overlap score: {overlap_score:.4f}")
 
-        # Weighted combination (Overlap 가장 중요!)
-        reward = (
-            0.2 * temporal_uniformity +
-            0.3 * avg_quality +
-            0.1 * quality_diversity +
-            0.4 * overlap_score  # ← COLMAP 성공에 가장 중요
-        )
+        result = compute_surrogate_reward(selected_qualities, self.selected_indices, overlap_score)
 
         # 디버깅 정보
-        print(f"   Temporal uniformity: {temporal_uniformity:.4f}")
-        print(f"   Avg quality: {avg_quality:.4f}")
-        print(f"   Diversity: {quality_diversity:.4f}")
-        print(f"   Overlap: {overlap_score:.4f}")
-        print(f"   → Final reward: {reward:.4f}")
+        print(f"   Temporal uniformity: {result['temporal_uniformity']:.4f}")
+        print(f"   Avg quality: {result['avg_quality']:.4f}")
+        print(f"   Diversity: {result['quality_diversity']:.4f}")
+        print(f"   Overlap: {result['overlap_score']:.4f}")
+        print(f"   → Final reward: {result['reward']:.4f}")
 
-        return float(reward)
+        return result['reward']
 
     def render(self):
         """렌더링 (선택사항)"""
         pass
+
+    def close(self):
+        """prefetch thread 정리"""
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=True)
+            self._prefetch_executor = None
+        super().close()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Phase 1 전처리: 비디오별 banded overlap 행렬 미리 계산
+
+각 비디오의 (i, i+d) 프레임 pair (1 <= d <= window) SIFT 매칭 수를 한 번만 계산해
+비디오 옆에 float16 .npy로 저장한다. 학습 시 --overlap-window를 같은 값으로 주면
+FrameSelectionEnv가 live SIFT 매칭 대신 이 행렬을 lookup한다.
+
+사용법:
+    python precompute_overlap.py --dataset dtu --window 10
+"""
+import argparse
+import time
+import sys
+sys.path.append('..')
+
+from utils.dataset_loader import load_dataset
+from utils.frame_cache import load_or_build_frame_cache
+from utils.overlap_utils import load_or_build_overlap_band
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RL Frame Selector - Overlap band 전처리')
+    parser.add_argument('--dataset', type=str, required=True,
+                       choices=['co3d', 'dtu', 'custom'],
+                       help='데이터셋: co3d (CO3Dv2), dtu (DTU scans), custom (사용자 비디오)')
+    parser.add_argument('--num-videos', type=int, default=None,
+                       help='처리할 비디오 수 (None = 전체)')
+    parser.add_argument('--dataset-root', type=str, default=None,
+                       help='데이터셋 루트 디렉토리 (None = 기본 경로 사용)')
+    parser.add_argument('--num-source-frames', type=int, default=300,
+                       help='비디오에서 추출할 프레임 수 (default: 300)')
+    parser.add_argument('--window', type=int, default=10,
+                       help='Overlap band 폭, 보통 --max-gap과 동일 (default: 10)')
+    parser.add_argument('--analysis-max-side', type=int, default=None,
+                       help='analysis 해상도 (긴 변), 학습 시 --analysis-max-side와 동일해야 함 (None = 원본)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                       help='프레임/메트릭 캐시 디렉토리 (None = 기본값)')
+
+    args = parser.parse_args()
+
+    kwargs = {}
+    if args.dataset_root:
+        kwargs['root'] = args.dataset_root
+    videos = load_dataset(args.dataset, num_videos=args.num_videos, **kwargs)
+
+    print(f"🔧 {len(videos)}개 비디오 overlap band 계산 (window={args.window})")
+    total_start = time.time()
+
+    for i, video_path in enumerate(videos):
+        start = time.time()
+        frames, _ = load_or_build_frame_cache(
+            video_path, args.num_source_frames, args.cache_dir, args.analysis_max_side
+        )
+        band = load_or_build_overlap_band(
+            video_path, frames, args.num_source_frames, args.window,
+            max_side=args.analysis_max_side
+        )
+        print(f"   [{i + 1}/{len(videos)}] {video_path}: {band.shape} ({time.time() - start:.1f}s)")
+
+    print(f"✅ 완료: {time.time() - total_start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
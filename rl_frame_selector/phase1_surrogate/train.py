@@ -13,7 +13,10 @@ from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env, SubprocVecEnv
 from stable_baselines3.common.callbacks import EvalCallback, CheckpointCallback
 from env import FrameSelectionEnv
+from vec_env import BatchFrameSelectionVecEnv
 from utils.dataset_loader import load_dataset, create_train_val_split
+from utils.frame_cache import preload_frame_cache, load_or_build_frame_cache
+from utils.overlap_utils import load_or_build_overlap_band
 
 
 def main():
@@ -37,12 +40,27 @@ def main():
                        help='최종 선택할 프레임 수 (default: 60)')
     parser.add_argument('--max-gap', type=int, default=10,
                        help='연속 선택 프레임 간 최대 gap (overlap 보장, default: 10)')
+    parser.add_argument('--overlap-window', type=int, default=None,
+                       help='미리 계산된 banded overlap 행렬 사용 (precompute_overlap.py --window와 동일, None = live SIFT)')
 
     # Training parameters
     parser.add_argument('--total-timesteps', type=int, default=500000,
                        help='총 학습 timesteps (default: 500000)')
     parser.add_argument('--n-envs', type=int, default=4,
                        help='병렬 환경 수 (default: 4)')
+    parser.add_argument('--vec-env', type=str, default='subproc', choices=['subproc', 'batch'],
+                       help='병렬 환경 방식: subproc (env당 프로세스), batch (단일 프로세스 vectorized, IPC 없음)')
+    parser.add_argument('--max-loaded-videos', type=int, default=None,
+                       help='batch 모드에서 프레임을 들고 있을 비디오 수 (LRU, overlap band 밖 reward에만 사용, '
+                            'None = 캐시 memmap이면 pool 전체, --no-cache / lazy면 2)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                       help='프레임/메트릭 캐시 디렉토리 (None = RL_FRAME_CACHE_DIR 또는 ~/.cache/rl_frame_selector)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='프레임 캐시 비활성화 (워커마다 비디오를 직접 디코딩)')
+    parser.add_argument('--analysis-max-side', type=int, default=None,
+                       help='메트릭/SIFT analysis 해상도 (긴 변, 예: 640, None = 원본 해상도)')
+    parser.add_argument('--frame-budget-mb', type=float, default=None,
+                       help='env당 디코딩된 프레임 LRU 크기 (MB). 설정 시 프레임을 필요할 때만 디코딩 (None = 전체 로드)')
     parser.add_argument('--output-dir', type=str, default='./trained_models',
                        help='모델 저장 디렉토리 (default: ./trained_models)')
     parser.add_argument('--tensorboard-log', type=str, default='./logs',
@@ -93,31 +111,72 @@ def main():
     print()
 
     # Create multi-video training environment
-    # 각 episode마다 랜덤하게 비디오 선택
-    import random
-    import numpy as np
-
+    # 각 episode마다 랜덤하게 비디오 선택 (env 내부 video pool 회전 + prefetch)
     def make_env(video_list, rank, seed=0):
         """
         환경 생성 함수 (각 프로세스마다 호출)
-        episode마다 랜덤하게 다른 비디오 선택
+        episode마다 랜덤하게 다른 비디오 선택 (reset 시 교체, 다음 비디오는 background 로드)
         """
         def _init():
-            # 랜덤하게 비디오 선택
-            video_path = random.choice(video_list)
             env = FrameSelectionEnv(
-                video_path=video_path,
+                video_path=video_list,
                 num_source_frames=args.num_source_frames,
                 target_frames=args.target_frames,
-                max_gap=args.max_gap
+                max_gap=args.max_gap,
+                use_cache=not args.no_cache,
+                cache_dir=args.cache_dir,
+                overlap_window=args.overlap_window,
+                frame_budget_mb=args.frame_budget_mb,
+                analysis_max_side=args.analysis_max_side
             )
             env.reset(seed=seed + rank)
             return env
         return _init
 
+    # 공유 frame store: 메인 프로세스에서 한 번만 디코딩 → 워커들은 read-only memmap 공유
+    # (lazy 모드는 프레임을 필요할 때만 디코딩하므로 preload 생략, 기존 캐시의 메트릭만 재사용)
+    if not args.no_cache and args.frame_budget_mb is None:
+        print(f"💾 Frame store 준비 중 ({len(train_videos) + len(eval_videos[:1])}개 비디오)...")
+        total_bytes = preload_frame_cache(
+            train_videos + eval_videos[:1], args.num_source_frames, args.cache_dir,
+            args.analysis_max_side
+        )
+        print(f"✅ Frame store 준비 완료: {total_bytes / (1024 ** 3):.2f} GB (워커 간 공유)")
+        print()
+
+        # overlap band도 메인 프로세스에서 미리 계산 → 워커들은 저장된 .npy를 로드만 함
+        if args.overlap_window is not None:
+            print(f"🔍 Overlap band 준비 중 (window={args.overlap_window})...")
+            for video_path in train_videos + eval_videos[:1]:
+                frames, _ = load_or_build_frame_cache(
+                    video_path, args.num_source_frames, args.cache_dir, args.analysis_max_side
+                )
+                load_or_build_overlap_band(
+                    video_path, frames, args.num_source_frames, args.overlap_window,
+                    max_side=args.analysis_max_side
+                )
+                del frames
+            print()
+
     # Training 환경 (병렬 환경)
-    print(f"🔧 Creating {args.n_envs} parallel training environments...")
-    env = SubprocVecEnv([make_env(train_videos, i) for i in range(args.n_envs)])
+    print(f"🔧 Creating {args.n_envs} parallel training environments ({args.vec_env})...")
+    if args.vec_env == 'batch':
+        env = BatchFrameSelectionVecEnv(
+            train_videos,
+            num_envs=args.n_envs,
+            num_source_frames=args.num_source_frames,
+            target_frames=args.target_frames,
+            max_gap=args.max_gap,
+            use_cache=not args.no_cache,
+            cache_dir=args.cache_dir,
+            overlap_window=args.overlap_window,
+            frame_budget_mb=args.frame_budget_mb,
+            analysis_max_side=args.analysis_max_side,
+            seed=0,
+            max_loaded_videos=args.max_loaded_videos
+        )
+    else:
+        env = SubprocVecEnv([make_env(train_videos, i) for i in range(args.n_envs)])
 
     # Evaluation 환경 (단일)
     print(f"🔧 Creating evaluation environment...")
@@ -125,7 +184,12 @@ def main():
         video_path=eval_videos[0],
         num_source_frames=args.num_source_frames,
         target_frames=args.target_frames,
-        max_gap=args.max_gap
+        max_gap=args.max_gap,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        overlap_window=args.overlap_window,
+        frame_budget_mb=args.frame_budget_mb,
+        analysis_max_side=args.analysis_max_side
     )
     print()
 
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Batch Frame Selection VecEnv
+
+FrameSelectionEnv B개를 SubprocVecEnv로 돌리는 대신, B개 episode 상태를
+NumPy 배열(현재 step, 선택 수, 마지막 선택 인덱스, 선택 인덱스)로 들고
+step 한 번에 모두 vectorized로 진행한다 (프로세스 간 IPC 없음).
+
+Gap 페널티 / 종료 조건 / 최종 reward는 FrameSelectionEnv.step과 동일
+(benchmarks/bench_batch_vec_env.py로 확인)
+"""
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Optional, Union, Any
+import sys
+sys.path.append('..')
+
+import gymnasium as gym
+from stable_baselines3.common.vec_env import VecEnv
+
+from env import load_video_data, compute_overlap_score, compute_surrogate_reward
+from utils.overlap_utils import SIFTFeatureStore, overlap_score_from_band
+
+
+class BatchFrameSelectionVecEnv(VecEnv):
+    """
+    B개의 frame selection episode를 배열로 관리하는 native VecEnv
+
+    - 각 episode는 reset 시 video pool에서 랜덤하게 비디오를 고름
+    - 상주 데이터는 비디오별 observation 테이블(메트릭 + temporal position), overlap band,
+      SIFT store(descriptor / pair 매칭 수 캐시)뿐 (생성 시 비디오를 하나씩 로드해서 추출)
+    - 프레임은 최종 reward에 live SIFT 매칭이 필요할 때만 쓰므로
+      최근 max_loaded_videos개 비디오만 LRU로 들고 있고, 밀려난 비디오는 필요할 때 다시 로드.
+      SIFT store는 밀려나도 유지하고 다시 로드한 프레임에 붙이므로 descriptor / 매칭 수는
+      비디오당 한 번만 계산되고, 선택된 프레임의 descriptor가 모두 있으면 프레임을 다시 로드하지 않음
+      (descriptor는 uint8로 프레임당 최대 SIFT_NFEATURES x 128 bytes)
+    - max_loaded_videos=None이면 캐시 memmap 프레임일 때 pool 전체 유지 (page cache 공유라 RSS 부담 없음),
+      --no-cache / lazy 모드에서는 2개
+    - done된 env는 step_wait 안에서 자동 reset (terminal_observation은 info에 저장)
+
+    성능: step 비용은 B와 거의 무관한 NumPy 호출 ~20번 (live SIFT reward는 store 공유로 B=8에서 ~6x 빠름).
+    overlap band 모드는 reward가 lookup뿐이라 이 고정 비용이 전부여서, B=8이면 같은 프로세스에서
+    FrameSelectionEnv B개를 순서대로 돌리는 것보다 ~1.3x 느리고 B=32부터 ~1.8x 빠름.
+    순차 실행은 SubprocVecEnv가 step마다 env별로 하는 IPC가 없는 하한이므로 batch 모드는
+    --vec-env subproc 대체로 유지 (benchmarks/bench_batch_vec_env.py가 느린 경우를 경고로 보고)
+    """
+
+    def __init__(self, video_paths: Union[str, List[str]], num_envs: int,
+                 num_source_frames: int = 300, target_frames: int = 60, max_gap: int = 10,
+                 use_cache: bool = True, cache_dir: Optional[str] = None,
+                 overlap_window: Optional[int] = None,
+                 frame_budget_mb: Optional[float] = None,
+                 analysis_max_side: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 max_loaded_videos: Optional[int] = None):
+        """
+        Args:
+            video_paths: 비디오 파일 경로 또는 비디오 pool (리스트)
+            num_envs: 동시에 진행할 episode 수 (B)
+            max_loaded_videos: 프레임을 들고 있을 최대 비디오 수 (LRU,
+                None = 캐시 memmap이면 pool 전체, 아니면 2)
+            나머지 인자는 FrameSelectionEnv와 동일
+        """
+        self.render_mode = None
+        self.video_pool = [video_paths] if isinstance(video_paths, str) else list(video_paths)
+        if len(self.video_pool) == 0:
+            raise ValueError("video_paths pool is empty")
+
+        self.target_frames = target_frames
+        self.max_gap = max_gap
+        self._rng = np.random.default_rng(seed)
+
+        self._load_kwargs = dict(
+            num_source_frames=num_source_frames, use_cache=use_cache, cache_dir=cache_dir,
+            overlap_window=overlap_window, frame_budget_mb=frame_budget_mb,
+            analysis_max_side=analysis_max_side
+        )
+        if max_loaded_videos is None:
+            memmapped = use_cache and frame_budget_mb is None
+            max_loaded_videos = len(self.video_pool) if memmapped else 2
+        self.max_loaded_videos = max(1, max_loaded_videos)
+        self._loaded: "OrderedDict[int, Dict]" = OrderedDict()  # video index → load_video_data 결과
+        self._feature_stores: Dict[int, SIFTFeatureStore] = {}  # 밀려나도 유지
+
+        # 비디오를 하나씩 로드해서 메트릭 / overlap band만 남김 (프레임은 LRU에 들어간 것만 유지)
+        metrics = []
+        self._bands: List[Optional[np.ndarray]] = []
+        for v in range(len(self.video_pool)):
+            video = self._video_data(v)
+            metrics.append(np.array(
+                [[m['sharpness'], m['brisque'], m['brightness']] for m in video['quality_metrics']],
+                dtype=np.float64
+            ).reshape(-1, 3))
+            self._bands.append(video['overlap_band'])
+
+        # (V, N_max, 3) 메트릭 [sharpness, brisque, brightness] + 비디오별 프레임 수
+        self._n_frames = np.array([len(m) for m in metrics], dtype=np.int64)
+        if np.any(self._n_frames == 0):
+            empty = [path for path, n in zip(self.video_pool, self._n_frames) if n == 0]
+            raise ValueError(f"No frames extracted from: {empty}")
+        self._metrics = np.zeros((len(metrics), int(self._n_frames.max()), 3), dtype=np.float64)
+        for v, video_metrics in enumerate(metrics):
+            self._metrics[v, :self._n_frames[v]] = video_metrics
+
+        # (V, N_max + 1, 5) observation 테이블: [메트릭 3개, step / N, 1 / target_frames]
+        # step >= N 행은 0 (episode 종료) → _get_observations는 lookup + count 곱셈만
+        self._obs_table = np.zeros((len(metrics), int(self._n_frames.max()) + 1, 5), dtype=np.float64)
+        for v, n in enumerate(self._n_frames):
+            self._obs_table[v, :n, :3] = self._metrics[v, :n]
+            self._obs_table[v, :n, 3] = np.arange(n) / n  # Temporal position
+            self._obs_table[v, :n, 4] = 1.0 / target_frames  # x selected_count = Selection progress
+
+        # Episode 상태 (B개)
+        self._video_idx = np.zeros(num_envs, dtype=np.int64)
+        self._env_n_frames = np.ones(num_envs, dtype=np.int64)  # = self._n_frames[self._video_idx]
+        self._step = np.zeros(num_envs, dtype=np.int64)
+        self._count = np.zeros(num_envs, dtype=np.int64)
+        self._last = np.full(num_envs, -1, dtype=np.int64)
+        self._selected = np.zeros((num_envs, max(target_frames, 1)), dtype=np.int64)
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+
+        observation_space = gym.spaces.Box(low=0.0, high=1.0, shape=(5,), dtype=np.float32)
+        action_space = gym.spaces.Discrete(2)
+        super().__init__(num_envs, observation_space, action_space)
+
+    # ===== 비디오 데이터 =====
+
+    def _video_data(self, video_idx: int) -> Dict:
+        """프레임이 필요한 비디오 로드 (최근 max_loaded_videos개 LRU, SIFT store는 재사용)"""
+        if video_idx in self._loaded:
+            self._loaded.move_to_end(video_idx)
+            return self._loaded[video_idx]
+
+        video = load_video_data(self.video_pool[video_idx], **self._load_kwargs)
+        feature_store = self._feature_stores.get(video_idx)
+        if feature_store is None:
+            self._feature_stores[video_idx] = video['feature_store']
+        else:
+            # 이전에 계산한 descriptor / 매칭 수 유지, 프레임만 새로 로드한 것으로 교체
+            feature_store.frames = video['frames']
+            video['feature_store'] = feature_store
+
+        self._loaded[video_idx] = video
+        while len(self._loaded) > self.max_loaded_videos:
+            _, evicted = self._loaded.popitem(last=False)
+            evicted['feature_store'].frames = None  # 프레임 참조 해제 (캐시만 남김)
+            if hasattr(evicted['frames'], 'close'):
+                evicted['frames'].close()
+        return video
+
+    # ===== Episode 상태 =====
+
+    def _reset_envs(self, env_ids: np.ndarray):
+        """지정된 env들의 episode 초기화 (새 비디오 선택)"""
+        if len(env_ids) == 0:
+            return
+        self._video_idx[env_ids] = self._rng.integers(len(self.video_pool), size=len(env_ids))
+        self._env_n_frames[env_ids] = self._n_frames[self._video_idx[env_ids]]
+        self._step[env_ids] = 0
+        self._count[env_ids] = 0
+        self._last[env_ids] = -1
+
+    def _get_observations(self) -> np.ndarray:
+        """(B, 5) observation: [sharpness, brisque, brightness, temporal_pos, selected_count]"""
+        # step >= N이면 0 (episode 종료, gap 위반으로 N을 넘어간 step은 마지막 0 행)
+        obs = self._obs_table[self._video_idx, np.minimum(self._step, self._obs_table.shape[1] - 1)]
+        obs[:, 4] *= self._count  # Selection progress
+        return obs.astype(np.float32)
+
+    def _final_reward(self, env_id: int) -> float:
+        """FrameSelectionEnv._compute_final_reward_with_overlap과 동일 (출력 없음)"""
+        count = int(self._count[env_id])
+        if count == 0:
+            return -10.0
+
+        video_idx = int(self._video_idx[env_id])
+        selected = self._selected[env_id, :count].tolist()
+
+        qualities = self._metrics[video_idx, selected, 0] + self._metrics[video_idx, selected, 1]
+        band = self._bands[video_idx]
+        if band is not None and np.all(np.diff(selected) <= band.shape[1]):
+            # 모든 pair가 band 안 → 프레임 없이 lookup만
+            overlap_score = overlap_score_from_band(band, selected)
+        else:
+            # descriptor가 모두 있으면 프레임 로드 없이 SIFT store만으로 매칭
+            feature_store = self._feature_stores.get(video_idx)
+            if feature_store is None or not feature_store.has_descriptors(selected):
+                feature_store = self._video_data(video_idx)['feature_store']
+            overlap_score = compute_overlap_score(None, selected, feature_store, band)
+        return compute_surrogate_reward(qualities, selected, overlap_score)['reward']
+
+    # ===== VecEnv API =====
+
+    def reset(self):
+        if self._seeds[0] is not None:
+            self._rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+
+        self._reset_envs(np.arange(self.num_envs))
+        return self._get_observations()
+
+    def step_async(self, actions: np.ndarray):
+        self._actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        step, count, last = self._step, self._count, self._last
+        select = self._actions == 1
+
+        # ===== Overlap 제약 체크 =====
+        # Gap이 너무 크면 큰 페널티 + 강제 SKIP
+        violation = select & (count > 0) & (step - last > self.max_gap)
+        rewards = np.where(violation, -5.0, 0.0)
+
+        # Gap 제약 통과 → 선택 허용
+        rows = (select & ~violation & (count < self.target_frames)).nonzero()[0]
+        if len(rows) > 0:
+            self._selected[rows, count[rows]] = step[rows]
+            count[rows] += 1
+            last[rows] = step[rows]
+
+        # 다음 프레임으로 이동
+        step += 1
+
+        # Episode 종료 조건 (gap 위반 step은 종료 판정 없음)
+        # count <= target_frames이므로 목표 미달 상태로 프레임이 끝나면 항상 truncated
+        checked = ~violation
+        terminated = checked & (count == self.target_frames)
+        truncated = checked & ~terminated & (step >= self._env_n_frames)
+
+        rewards[truncated] = -10.0
+        for env_id in terminated.nonzero()[0].tolist():
+            rewards[env_id] = self._final_reward(env_id)
+
+        obs = self._get_observations()
+        dones = terminated | truncated
+
+        infos: List[Dict[str, Any]] = [
+            {
+                'selected_count': c,
+                'current_step': t,
+                'gap_violation': v,
+                'TimeLimit.truncated': tr,
+            }
+            for c, t, v, tr in zip(count.tolist(), step.tolist(), violation.tolist(), truncated.tolist())
+        ]
+
+        done_ids = dones.nonzero()[0]
+        if len(done_ids) > 0:
+            for env_id in done_ids.tolist():
+                infos[env_id]['terminal_observation'] = obs[env_id].copy()
+            self._reset_envs(done_ids)
+            obs = self._get_observations()
+
+        return obs, rewards.astype(np.float32), dones, infos
+
+    def close(self):
+        for video in self._loaded.values():
+            if hasattr(video['frames'], 'close'):
+                video['frames'].close()
+        self._loaded.clear()
+        self._feature_stores.clear()
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        return [getattr(self, method_name)(*method_args, **method_kwargs)
+                for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
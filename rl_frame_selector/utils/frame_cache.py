@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+프레임 / 품질 메트릭 디스크 캐시
+
+FrameSelectionEnv.reset()마다 비디오를 다시 디코딩하고 메트릭을 다시 계산하지 않도록,
+(비디오 경로, mtime, num_source_frames) 키로 디코딩된 프레임과 메트릭을 저장한다.
+
+- 프레임: (N, H, W, 3) uint8 .npy → np.load(mmap_mode='r')로 memory-map
+  (SubprocVecEnv 워커들이 OS page cache를 공유)
+- 메트릭: (N, 3) float64 .npy (sharpness, brisque, brightness 순서)
+"""
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.video_utils import extract_frames_uniformly
+from utils.quality_metrics import compute_all_metrics_batch
+
+
+METRIC_KEYS = ('sharpness', 'brisque', 'brightness')
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'RL_FRAME_CACHE_DIR',
+    str(Path.home() / '.cache' / 'rl_frame_selector')
+)
+
+
+def get_cache_key(video_path: str, num_source_frames: int,
+                  max_side: Optional[int] = None) -> str:
+    """
+    캐시 키 생성: (절대 경로, mtime, num_source_frames, analysis 해상도)
+
+    디렉토리(DTU, CO3Dv2)의 경우 images/ 디렉토리의 mtime을 사용
+    (파일 추가/삭제 시 갱신됨)
+    """
+    path = Path(video_path).resolve()
+    stat_target = path / "images" if (path.is_dir() and (path / "images").exists()) else path
+    mtime_ns = stat_target.stat().st_mtime_ns
+
+    raw = f"{path}|{mtime_ns}|{num_source_frames}"
+    suffix = ""
+    if max_side is not None:
+        raw += f"|{max_side}"
+        suffix = f"_s{max_side}"
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+    return f"{path.name}_{num_source_frames}{suffix}_{digest}"
+
+
+def _cache_paths(cache_dir: str, key: str) -> Tuple[Path, Path]:
+    cache_root = Path(cache_dir)
+    return cache_root / f"{key}.frames.npy", cache_root / f"{key}.metrics.npy"
+
+
+def _atomic_save(path: Path, array: np.ndarray):
+    """임시 파일에 쓴 뒤 os.replace → 여러 워커가 동시에 써도 깨진 파일이 보이지 않음"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def metrics_to_array(quality_metrics: List[Dict[str, float]]) -> np.ndarray:
+    """메트릭 dict 리스트 → (N, 3) float64 배열"""
+    return np.array(
+        [[m[k] for k in METRIC_KEYS] for m in quality_metrics],
+        dtype=np.float64
+    ).reshape(-1, len(METRIC_KEYS))
+
+
+def array_to_metrics(metrics: np.ndarray) -> List[Dict[str, float]]:
+    """(N, 3) 배열 → 메트릭 dict 리스트 (env 호환)"""
+    return [
+        {k: float(v) for k, v in zip(METRIC_KEYS, row)}
+        for row in metrics
+    ]
+
+
+def load_frame_cache(video_path: str, num_source_frames: int,
+                     cache_dir: Optional[str] = None,
+                     max_side: Optional[int] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    캐시 조회
+
+    Returns:
+        (frames memmap (N, H, W, 3) uint8, metrics (N, 3) float64) 또는 None (cache miss)
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    key = get_cache_key(video_path, num_source_frames, max_side)
+    frames_path, metrics_path = _cache_paths(cache_dir, key)
+
+    if not (frames_path.exists() and metrics_path.exists()):
+        return None
+
+    try:
+        frames = np.load(frames_path, mmap_mode='r')
+        metrics = np.load(metrics_path)
+    except (ValueError, OSError) as e:
+        print(f"⚠️  캐시 파일 손상, 무시: {frames_path} ({e})")
+        return None
+
+    if len(frames) != len(metrics):
+        return None
+
+    return frames, metrics
+
+
+def save_frame_cache(video_path: str, num_source_frames: int,
+                     frames: List[np.ndarray], quality_metrics: List[Dict[str, float]],
+                     cache_dir: Optional[str] = None,
+                     max_side: Optional[int] = None) -> bool:
+    """
+    프레임 + 메트릭을 캐시에 저장
+
+    Returns:
+        저장 성공 여부 (프레임 해상도가 서로 다르면 stack 불가 → False)
+    """
+    if len(frames) == 0:
+        return False
+
+    shape = frames[0].shape
+    if any(f.shape != shape for f in frames):
+        print(f"⚠️  프레임 해상도가 일정하지 않아 캐시하지 않음: {video_path}")
+        return False
+
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+    key = get_cache_key(video_path, num_source_frames, max_side)
+    frames_path, metrics_path = _cache_paths(cache_dir, key)
+
+    # 메트릭 먼저 저장 → 프레임 파일 존재 = 캐시 완성
+    _atomic_save(metrics_path, metrics_to_array(quality_metrics))
+    _atomic_save(frames_path, np.stack(frames).astype(np.uint8, copy=False))
+    return True
+
+
+def load_or_build_frame_cache(video_path: str, num_source_frames: int,
+                              cache_dir: Optional[str] = None,
+                              max_side: Optional[int] = None
+                              ) -> Tuple[np.ndarray, List[Dict[str, float]]]:
+    """
+    캐시에서 프레임/메트릭 로드, 없으면 디코딩 + 메트릭 계산 후 저장
+
+    Args:
+        video_path: 비디오 파일 경로 또는 이미지 디렉토리 경로
+        num_source_frames: 추출할 프레임 수
+        cache_dir: 캐시 디렉토리 (None = RL_FRAME_CACHE_DIR 또는 ~/.cache/rl_frame_selector)
+        max_side: analysis 해상도 (긴 변, None = 원본). 로드 시 1회 downscale 후 캐시
+
+    Returns:
+        (frames, quality_metrics)
+        - frames: (N, H, W, 3) uint8 (cache hit 시 read-only memmap)
+        - quality_metrics: [{'sharpness': ..., 'brisque': ..., 'brightness': ...}, ...]
+    """
+    cached = load_frame_cache(video_path, num_source_frames, cache_dir, max_side)
+    if cached is not None:
+        frames, metrics = cached
+        print(f"⚡ 캐시 hit: {video_path} ({len(frames)}개 프레임)")
+        return frames, array_to_metrics(metrics)
+
+    frames = extract_frames_uniformly(video_path, num_source_frames, max_side=max_side)
+
+    print(f"📊 품질 메트릭 계산 중...")
+    quality_metrics = compute_all_metrics_batch(frames)
+
+    if save_frame_cache(video_path, num_source_frames, frames, quality_metrics, cache_dir, max_side):
+        cached = load_frame_cache(video_path, num_source_frames, cache_dir, max_side)
+        if cached is not None:
+            frames = cached[0]
+        print(f"💾 캐시 저장 완료: {cache_dir or DEFAULT_CACHE_DIR}")
+
+    return frames, quality_metrics
+
+
+def preload_frame_cache(video_paths: List[str], num_source_frames: int,
+                        cache_dir: Optional[str] = None,
+                        max_side: Optional[int] = None) -> int:
+    """
+    학습 비디오들을 캐시에 미리 저장 (SubprocVecEnv 생성 전, 메인 프로세스에서 1회 호출)
+
+    워커들은 이후 같은 .npy를 read-only memmap으로 열기만 하므로
+    프레임 데이터는 OS page cache에 한 벌만 존재하고 --n-envs가 늘어도 RSS가 늘지 않음
+
+    Args:
+        video_paths: 비디오 파일 / 이미지 디렉토리 경로 리스트
+        num_source_frames: 추출할 프레임 수
+        cache_dir: 캐시 디렉토리
+        max_side: analysis 해상도 (긴 변, None = 원본)
+
+    Returns:
+        캐시된 프레임 데이터 총 bytes
+    """
+    total_bytes = 0
+    for i, video_path in enumerate(video_paths):
+        print(f"   [{i + 1}/{len(video_paths)}] ", end='')
+        frames, _ = load_or_build_frame_cache(video_path, num_source_frames, cache_dir, max_side)
+        total_bytes += getattr(frames, 'nbytes', 0)
+        del frames  # memmap 닫기 (decoded 리스트도 해제)
+    return total_bytes
@@ -4,59 +4,149 @@ Overlap 및 Feature Matching 유틸리티
 """
 import cv2
 import numpy as np
-from typing import List
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Optional
 
+from utils.frame_cache import _atomic_save
 
-def compute_sift_matches(frame1: np.ndarray, frame2: np.ndarray,
-                         ratio_threshold: float = 0.75) -> int:
+
+SIFT_NFEATURES = 500  # 속도를 위해 500개 제한
+
+
+def count_good_matches(des1: Optional[np.ndarray], des2: Optional[np.ndarray],
+                       ratio_threshold: float = 0.75,
+                       matcher: Optional[cv2.BFMatcher] = None) -> int:
     """
-    두 프레임 간 SIFT feature matching 수 계산
+    두 descriptor 집합 간 Lowe's ratio test를 통과한 매칭 수
 
     Args:
-        frame1, frame2: 연속 프레임
+        des1, des2: SIFT descriptors (None 가능)
         ratio_threshold: Lowe's ratio test threshold
+        matcher: 재사용할 BFMatcher (None = 새로 생성)
 
     Returns:
         Good matches 개수
     """
-    # Grayscale 변환
-    gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-    gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
-
-    # SIFT feature detection
-    sift = cv2.SIFT_create(nfeatures=500)  # 속도를 위해 500개 제한
-    kp1, des1 = sift.detectAndCompute(gray1, None)
-    kp2, des2 = sift.detectAndCompute(gray2, None)
-
     if des1 is None or des2 is None or len(des1) < 2 or len(des2) < 2:
         return 0
 
-    # BFMatcher
-    bf = cv2.BFMatcher()
+    bf = matcher if matcher is not None else cv2.BFMatcher()
     try:
         matches = bf.knnMatch(des1, des2, k=2)
     except Exception:
         return 0
 
     # Lowe's ratio test
-    good_matches = []
+    good_matches = 0
     for match_pair in matches:
         if len(match_pair) == 2:
             m, n = match_pair
             if m.distance < ratio_threshold * n.distance:
-                good_matches.append(m)
+                good_matches += 1
+
+    return good_matches
+
+
+class SIFTFeatureStore:
+    """
+    비디오 단위 SIFT descriptor 저장소 + pair 매칭 수 LRU
+
+    - 각 프레임 인덱스의 descriptor는 최초 요청 시 한 번만 계산
+    - (i, j) pair의 매칭 수는 LRU에 memoize → 이후 episode에서 재사용
+    """
+
+    def __init__(self, frames, ratio_threshold: float = 0.75,
+                 nfeatures: int = SIFT_NFEATURES, max_cached_pairs: int = 8192,
+                 video_path: Optional[str] = None):
+        """
+        Args:
+            frames: 전체 프레임 (리스트 또는 (N, H, W, 3) 배열)
+            ratio_threshold: Lowe's ratio test threshold
+            nfeatures: 프레임당 최대 SIFT feature 수
+            max_cached_pairs: pair 매칭 수 LRU 크기
+            video_path: 출처 비디오 (재사용 여부 판단용)
+        """
+        self.frames = frames
+        self.video_path = video_path
+        self.ratio_threshold = ratio_threshold
+        self.max_cached_pairs = max_cached_pairs
+
+        self._sift = cv2.SIFT_create(nfeatures=nfeatures)
+        self._matcher = cv2.BFMatcher()
+        self._descriptors: Dict[int, Optional[np.ndarray]] = {}
+        self._pair_cache: "OrderedDict[tuple, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def get_descriptors(self, idx: int) -> Optional[np.ndarray]:
+        """프레임 idx의 SIFT descriptor (캐시)"""
+        if idx not in self._descriptors:
+            gray = cv2.cvtColor(np.asarray(self.frames[idx]), cv2.COLOR_BGR2GRAY)
+            _, des = self._sift.detectAndCompute(gray, None)
+            # OpenCV SIFT descriptor 값은 0-255 정수 → uint8로 저장해도 손실 없음 (메모리 1/4)
+            self._descriptors[idx] = None if des is None else des.astype(np.uint8)
+        des = self._descriptors[idx]
+        return None if des is None else des.astype(np.float32)
+
+    def has_descriptors(self, indices: List[int]) -> bool:
+        """indices의 descriptor가 모두 계산되어 있는지 (True면 프레임 없이 매칭 가능)"""
+        return all(int(idx) in self._descriptors for idx in indices)
+
+    def num_matches(self, i: int, j: int) -> int:
+        """프레임 i → j 매칭 수 (LRU memoize)"""
+        key = (int(i), int(j))
+        cached = self._pair_cache.get(key)
+        if cached is not None:
+            self._pair_cache.move_to_end(key)
+            return cached
+
+        result = count_good_matches(
+            self.get_descriptors(key[0]), self.get_descriptors(key[1]),
+            self.ratio_threshold, self._matcher
+        )
+
+        self._pair_cache[key] = result
+        if len(self._pair_cache) > self.max_cached_pairs:
+            self._pair_cache.popitem(last=False)
+        return result
+
+
+def compute_sift_matches(frame1: np.ndarray, frame2: np.ndarray,
+                         ratio_threshold: float = 0.75) -> int:
+    """
+    두 프레임 간 SIFT feature matching 수 계산
+
+    Args:
+        frame1, frame2: 연속 프레임
+        ratio_threshold: Lowe's ratio test threshold
+
+    Returns:
+        Good matches 개수
+    """
+    # Grayscale 변환
+    gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
+    gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
+
+    # SIFT feature detection
+    sift = cv2.SIFT_create(nfeatures=SIFT_NFEATURES)
+    kp1, des1 = sift.detectAndCompute(gray1, None)
+    kp2, des2 = sift.detectAndCompute(gray2, None)
 
-    return len(good_matches)
+    return count_good_matches(des1, des2, ratio_threshold)
 
 
 def compute_pairwise_overlap(frames: List[np.ndarray],
-                             selected_indices: List[int]) -> float:
+                             selected_indices: List[int],
+                             feature_store: Optional[SIFTFeatureStore] = None) -> float:
     """
     선택된 프레임들의 pairwise overlap score 계산
 
     Args:
         frames: 전체 프레임 리스트
         selected_indices: 선택된 프레임 인덱스
+        feature_store: 같은 비디오의 SIFTFeatureStore (있으면 descriptor/매칭 재사용)
 
     Returns:
         평균 overlap score (0-1, 높을수록 좋음)
@@ -70,10 +160,10 @@ def compute_pairwise_overlap(frames: List[np.ndarray],
         idx1 = selected_indices[i]
         idx2 = selected_indices[i + 1]
 
-        frame1 = frames[idx1]
-        frame2 = frames[idx2]
-
-        num_matches = compute_sift_matches(frame1, frame2)
+        if feature_store is not None:
+            num_matches = feature_store.num_matches(idx1, idx2)
+        else:
+            num_matches = compute_sift_matches(frames[idx1], frames[idx2])
         overlap_scores.append(num_matches)
 
     # 평균 매칭 수
@@ -85,6 +175,125 @@ def compute_pairwise_overlap(frames: List[np.ndarray],
     return float(normalized)
 
 
+def compute_overlap_band(feature_store: SIFTFeatureStore, window: int) -> np.ndarray:
+    """
+    Banded overlap 행렬 계산: 모든 (i, i+d) pair, 1 <= d <= window
+
+    Args:
+        feature_store: 비디오의 SIFTFeatureStore (descriptor는 프레임당 1회 계산)
+        window: band 폭 (최대 프레임 gap)
+
+    Returns:
+        (N, window) float16 배열, band[i, d-1] = frame i → i+d SIFT 매칭 수
+        (매칭 수 <= nfeatures=500 이므로 float16으로 정확히 표현됨)
+    """
+    n = len(feature_store)
+    band = np.zeros((n, window), dtype=np.float16)
+
+    for i in range(n):
+        for d in range(1, window + 1):
+            j = i + d
+            if j >= n:
+                break
+            band[i, d - 1] = feature_store.num_matches(i, j)
+
+    return band
+
+
+def get_overlap_band_path(video_path: str, num_source_frames: int, window: int,
+                          max_side: Optional[int] = None) -> Path:
+    """
+    Overlap band 파일 경로 (비디오 옆에 저장)
+
+    - 비디오 파일: <dir>/<stem>.overlap_n{N}_w{W}[_s{S}].npy
+    - 이미지 디렉토리: <dir>/overlap_n{N}_w{W}[_s{S}].npy
+    (S = analysis 해상도, 원본 해상도면 생략)
+    """
+    path = Path(video_path)
+    name = f"overlap_n{num_source_frames}_w{window}"
+    if max_side is not None:
+        name += f"_s{max_side}"
+    name += ".npy"
+    if path.is_dir():
+        return path / name
+    return path.parent / f"{path.stem}.{name}"
+
+
+def load_or_build_overlap_band(video_path: str, frames, num_source_frames: int, window: int,
+                               feature_store: Optional[SIFTFeatureStore] = None,
+                               max_side: Optional[int] = None) -> np.ndarray:
+    """
+    비디오 옆에 저장된 overlap band를 로드, 없거나 오래되었으면 계산 후 저장
+
+    Args:
+        video_path: 비디오 파일 경로 또는 이미지 디렉토리 경로
+        frames: 추출된 프레임 (num_source_frames 기준)
+        num_source_frames: 추출 요청 프레임 수 (파일명 키)
+        window: band 폭
+        feature_store: 재사용할 SIFTFeatureStore (None = 새로 생성)
+        max_side: frames의 analysis 해상도 (파일명 키, None = 원본)
+
+    Returns:
+        (N, window) float16 overlap band
+    """
+    band_path = get_overlap_band_path(video_path, num_source_frames, window, max_side)
+    source = Path(video_path)
+    source_mtime = (source / "images").stat().st_mtime if (source / "images").exists() else source.stat().st_mtime
+
+    if band_path.exists() and band_path.stat().st_mtime >= source_mtime:
+        try:
+            band = np.load(band_path)
+            if band.shape == (len(frames), window):
+                return band
+        except (OSError, ValueError, EOFError) as e:
+            print(f"⚠️  Overlap band 파일 손상, 다시 계산: {band_path} ({e})")
+
+    print(f"🔍 Overlap band 계산 중... ({len(frames)} frames, window={window})")
+    if feature_store is None:
+        feature_store = SIFTFeatureStore(frames, video_path=video_path)
+    band = compute_overlap_band(feature_store, window)
+
+    try:
+        _atomic_save(band_path, band)
+        print(f"💾 Overlap band 저장: {band_path}")
+    except OSError as e:
+        print(f"⚠️  Overlap band 저장 실패 (메모리에서만 사용): {e}")
+
+    return band
+
+
+def overlap_score_from_band(band: np.ndarray, selected_indices: List[int],
+                            feature_store: Optional[SIFTFeatureStore] = None) -> float:
+    """
+    미리 계산된 overlap band로 compute_pairwise_overlap과 같은 score 계산 (vectorized lookup)
+
+    Args:
+        band: (N, window) overlap band
+        selected_indices: 선택된 프레임 인덱스 (오름차순)
+        feature_store: band 밖 pair(gap > window)를 계산할 SIFTFeatureStore (None = 0 매칭)
+
+    Returns:
+        평균 overlap score (0-1, 높을수록 좋음)
+    """
+    if len(selected_indices) < 2:
+        return 0.0
+
+    selected = np.asarray(selected_indices, dtype=np.int64)
+    starts = selected[:-1]
+    gaps = np.diff(selected)
+
+    in_band = (gaps >= 1) & (gaps <= band.shape[1])
+    matches = np.zeros(len(gaps), dtype=np.float64)
+    matches[in_band] = band[starts[in_band], gaps[in_band] - 1]
+
+    if feature_store is not None:
+        for k in np.flatnonzero(~in_band):
+            matches[k] = feature_store.num_matches(selected[k], selected[k + 1])
+
+    # 정규화 (compute_pairwise_overlap과 동일)
+    return float(min(matches.mean() / 100.0, 1.0))
+
+
 def estimate_min_gap_for_overlap(frame1: np.ndarray, frame2: np.ndarray,
                                  frames_between: List[np.ndarray],
                                  min_matches: int = 30) -> int:
@@ -124,7 +333,8 @@ def estimate_min_gap_for_overlap(frame1: np.ndarray, frame2: np.ndarray,
 
 def check_colmap_feasibility(frames: List[np.ndarray],
                              selected_indices: List[int],
-                             min_matches: int = 30) -> bool:
+                             min_matches: int = 30,
+                             feature_store: Optional[SIFTFeatureStore] = None) -> bool:
     """
     선택된 프레임들이 COLMAP으로 재구성 가능한지 체크
 
@@ -132,6 +342,7 @@ def check_colmap_feasibility(frames: List[np.ndarray],
         frames: 전체 프레임 리스트
         selected_indices: 선택된 프레임 인덱스
         min_matches: 필요한 최소 매칭 수
+        feature_store: 같은 비디오의 SIFTFeatureStore (있으면 descriptor/매칭 재사용)
 
     Returns:
         True if feasible, False otherwise
@@ -143,10 +354,10 @@ def check_colmap_feasibility(frames: List[np.ndarray],
         idx1 = selected_indices[i]
         idx2 = selected_indices[i + 1]
 
-        frame1 = frames[idx1]
-        frame2 = frames[idx2]
-
-        num_matches = compute_sift_matches(frame1, frame2)
+        if feature_store is not None:
+            num_matches = feature_store.num_matches(idx1, idx2)
+        else:
+            num_matches = compute_sift_matches(frames[idx1], frames[idx2])
 
         if num_matches < min_matches:
             return False
@@ -4,8 +4,9 @@
 """
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from skimage import color, filters
-from typing import Dict
+from typing import Dict, List, Optional
 
 
 def compute_sharpness(frame: np.ndarray) -> float:
@@ -59,3 +60,95 @@ def compute_all_metrics(frame: np.ndarray) -> Dict[str, float]:
         'brisque': compute_brisque_simple(frame),
         'brightness': compute_brightness(frame)
     }
+
+
+def _metrics_for_gray(gray: np.ndarray) -> np.ndarray:
+    """
+    (H, W) float32 grayscale (0-255) → [sharpness, brisque, brightness]
+
+    프레임 하나씩 2D float32로 처리 (float64 중간 배열 없음, 표준편차는 cv2.meanStdDev 한 번).
+    프레임을 채널 축에 쌓은 (H, W, n) 배열은 OpenCV 필터가 interleaved 채널을 처리하느라
+    오히려 느려서 사용하지 않음 (1280x720 기준 프레임별 처리보다 0.7-1.0x).
+    """
+    # 1. Sharpness: Laplacian variance
+    _, lap_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
+    sharpness = min(float(lap_std[0, 0]) ** 2 / 1000.0, 1.0)
+
+    # 2. BRISQUE-lite: local contrast std
+    g = gray * np.float32(1.0 / 255.0)
+    mu = cv2.GaussianBlur(g, (7, 7), 1.5)
+    sigma = np.sqrt(np.abs(cv2.GaussianBlur(g * g, (7, 7), 1.5) - mu * mu))
+    _, sigma_std = cv2.meanStdDev(sigma)
+    brisque = 1.0 / (1.0 + float(sigma_std[0, 0]))
+
+    # 3. Brightness
+    brightness = float(gray.mean(dtype=np.float64)) / 255.0
+
+    return np.array([sharpness, brisque, brightness])
+
+
+def compute_all_metrics_batch(frames, chunk_size: int = 8,
+                              num_workers: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    여러 프레임의 품질 메트릭을 한 번에 계산 (compute_all_metrics의 batch 버전)
+
+    - 프레임당 grayscale 변환 1회, 이후 세 메트릭을 float32 2D 배열 하나로 계산
+      (compute_all_metrics는 메트릭마다 grayscale 변환 + float64 배열)
+    - num_workers > 1이면 chunk_size개 프레임 단위로 thread pool에서 병렬 처리
+      (OpenCV/NumPy는 GIL 해제)
+
+    Args:
+        frames: BGR 프레임 리스트 또는 (N, H, W, 3) 배열
+        chunk_size: thread pool 작업 하나가 처리할 프레임 수
+        num_workers: thread 수 (None 또는 1 = 단일 thread)
+
+    Returns:
+        compute_all_metrics와 같은 형식의 dict 리스트 (float32 계산으로 ~1e-6 수준 오차)
+    """
+    n = len(frames)
+    if n == 0:
+        return []
+
+    chunk_size = max(1, chunk_size)
+
+    def _process(start: int) -> np.ndarray:
+        return np.stack([
+            _metrics_for_gray(cv2.cvtColor(np.asarray(f), cv2.COLOR_BGR2GRAY).astype(np.float32))
+            for f in frames[start:start + chunk_size]
+        ])
+
+    starts = range(0, n, chunk_size)
+    if num_workers is not None and num_workers > 1:
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            results = list(pool.map(_process, starts))
+    else:
+        results = [_process(start) for start in starts]
+
+    metrics = np.concatenate(results, axis=0)
+    return [
+        {'sharpness': float(m[0]), 'brisque': float(m[1]), 'brightness': float(m[2])}
+        for m in metrics
+    ]
+
+
+def compute_all_metrics_stream(frame_iter, chunk_size: int = 8) -> List[Dict[str, float]]:
+    """
+    프레임 iterator에서 chunk 단위로 메트릭 계산 (전체 프레임을 메모리에 올리지 않음)
+
+    Args:
+        frame_iter: BGR 프레임 iterator (예: LazyFrameSequence.iter_frames())
+        chunk_size: compute_all_metrics_batch에 넘길 chunk 크기
+
+    Returns:
+        compute_all_metrics와 같은 형식의 dict 리스트
+    """
+    metrics = []
+    chunk = []
+    for frame in frame_iter:
+        chunk.append(frame)
+        if len(chunk) == chunk_size:
+            metrics.extend(compute_all_metrics_batch(chunk, chunk_size=chunk_size))
+            chunk = []
+    if chunk:
+        metrics.extend(compute_all_metrics_batch(chunk, chunk_size=chunk_size))
+    return metrics
@@ -4,19 +4,116 @@
 """
 import cv2
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Iterator
 import tempfile
 import subprocess
 
 
-def extract_frames_uniformly(video_path: str, num_frames: int = 300) -> List[np.ndarray]:
+def sample_frame_indices(total: int, num_frames: int) -> List[int]:
+    """total개 중 num_frames개를 균등 샘플링한 인덱스 (부족하면 전체)"""
+    if total < num_frames:
+        return list(range(total))
+    return [int(i) for i in np.linspace(0, total - 1, num_frames, dtype=int)]
+
+
+def resize_to_max_side(frame: np.ndarray, max_side: Optional[int]) -> np.ndarray:
+    """
+    긴 변이 max_side가 되도록 downscale (INTER_AREA, 이미 작으면 그대로)
+
+    Surrogate 메트릭 / SIFT overlap용 analysis 해상도 (예: 640)
+    """
+    if max_side is None:
+        return frame
+    h, w = frame.shape[:2]
+    scale = max_side / max(h, w)
+    if scale >= 1.0:
+        return frame
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def list_image_files(images_dir: Path) -> List[Path]:
+    """images/ 디렉토리의 이미지 파일 (정렬된 순서)"""
+    return sorted(images_dir.glob("*.png")) + \
+           sorted(images_dir.glob("*.jpg")) + \
+           sorted(images_dir.glob("*.jpeg"))
+
+
+def read_frames_seek(cap: cv2.VideoCapture, indices) -> List[np.ndarray]:
+    """
+    Seek 기반 프레임 읽기 (프레임마다 CAP_PROP_POS_FRAMES 설정)
+
+    매 seek마다 직전 keyframe부터 다시 디코딩하므로 GOP가 길수록 느림
+    """
+    frames = []
+    for idx in indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
+        ret, frame = cap.read()
+        if ret:
+            frames.append(frame)
+    return frames
+
+
+def iter_frames_sequential(cap: cv2.VideoCapture, indices) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    한 번의 forward pass로 (인덱스, 프레임) 순회
+
+    grab()으로 모든 프레임을 지나가되, 대상 인덱스에서만 retrieve()로 디코딩 결과를 꺼냄
+    (seek 없음 → 전체 비용 ~ 비디오 길이 1회 디코딩)
+
+    Args:
+        cap: 처음 위치(0)에 있는 VideoCapture
+        indices: 프레임 인덱스 (중복 제거 후 오름차순으로 방문)
+    """
+    pos = 0
+    for target in sorted(set(int(i) for i in indices)):
+        # target 직전까지 건너뛰기
+        while pos < target:
+            if not cap.grab():
+                break
+            pos += 1
+        if pos < target:
+            return  # 실제 프레임 수가 CAP_PROP_FRAME_COUNT보다 적음
+
+        if not cap.grab():
+            return
+        pos += 1
+
+        ret, frame = cap.retrieve()
+        if ret:
+            yield target, frame
+
+
+def read_frames_sequential(cap: cv2.VideoCapture, indices) -> List[np.ndarray]:
+    """
+    한 번의 forward pass로 프레임 읽기 (iter_frames_sequential 참고)
+
+    Args:
+        cap: 처음 위치(0)에 있는 VideoCapture
+        indices: 오름차순 프레임 인덱스
+
+    Returns:
+        프레임 리스트 (indices 순서, 읽지 못한 프레임은 제외)
+    """
+    decoded = dict(iter_frames_sequential(cap, indices))
+    return [decoded[int(i)] for i in indices if int(i) in decoded]
+
+
+def extract_frames_uniformly(video_path: str, num_frames: int = 300,
+                             decode_mode: str = 'sequential',
+                             max_side: Optional[int] = None) -> List[np.ndarray]:
     """
     비디오 파일 또는 이미지 디렉토리에서 균등한 간격으로 프레임 추출
 
     Args:
         video_path: 비디오 파일 경로 또는 이미지 디렉토리 경로
         num_frames: 추출할 프레임 수
+        decode_mode: 비디오 파일 디코딩 방식
+                     - 'sequential': 1회 forward pass (grab/retrieve, 기본값)
+                     - 'seek': 프레임마다 seek (이전 방식)
+        max_side: 설정 시 각 프레임을 긴 변 max_side로 downscale (analysis 해상도)
 
     Returns:
         프레임 리스트 (각 프레임은 numpy array)
@@ -32,9 +129,7 @@ def extract_frames_uniformly(video_path: str, num_frames: int = 300) -> List[np.
             return []
 
         # 이미지 파일 로드 (정렬된 순서)
-        image_files = sorted(images_dir.glob("*.png")) + \
-                      sorted(images_dir.glob("*.jpg")) + \
-                      sorted(images_dir.glob("*.jpeg"))
+        image_files = list_image_files(images_dir)
 
         if len(image_files) == 0:
             print(f"⚠️  이미지 파일이 없음: {images_dir}")
@@ -43,16 +138,13 @@ def extract_frames_uniformly(video_path: str, num_frames: int = 300) -> List[np.
         total_images = len(image_files)
 
         # 균등 샘플링
-        if total_images < num_frames:
-            indices = list(range(total_images))
-        else:
-            indices = np.linspace(0, total_images - 1, num_frames, dtype=int)
+        indices = sample_frame_indices(total_images, num_frames)
 
         frames = []
         for idx in indices:
             img = cv2.imread(str(image_files[idx]))
             if img is not None:
-                frames.append(img)
+                frames.append(resize_to_max_side(img, max_side))
 
         print(f"✅ 이미지 디렉토리에서 {len(frames)}개 프레임 추출 완료 (총 {total_images}개 중)")
         return frames
@@ -62,26 +154,155 @@ def extract_frames_uniformly(video_path: str, num_frames: int = 300) -> List[np.
         cap = cv2.VideoCapture(video_path)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
-        if total_frames < num_frames:
-            # 프레임 수가 부족하면 모든 프레임 사용
-            indices = list(range(total_frames))
-        else:
-            # 균등 샘플링
-            indices = np.linspace(0, total_frames - 1, num_frames, dtype=int)
+        # 균등 샘플링 (프레임 수가 부족하면 모든 프레임 사용)
+        indices = sample_frame_indices(total_frames, num_frames)
 
-        frames = []
-        for idx in indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-            ret, frame = cap.read()
-            if ret:
-                frames.append(frame)
+        if decode_mode == 'sequential':
+            frames = read_frames_sequential(cap, indices)
+        elif decode_mode == 'seek':
+            frames = read_frames_seek(cap, indices)
+        else:
+            cap.release()
+            raise ValueError(f"Unknown decode_mode: {decode_mode}")
 
         cap.release()
 
+        if max_side is not None:
+            frames = [resize_to_max_side(f, max_side) for f in frames]
+
         print(f"✅ 비디오에서 {len(frames)}개 프레임 추출 완료")
         return frames
 
 
+class LazyFrameSequence:
+    """
+    extract_frames_uniformly와 같은 프레임을 인덱스 단위로 필요할 때만 디코딩
+
+    - frames[i]: i번째 샘플 프레임 (bounded LRU 캐시)
+    - len(frames): 샘플 프레임 수
+    - iter_frames(): 전체 프레임을 1회 forward pass로 순회 (캐시하지 않음)
+    - max_side 설정 시 두 경로 모두 analysis 해상도로 downscale
+
+    메모리 사용량은 N x H x W x 3 대신 max_cached_bytes로 제한됨
+    """
+
+    # 이 거리 이내의 forward 접근은 seek 대신 grab()으로 건너뜀
+    _MAX_FORWARD_GRAB = 64
+
+    def __init__(self, video_path: str, num_frames: int = 300,
+                 max_cached_bytes: int = 256 * 1024 ** 2,
+                 max_side: Optional[int] = None):
+        """
+        Args:
+            video_path: 비디오 파일 경로 또는 이미지 디렉토리 경로
+            num_frames: 샘플링할 프레임 수
+            max_cached_bytes: 디코딩된 프레임 LRU 최대 크기 (bytes)
+            max_side: 설정 시 프레임을 긴 변 max_side로 downscale (analysis 해상도)
+        """
+        self.video_path = video_path
+        self.max_cached_bytes = max_cached_bytes
+        self.max_side = max_side
+
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._cached_bytes = 0
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._next_pos = 0
+
+        path = Path(video_path)
+        if path.is_dir():
+            self._image_files = list_image_files(path / "images")
+            total = len(self._image_files)
+        else:
+            self._image_files = None
+            cap = cv2.VideoCapture(video_path)
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+
+        self.source_indices = sample_frame_indices(total, num_frames)
+
+    def __len__(self) -> int:
+        return len(self.source_indices)
+
+    def _decode(self, idx: int) -> Optional[np.ndarray]:
+        source_idx = self.source_indices[idx]
+
+        if self._image_files is not None:
+            return cv2.imread(str(self._image_files[source_idx]))
+
+        if self._cap is None:
+            self._cap = cv2.VideoCapture(self.video_path)
+            self._next_pos = 0
+
+        gap = source_idx - self._next_pos
+        if 0 <= gap <= self._MAX_FORWARD_GRAB:
+            for _ in range(gap):
+                self._cap.grab()
+        else:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, source_idx)
+
+        ret, frame = self._cap.read()
+        self._next_pos = source_idx + 1
+        return frame if ret else None
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        idx = int(idx)
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"frame index out of range: {idx}")
+
+        cached = self._cache.get(idx)
+        if cached is not None:
+            self._cache.move_to_end(idx)
+            return cached
+
+        frame = self._decode(idx)
+        if frame is None:
+            raise IOError(f"프레임 디코딩 실패: {self.video_path} [{idx}]")
+        frame = resize_to_max_side(frame, self.max_side)
+
+        self._cache[idx] = frame
+        self._cached_bytes += frame.nbytes
+        while self._cached_bytes > self.max_cached_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted.nbytes
+
+        return frame
+
+    def iter_frames(self) -> Iterator[np.ndarray]:
+        """
+        전체 샘플 프레임을 순서대로 순회 (LRU에 넣지 않음)
+
+        실제로 디코딩된 프레임 수가 더 적으면 (CAP_PROP_FRAME_COUNT 과대 추정) 길이를 줄임
+        """
+        if self._image_files is not None:
+            valid = []
+            for source_idx in self.source_indices:
+                img = cv2.imread(str(self._image_files[source_idx]))
+                if img is not None:
+                    valid.append(source_idx)
+                    yield resize_to_max_side(img, self.max_side)
+            self.source_indices = valid
+            return
+
+        cap = cv2.VideoCapture(self.video_path)
+        valid = []
+        try:
+            for source_idx, frame in iter_frames_sequential(cap, self.source_indices):
+                valid.append(source_idx)
+                yield resize_to_max_side(frame, self.max_side)
+        finally:
+            cap.release()
+        self.source_indices = valid
+
+    def close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+        self._cache.clear()
+        self._cached_bytes = 0
+
+
 def save_frames_to_temp(frames: List[np.ndarray], prefix: str = "rl_frames") -> str:
     """
     프레임을 임시 디렉토리에 저장
@@ -64,13 +64,22 @@ echo "⏰ 시작 시간: $(date)"
 # 시작 시간 기록
 START_TIME=$(date +%s)
 
-# conf_thres_value 자동 결정 (custom 데이터셋은 1.0, DTU 등은 5.0)
-if [[ "$DATA_DIR" == *"custom"* ]]; then
-    CONF_THRES=1.0
-    echo "🔧 Custom 데이터셋 감지 → conf_thres_value=1.0"
+# conf threshold 결정: demo_colmap.py가 depth_conf 히스토그램에서 목표 점 수를 맞추도록 자동 결정
+# (CONF_TARGET_POINTS로 목표 조정, CONF_THRES를 지정하면 고정 threshold 사용)
+if [ -n "$CONF_THRES" ]; then
+    CONF_ARGS="--conf_thres_value $CONF_THRES"
+    echo "🔧 고정 conf_thres_value=$CONF_THRES"
 else
-    CONF_THRES=5.0
-    echo "🔧 표준 데이터셋 (DTU 등) → conf_thres_value=5.0"
+    CONF_TARGET_POINTS="${CONF_TARGET_POINTS:-1000000}"
+    CONF_ARGS="--conf_target_points $CONF_TARGET_POINTS"
+    echo "🔧 conf threshold 자동 결정 (목표 ${CONF_TARGET_POINTS} points, depth_conf 히스토그램)"
+fi
+
+# VGGT 상주 워커 (vggt_server.py serve)가 떠 있으면 모델 로드 없이 워커에 scene 처리 요청
+# (VGGT_SERVER_SOCKET이 설정됐는데 워커가 떠 있지 않으면 scene 실패, 직접 모델을 로드하려면 변수를 unset)
+if [ -n "$VGGT_SERVER_SOCKET" ]; then
+    CONF_ARGS="$CONF_ARGS --server_socket $VGGT_SERVER_SOCKET"
+    echo "🔧 VGGT 워커 사용: $VGGT_SERVER_SOCKET"
 fi
 
 case "$PIPELINE" in
@@ -108,7 +117,7 @@ case "$PIPELINE" in
         source ./env/vggt_env/bin/activate
         PYTHONPATH=./libs/vggt:$PYTHONPATH python demo_colmap.py \
             --scene_dir "$TEMP_WORK_DIR" \
-            --conf_thres_value $CONF_THRES
+            $CONF_ARGS
 
         # 결과 복사
         cp -r "$TEMP_WORK_DIR/sparse" "$RESULT_DIR/"
@@ -120,7 +129,7 @@ case "$PIPELINE" in
         PYTHONPATH=./libs/vggt:$PYTHONPATH python demo_colmap.py \
             --scene_dir "$TEMP_WORK_DIR" \
             --use_ba \
-            --conf_thres_value $CONF_THRES \
+            $CONF_ARGS \
             --max_reproj_error 8.0 \
             --max_query_pts 4096
 
@@ -136,7 +145,7 @@ case "$PIPELINE" in
         source ./env/vggt_env/bin/activate
         PYTHONPATH=./libs/vggt:$PYTHONPATH python demo_colmap.py \
             --scene_dir "$TEMP_WORK_DIR" \
-            --conf_thres_value $CONF_THRES
+            $CONF_ARGS
             
 
         # Verify VGGT output
@@ -181,7 +190,7 @@ case "$PIPELINE" in
         PYTHONPATH=./libs/vggt:$PYTHONPATH python demo_colmap.py \
             --scene_dir "$TEMP_WORK_DIR" \
             --use_ba \
-            --conf_thres_value $CONF_THRES \
+            $CONF_ARGS \
             --max_reproj_error 8.0 \
             --max_query_pts 4096
 
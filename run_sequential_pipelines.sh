@@ -15,6 +15,44 @@ echo "순차 파이프라인 실행 시작"
 echo "=========================================="
 echo ""
 
+# VGGT_SERVER=1: VGGT 모델을 한 번만 로드하는 상주 워커를 띄우고 P2~P5가 재사용
+# (VGGT_CHECKPOINT로 로컬 .safetensors 지정 가능, 종료 시 워커도 정리)
+if [ "${VGGT_SERVER:-0}" = "1" ]; then
+    export VGGT_SERVER_SOCKET="${VGGT_SERVER_SOCKET:-/tmp/vggt_server_$$.sock}"
+    CHECKPOINT_ARGS=""
+    if [ -n "$VGGT_CHECKPOINT" ]; then
+        CHECKPOINT_ARGS="--checkpoint $VGGT_CHECKPOINT"
+    fi
+    echo "🧠 VGGT 워커 시작: $VGGT_SERVER_SOCKET"
+    # exec: subshell이 python으로 바뀌어서 $!가 워커 자체의 PID가 됨
+    (source ./env/vggt_env/bin/activate && \
+        PYTHONPATH=./libs/vggt:$PYTHONPATH exec python vggt_server.py serve --socket "$VGGT_SERVER_SOCKET" $CHECKPOINT_ARGS) &
+    VGGT_SERVER_PID=$!
+
+    # 종료 시 shutdown 요청 → 최대 10초 대기 → 그래도 남아 있으면 kill (GPU를 잡은 워커가 남지 않게)
+    stop_vggt_server() {
+        if [ -S "$VGGT_SERVER_SOCKET" ]; then
+            python3 vggt_server.py stop --socket "$VGGT_SERVER_SOCKET" >/dev/null 2>&1 || true
+        fi
+        for _ in $(seq 10); do
+            kill -0 $VGGT_SERVER_PID 2>/dev/null || return 0
+            sleep 1
+        done
+        kill $VGGT_SERVER_PID 2>/dev/null || true
+    }
+    trap stop_vggt_server EXIT
+
+    # 모델 로드 완료 (소켓 생성)까지 대기
+    while [ ! -S "$VGGT_SERVER_SOCKET" ]; do
+        if ! kill -0 $VGGT_SERVER_PID 2>/dev/null; then
+            echo "❌ VGGT 워커 시작 실패"
+            exit 1
+        fi
+        sleep 1
+    done
+    echo ""
+fi
+
 # 1. P1 on cGameController_v2
 echo "▶ [1/4] P1 파이프라인 실행 중 (cGameController_v2)..."
 ./run_pipeline.sh P1 ./datasets/custom/cGameController_v2
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+체크포인트 → PLY 변환의 peak RSS 비교: torch.load 전체 로드 vs mmap (gaussian_ply.load_checkpoint)
+
+gsplat 체크포인트 형태(splats + optimizer state)의 합성 체크포인트 여러 개를 만들고,
+모드별로 새 프로세스에서 전부 순서대로 변환하면서 peak RSS (/proc/self/status VmHWM)를 잰다.
+(ru_maxrss는 fork한 부모의 peak가 exec 후에도 남아 있어서 사용하지 않음, Linux 전용)
+mmap 모드는 splats 텐서만 읽으므로 peak가 splats 크기 근처에 머물러야 함.
+
+사용법:
+    python scripts/export/bench_checkpoint_loading.py --num-gaussians 1000000 --num-checkpoints 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import torch
+
+from gaussian_ply import load_checkpoint, splat_columns, write_gaussian_columns
+
+
+def make_checkpoint(path: str, num_gaussians: int, sh_degree: int, step: int):
+    """splats + Adam state (exp_avg, exp_avg_sq) — splats의 3배 크기"""
+    num_sh_rest = (sh_degree + 1) ** 2 - 1
+    splats = {
+        'means': torch.randn(num_gaussians, 3),
+        'scales': torch.randn(num_gaussians, 3) - 4,
+        'quats': torch.randn(num_gaussians, 4),
+        'opacities': torch.randn(num_gaussians),
+        'sh0': torch.randn(num_gaussians, 1, 3),
+        'shN': torch.randn(num_gaussians, num_sh_rest, 3) * 0.1,
+    }
+    optimizers = {
+        name: {'state': {0: {'step': torch.tensor(float(step)), 'exp_avg': torch.randn_like(value),
+                             'exp_avg_sq': torch.rand_like(value)}},
+               'param_groups': [{'lr': 1e-3, 'params': [0]}]}
+        for name, value in splats.items()
+    }
+    torch.save({'step': step, 'splats': splats, 'optimizers': optimizers}, path)
+    return sum(value.numel() * value.element_size() for value in splats.values())
+
+
+def _proc_status_mb(key: str) -> float:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(key + ':'):
+                return int(line.split()[1]) / 1024
+    raise KeyError(key)
+
+
+def convert_all(mode: str, ckpt_paths, output_dir: str):
+    """자식 프로세스: 체크포인트를 순서대로 PLY로 변환하고 peak RSS 출력"""
+    baseline_mb = _proc_status_mb('VmHWM')
+    start = time.perf_counter()
+    for index, ckpt_path in enumerate(ckpt_paths):
+        if mode == 'mmap':
+            ckpt = load_checkpoint(ckpt_path)
+        else:
+            ckpt = torch.load(ckpt_path, map_location='cpu')
+        write_gaussian_columns(os.path.join(output_dir, f'{mode}_{index}.ply'), splat_columns(ckpt['splats']))
+        del ckpt
+    print(json.dumps({
+        'baseline_mb': baseline_mb,
+        'peak_mb': _proc_status_mb('VmHWM'),
+        'elapsed': time.perf_counter() - start,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Checkpoint loading peak RSS benchmark')
+    parser.add_argument('--num-gaussians', type=int, default=1000000, help='체크포인트당 Gaussian 수')
+    parser.add_argument('--sh-degree', type=int, default=3, help='SH degree (default: 3)')
+    parser.add_argument('--num-checkpoints', type=int, default=3, help='연속 변환할 체크포인트 수')
+    parser.add_argument('--child', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--paths', type=str, nargs='*', default=[], help=argparse.SUPPRESS)
+    parser.add_argument('--output-dir', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        convert_all(args.child, args.paths, args.output_dir)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='ckpt_loading') as tmp_dir:
+        ckpt_paths = [os.path.join(tmp_dir, f'ckpt_{step}_rank0.pt') for step in range(args.num_checkpoints)]
+        for step, path in enumerate(ckpt_paths):
+            splats_bytes = make_checkpoint(path, args.num_gaussians, args.sh_degree, step)
+        ckpt_mb = os.path.getsize(ckpt_paths[0]) / 1024 ** 2
+        print(f"📦 {args.num_checkpoints} x {ckpt_mb:.0f} MB checkpoints "
+              f"(splats {splats_bytes / 1024 ** 2:.0f} MB, {args.num_gaussians:,} Gaussians)")
+
+        for mode in ('full', 'mmap'):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', mode, '--output-dir', tmp_dir,
+                 '--paths', *ckpt_paths],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            extra_mb = result['peak_mb'] - result['baseline_mb']
+            print(f"  {mode:<5} peak RSS {result['peak_mb']:7.0f} MB (+{extra_mb:.0f} MB over imports, "
+                  f"{extra_mb * 1024 ** 2 / splats_bytes:.2f}x splats), {result['elapsed']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+COLMAP NumPy writer round-trip 확인 + 벤치마크
+
+합성 feed-forward 결과(extrinsic, intrinsic, points_3d, points_xyf, points_rgb)를
+1) colmap_binary.write_colmap_model_wo_track (NumPy structured dtype)
+2) batch_np_matrix_to_pycolmap_wo_track + Reconstruction.write() (pycolmap, 설치된 경우)
+로 저장하고, 다시 읽어서 입력 배열 / 두 결과가 같은지 확인한 뒤 소요 시간을 출력한다.
+
+사용법:
+    python scripts/export/bench_colmap_writer.py --num-points 100000 1000000
+    PYTHONPATH=./libs/vggt python scripts/export/bench_colmap_writer.py   # pycolmap 비교 포함
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from colmap_binary import (
+    write_colmap_model_wo_track, read_cameras_binary, read_images_binary, read_points3D_binary,
+    qvec_to_rotmat,
+)
+
+
+def make_synthetic(num_frames: int, num_points: int, resolution: int = 518, seed: int = 0):
+    """VGGT feed-forward 출력과 같은 형태의 랜덤 배열"""
+    rng = np.random.default_rng(seed)
+
+    # 임의 회전 (QR) + 이동
+    q, r = np.linalg.qr(rng.normal(size=(num_frames, 3, 3)))
+    q *= np.sign(np.diagonal(r, axis1=1, axis2=2))[:, None, :]
+    q[np.linalg.det(q) < 0] *= -1
+    extrinsic = np.concatenate([q, rng.normal(size=(num_frames, 3, 1))], axis=2).astype(np.float32)
+
+    intrinsic = np.zeros((num_frames, 3, 3), dtype=np.float32)
+    intrinsic[:, 0, 0] = rng.uniform(300, 500, num_frames)
+    intrinsic[:, 1, 1] = rng.uniform(300, 500, num_frames)
+    intrinsic[:, :2, 2] = resolution / 2
+    intrinsic[:, 2, 2] = 1
+
+    points_3d = rng.normal(size=(num_points, 3)).astype(np.float32)
+    points_xyf = np.concatenate([
+        rng.integers(0, resolution, (num_points, 2)),
+        np.sort(rng.integers(0, num_frames, (num_points, 1)), axis=0),
+    ], axis=1).astype(np.float32)
+    points_rgb = rng.integers(0, 256, (num_points, 3), dtype=np.uint8)
+    return extrinsic, intrinsic, points_3d, points_xyf, points_rgb
+
+
+def check_against_arrays(model_dir: str, extrinsic, intrinsic, points_3d, points_xyf, points_rgb, image_size):
+    """NumPy writer 출력을 읽어서 입력 배열과 비교"""
+    cameras = read_cameras_binary(os.path.join(model_dir, 'cameras.bin'))
+    images = read_images_binary(os.path.join(model_dir, 'images.bin'))
+    points = read_points3D_binary(os.path.join(model_dir, 'points3D.bin'))
+
+    assert cameras['model'] == 'PINHOLE'
+    assert np.array_equal(cameras['params'], intrinsic.astype(np.float64)[:, [0, 1, 0, 1], [0, 1, 2, 2]])
+    assert np.all(cameras['width'] == image_size[0]) and np.all(cameras['height'] == image_size[1])
+
+    frame_idx = points_xyf[:, 2].astype(np.int64)
+    for fidx, image in enumerate(images):
+        assert image['image_id'] == fidx + 1 and image['camera_id'] == fidx + 1
+        assert np.allclose(qvec_to_rotmat(image['qvec'])[0], extrinsic[fidx, :, :3], atol=1e-6)
+        assert np.array_equal(image['tvec'], extrinsic[fidx, :, 3].astype(np.float64))
+        in_frame = np.flatnonzero(frame_idx == fidx)
+        assert np.array_equal(image['point3D_id'], in_frame + 1)
+        assert np.array_equal(image['xy'], points_xyf[in_frame, :2].astype(np.float64))
+
+    assert np.array_equal(points['point3D_id'], np.arange(1, len(points_3d) + 1))
+    assert np.array_equal(points['xyz'], points_3d.astype(np.float64))
+    assert np.array_equal(points['rgb'], points_rgb)
+    # track: (image_id, point2D_idx) → images.bin에서 같은 point3D를 가리켜야 함
+    tracks = points['tracks']
+    assert np.array_equal(tracks[:, 0], frame_idx + 1)
+    for fidx, image in enumerate(images):
+        in_frame = np.flatnonzero(frame_idx == fidx)
+        assert np.array_equal(image['point3D_id'][tracks[in_frame, 1]], in_frame + 1)
+
+
+def check_against_pycolmap(numpy_dir: str, pycolmap_dir: str):
+    """두 writer 출력을 같은 reader로 읽어서 비교 (points3D 순서는 id로 정렬)"""
+    cams_a = read_cameras_binary(os.path.join(numpy_dir, 'cameras.bin'))
+    cams_b = read_cameras_binary(os.path.join(pycolmap_dir, 'cameras.bin'))
+    order = np.argsort(cams_b['camera_id'])
+    assert np.array_equal(cams_a['camera_id'], cams_b['camera_id'][order])
+    assert np.array_equal(cams_a['params'], cams_b['params'][order])
+    assert np.array_equal(cams_a['width'], cams_b['width'][order])
+
+    images_a = read_images_binary(os.path.join(numpy_dir, 'images.bin'))
+    images_b = {image['image_id']: image for image in read_images_binary(os.path.join(pycolmap_dir, 'images.bin'))}
+    for image in images_a:
+        other = images_b[image['image_id']]
+        assert image['name'] == other['name'] and image['camera_id'] == other['camera_id']
+        assert np.allclose(qvec_to_rotmat(image['qvec']), qvec_to_rotmat(other['qvec']), atol=1e-9)
+        assert np.allclose(image['tvec'], other['tvec'], atol=1e-9)
+        assert np.array_equal(image['xy'], other['xy'])
+        assert np.array_equal(image['point3D_id'], other['point3D_id'])
+
+    points_a = read_points3D_binary(os.path.join(numpy_dir, 'points3D.bin'))
+    points_b = read_points3D_binary(os.path.join(pycolmap_dir, 'points3D.bin'))
+    order = np.argsort(points_b['point3D_id'])
+    tracks_b = points_b['tracks']
+    tracks_b = tracks_b[order] if isinstance(tracks_b, np.ndarray) else np.concatenate([tracks_b[i] for i in order])
+    assert np.array_equal(points_a['point3D_id'], points_b['point3D_id'][order])
+    assert np.array_equal(points_a['xyz'], points_b['xyz'][order])
+    assert np.array_equal(points_a['rgb'], points_b['rgb'][order])
+    assert np.array_equal(points_a['tracks'], tracks_b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='COLMAP NumPy writer round-trip / benchmark')
+    parser.add_argument('--num-frames', type=int, default=60, help='이미지 수 (default: 60)')
+    parser.add_argument('--num-points', type=int, nargs='+', default=[100000, 1000000],
+                        help='3D 점 수 (여러 개 지정 가능)')
+    args = parser.parse_args()
+
+    try:
+        import pycolmap
+        from vggt.dependency.np_to_pycolmap import batch_np_matrix_to_pycolmap_wo_track
+    except ImportError as e:
+        print(f"⚠️  pycolmap 비교 생략 ({e})")
+        batch_np_matrix_to_pycolmap_wo_track = None
+
+    image_size = np.array([518, 518])
+    for num_points in args.num_points:
+        arrays = make_synthetic(args.num_frames, num_points)
+        with tempfile.TemporaryDirectory(prefix='colmap_writer') as tmp_dir:
+            numpy_dir = os.path.join(tmp_dir, 'numpy')
+            start = time.perf_counter()
+            write_colmap_model_wo_track(numpy_dir, arrays[2], arrays[3], arrays[4], arrays[0], arrays[1], image_size)
+            t_numpy = time.perf_counter() - start
+
+            extrinsic, intrinsic, points_3d, points_xyf, points_rgb = arrays
+            check_against_arrays(numpy_dir, extrinsic, intrinsic, points_3d, points_xyf, points_rgb, image_size)
+            size_mb = sum(os.path.getsize(os.path.join(numpy_dir, f)) for f in os.listdir(numpy_dir)) / 1024 ** 2
+            print(f"📦 {num_points:>9,} points: numpy {t_numpy:.2f}s ({size_mb:.1f} MB) ✅ round-trip", end='')
+
+            if batch_np_matrix_to_pycolmap_wo_track is not None:
+                pycolmap_dir = os.path.join(tmp_dir, 'pycolmap')
+                os.makedirs(pycolmap_dir)
+                start = time.perf_counter()
+                reconstruction = batch_np_matrix_to_pycolmap_wo_track(
+                    points_3d, points_xyf, points_rgb, extrinsic, intrinsic, image_size,
+                    shared_camera=False, camera_type='PINHOLE'
+                )
+                reconstruction.write(pycolmap_dir)
+                t_pycolmap = time.perf_counter() - start
+
+                check_against_pycolmap(numpy_dir, pycolmap_dir)
+                pycolmap.Reconstruction(numpy_dir)  # pycolmap이 NumPy 출력을 읽을 수 있는지
+                print(f" | pycolmap {t_pycolmap:.2f}s ✅ identical ⚡ {t_pycolmap / max(t_numpy, 1e-9):.1f}x", end='')
+            print()
+
+
+if __name__ == '__main__':
+    main()
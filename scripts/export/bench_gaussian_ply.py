@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Gaussian PLY export 벤치마크: gaussian_ply (chunk별 np.concatenate + raw write) vs 기존 구현 (field별 채우기 + plyfile)
+
+gsplat 체크포인트와 같은 형태의 splats(SH degree 3: shN (N, 15, 3))를 만들어
+활성화 / interleave + 기록 시간을 나눠 재고, 두 구현의 출력 파일이 바이트 단위로 같은지 확인한다.
+
+사용법:
+    python scripts/export/bench_gaussian_ply.py                          # 1M Gaussians
+    python scripts/export/bench_gaussian_ply.py --num-gaussians 5000000 --sh-degree 3
+"""
+import argparse
+import filecmp
+import os
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+from gaussian_ply import splat_columns, write_gaussian_columns
+
+
+def make_splats(num_gaussians: int, sh_degree: int, seed: int = 0):
+    generator = torch.Generator().manual_seed(seed)
+    num_sh_rest = (sh_degree + 1) ** 2 - 1
+    return {
+        'means': torch.randn(num_gaussians, 3, generator=generator),
+        'scales': torch.randn(num_gaussians, 3, generator=generator) - 4,
+        'quats': torch.randn(num_gaussians, 4, generator=generator),
+        'opacities': torch.randn(num_gaussians, generator=generator),
+        'sh0': torch.randn(num_gaussians, 1, 3, generator=generator),
+        'shN': torch.randn(num_gaussians, num_sh_rest, 3, generator=generator) * 0.1,
+    }
+
+
+def reference_export(splats, output_path):
+    """기존 extract_ply_from_checkpoint의 vertex 생성 + plyfile 기록 (비교용)"""
+    from plyfile import PlyData, PlyElement
+
+    means = splats['means'].cpu().numpy()
+    scales = torch.exp(splats['scales']).cpu().numpy()
+    quats = torch.nn.functional.normalize(splats['quats'], p=2, dim=-1).cpu().numpy()
+    opacities = torch.sigmoid(splats['opacities']).cpu().numpy()
+    sh0 = splats['sh0'].cpu().numpy()
+    shN = splats['shN'].cpu().numpy()
+
+    dtype_list = [
+        ('x', 'f4'), ('y', 'f4'), ('z', 'f4'),
+        ('scale_0', 'f4'), ('scale_1', 'f4'), ('scale_2', 'f4'),
+        ('rot_0', 'f4'), ('rot_1', 'f4'), ('rot_2', 'f4'), ('rot_3', 'f4'),
+        ('opacity', 'f4'),
+        ('f_dc_0', 'f4'), ('f_dc_1', 'f4'), ('f_dc_2', 'f4'),
+    ]
+    for i in range(shN.shape[1]):
+        for j in range(3):
+            dtype_list.append((f'f_rest_{i*3+j}', 'f4'))
+
+    vertices = np.zeros(means.shape[0], dtype=dtype_list)
+    for axis, name in enumerate(('x', 'y', 'z')):
+        vertices[name] = means[:, axis]
+    for i in range(3):
+        vertices[f'scale_{i}'] = scales[:, i]
+    for i in range(4):
+        vertices[f'rot_{i}'] = quats[:, i]
+    vertices['opacity'] = opacities.squeeze()
+    for i in range(3):
+        vertices[f'f_dc_{i}'] = sh0[:, 0, i]
+    for i in range(shN.shape[1]):
+        for j in range(3):
+            vertices[f'f_rest_{i*3+j}'] = shN[:, i, j]
+
+    with open(output_path, 'wb') as f:
+        PlyData([PlyElement.describe(vertices, 'vertex')]).write(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gaussian PLY export benchmark')
+    parser.add_argument('--num-gaussians', type=int, nargs='+', default=[1000000], help='Gaussian 수')
+    parser.add_argument('--sh-degree', type=int, default=3, help='SH degree (default: 3)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='출력 디렉토리 (default: 임시 디렉토리, 실제 디스크 속도를 보려면 지정)')
+    args = parser.parse_args()
+
+    try:
+        import plyfile  # noqa: F401
+    except ImportError:
+        plyfile = None
+        print("⚠️  plyfile 없음, 기존 구현 비교 생략")
+
+    with tempfile.TemporaryDirectory(prefix='gaussian_ply', dir=args.output_dir) as tmp_dir:
+        for num_gaussians in args.num_gaussians:
+            splats = make_splats(num_gaussians, args.sh_degree)
+            fast_path = os.path.join(tmp_dir, 'fast.ply')
+
+            start = time.perf_counter()
+            columns = splat_columns(splats)
+            t_build = time.perf_counter() - start
+            start = time.perf_counter()
+            write_gaussian_columns(fast_path, columns)
+            t_write = time.perf_counter() - start
+            size_mb = os.path.getsize(fast_path) / 1024 ** 2
+            t_fast = t_build + t_write
+            num_floats = sum(column.shape[1] for column in columns)
+            print(f"📦 {num_gaussians:>9,} Gaussians ({num_floats} floats, {size_mb:.0f} MB): "
+                  f"activate {t_build:.2f}s + interleave/write {t_write:.2f}s ({size_mb / t_write:.0f} MB/s) "
+                  f"= {t_fast:.2f}s", end='')
+            del columns
+
+            if plyfile is not None:
+                reference_path = os.path.join(tmp_dir, 'reference.ply')
+                start = time.perf_counter()
+                reference_export(splats, reference_path)
+                t_reference = time.perf_counter() - start
+                assert filecmp.cmp(fast_path, reference_path, shallow=False), 'output differs from reference'
+                os.remove(reference_path)
+                print(f" | reference {t_reference:.2f}s ✅ identical ⚡ {t_reference / t_fast:.1f}x", end='')
+            print()
+            os.remove(fast_path)
+
+
+if __name__ == '__main__':
+    main()
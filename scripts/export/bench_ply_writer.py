@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+점군 PLY writer 벤치마크: ply_io (한 번에 / streaming) vs trimesh (+ plyfile, 설치된 경우)
+
+demo_colmap의 sparse/points.ply와 같은 입력(float32 xyz + uint8 rgb)으로 저장 시간,
+추가 메모리 peak (tracemalloc, 입력 배열 제외), 파일 크기를 비교하고
+ply_io 출력을 다시 읽어 입력과 같은지, trimesh가 읽을 수 있는지 확인한다.
+
+사용법:
+    python scripts/export/bench_ply_writer.py                       # 100K, 1M, 10M
+    python scripts/export/bench_ply_writer.py --num-points 1000000 --chunk-size 262144
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from ply_io import read_ply, write_point_cloud_ply
+
+
+def measure(fn, track_memory):
+    """(소요 시간, 추가 메모리 peak MB) — 메모리는 별도 실행에서 측정 (tracemalloc 오버헤드 제외)"""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak_mb = None
+    if track_memory:
+        tracemalloc.start()
+        fn()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return elapsed, peak_mb
+
+
+def check_round_trip(path, points, colors):
+    vertices = read_ply(path)
+    assert len(vertices) == len(points)
+    for axis, name in enumerate(('x', 'y', 'z')):
+        assert np.array_equal(vertices[name], points[:, axis])
+    for channel, name in enumerate(('red', 'green', 'blue')):
+        assert np.array_equal(vertices[name], colors[:, channel])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Point cloud PLY writer benchmark')
+    parser.add_argument('--num-points', type=int, nargs='+', default=[100000, 1000000, 10000000],
+                        help='점 수 (여러 개 지정 가능)')
+    parser.add_argument('--chunk-size', type=int, default=1 << 20, help='streaming 모드 chunk 크기 (default: 1M)')
+    parser.add_argument('--no-memory', action='store_true', help='메모리 peak 측정 생략')
+    args = parser.parse_args()
+
+    writers = {
+        'ply_io': lambda path, p, c: write_point_cloud_ply(path, p, c),
+        'ply_io stream': lambda path, p, c: write_point_cloud_ply(path, p, c, chunk_size=args.chunk_size),
+    }
+    try:
+        import trimesh
+        writers['trimesh'] = lambda path, p, c: trimesh.PointCloud(p, colors=c).export(path)
+    except ImportError:
+        trimesh = None
+        print("⚠️  trimesh 없음, 비교 생략")
+    try:
+        from plyfile import PlyData, PlyElement
+        from ply_io import pack_point_cloud
+        writers['plyfile'] = lambda path, p, c: PlyData(
+            [PlyElement.describe(pack_point_cloud(p, c), 'vertex')]).write(path)
+    except ImportError:
+        pass
+
+    rng = np.random.default_rng(0)
+    print(f"{'points':>11}  {'writer':<14}{'time':>9}{'MB/s':>9}{'peak MB':>9}{'file MB':>9}{'speedup':>9}")
+    for num_points in args.num_points:
+        points = rng.normal(size=(num_points, 3)).astype(np.float32)
+        colors = rng.integers(0, 256, (num_points, 3), dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory(prefix='ply_writer') as tmp_dir:
+            results = {}
+            for name, writer in writers.items():
+                path = os.path.join(tmp_dir, name.replace(' ', '_') + '.ply')
+                elapsed, peak_mb = measure(lambda: writer(path, points, colors), not args.no_memory)
+                results[name] = (elapsed, peak_mb, os.path.getsize(path))
+                if name.startswith('ply_io'):
+                    check_round_trip(path, points, colors)
+
+            if trimesh is not None:
+                # ply_io 출력을 trimesh가 그대로 읽을 수 있는지
+                loaded = trimesh.load(os.path.join(tmp_dir, 'ply_io_stream.ply'))
+                assert np.allclose(loaded.vertices, points)
+
+            reference = results['trimesh'][0] if 'trimesh' in results else None
+            for name, (elapsed, peak_mb, size) in results.items():
+                size_mb = size / 1024 ** 2
+                peak = f"{peak_mb:.1f}" if peak_mb is not None else '-'
+                speedup = f"{reference / elapsed:.1f}x" if reference else '-'
+                print(f"{num_points:>11,}  {name:<14}{elapsed:>8.3f}s{size_mb / elapsed:>9.0f}{peak:>9}"
+                      f"{size_mb:>9.1f}{speedup:>9}")
+        print(f"{'':>11}  ✅ ply_io round-trip OK")
+
+
+if __name__ == '__main__':
+    main()
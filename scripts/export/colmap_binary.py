@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+COLMAP sparse 모델 바이너리 (cameras.bin / images.bin / points3D.bin) NumPy 입출력
+
+pycolmap.Reconstruction을 점 하나씩 만들지 않고, structured dtype 배열을 tobytes()로
+한 번에 기록한다. VGGT feed-forward 결과(track 길이 1)처럼 수백만 점도 몇 초 안에 저장 가능.
+
+바이너리 포맷은 COLMAP src/colmap/scene/reconstruction_io.cc (read_write_model.py)와 동일:
+- cameras.bin:  uint64 N, [int32 id, int32 model, uint64 width, uint64 height, float64 params[k]] * N
+- images.bin:   uint64 N, [int32 id, float64 qvec[4], float64 tvec[3], int32 camera_id,
+                name\\0, uint64 M, [float64 x, float64 y, int64 point3D_id] * M] * N
+- points3D.bin: uint64 N, [uint64 id, float64 xyz[3], uint8 rgb[3], float64 error,
+                uint64 L, [int32 image_id, int32 point2D_idx] * L] * N
+"""
+import os
+import struct
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# COLMAP camera model: (model_id, num_params)
+CAMERA_MODELS = {
+    'SIMPLE_PINHOLE': (0, 3),
+    'PINHOLE': (1, 4),
+}
+CAMERA_MODEL_NAMES = {model_id: name for name, (model_id, _) in CAMERA_MODELS.items()}
+
+POINT2D_DTYPE = np.dtype([('xy', '<f8', (2,)), ('point3D_id', '<i8')])
+
+# track 길이 1인 point3D 레코드 (feed-forward 결과는 모든 점이 한 이미지에서만 관측됨)
+POINT3D_TRACK1_DTYPE = np.dtype([
+    ('point3D_id', '<u8'),
+    ('xyz', '<f8', (3,)),
+    ('rgb', 'u1', (3,)),
+    ('error', '<f8'),
+    ('track_length', '<u8'),
+    ('image_id', '<i4'),
+    ('point2D_idx', '<i4'),
+])
+
+
+def camera_dtype(num_params: int) -> np.dtype:
+    return np.dtype([
+        ('camera_id', '<i4'),
+        ('model_id', '<i4'),
+        ('width', '<u8'),
+        ('height', '<u8'),
+        ('params', '<f8', (num_params,)),
+    ])
+
+
+def rotmat_to_qvec(R: np.ndarray) -> np.ndarray:
+    """
+    회전 행렬 (N, 3, 3) → quaternion (N, 4) [w, x, y, z]
+
+    COLMAP read_write_model.rotmat2qvec와 같은 방식 (4x4 대칭 행렬의 최대 고유벡터, w >= 0)을
+    batch eigh로 한 번에 계산
+    """
+    R = np.asarray(R, dtype=np.float64).reshape(-1, 3, 3)
+    Rxx, Ryx, Rzx = R[:, 0, 0], R[:, 0, 1], R[:, 0, 2]
+    Rxy, Ryy, Rzy = R[:, 1, 0], R[:, 1, 1], R[:, 1, 2]
+    Rxz, Ryz, Rzz = R[:, 2, 0], R[:, 2, 1], R[:, 2, 2]
+
+    K = np.zeros((len(R), 4, 4), dtype=np.float64)
+    K[:, 0, 0] = Rxx - Ryy - Rzz
+    K[:, 1, 0] = Ryx + Rxy
+    K[:, 1, 1] = Ryy - Rxx - Rzz
+    K[:, 2, 0] = Rzx + Rxz
+    K[:, 2, 1] = Rzy + Ryz
+    K[:, 2, 2] = Rzz - Rxx - Ryy
+    K[:, 3, 0] = Ryz - Rzy
+    K[:, 3, 1] = Rzx - Rxz
+    K[:, 3, 2] = Rxy - Ryx
+    K[:, 3, 3] = Rxx + Ryy + Rzz
+    K /= 3.0
+
+    eigvals, eigvecs = np.linalg.eigh(K)  # lower triangle 사용
+    best = eigvecs[np.arange(len(R)), :, np.argmax(eigvals, axis=1)]
+    qvec = best[:, [3, 0, 1, 2]]
+    qvec[qvec[:, 0] < 0] *= -1
+    return qvec
+
+
+def qvec_to_rotmat(qvec: np.ndarray) -> np.ndarray:
+    """quaternion (N, 4) [w, x, y, z] → 회전 행렬 (N, 3, 3)"""
+    q = np.asarray(qvec, dtype=np.float64).reshape(-1, 4)
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    return np.stack([
+        1 - 2 * y ** 2 - 2 * z ** 2, 2 * x * y - 2 * w * z, 2 * z * x + 2 * w * y,
+        2 * x * y + 2 * w * z, 1 - 2 * x ** 2 - 2 * z ** 2, 2 * y * z - 2 * w * x,
+        2 * z * x - 2 * w * y, 2 * y * z + 2 * w * x, 1 - 2 * x ** 2 - 2 * y ** 2,
+    ], axis=1).reshape(-1, 3, 3)
+
+
+# ===== Writers =====
+
+def write_cameras_binary(path: str, camera_ids: np.ndarray, camera_type: str,
+                         widths: np.ndarray, heights: np.ndarray, params: np.ndarray):
+    """
+    cameras.bin 기록 (모든 카메라가 같은 모델)
+
+    Args:
+        camera_ids: (C,) 카메라 ID
+        camera_type: 'PINHOLE' 또는 'SIMPLE_PINHOLE'
+        widths, heights: (C,) 이미지 크기
+        params: (C, k) 카메라 파라미터 (PINHOLE: fx, fy, cx, cy / SIMPLE_PINHOLE: f, cx, cy)
+    """
+    model_id, num_params = CAMERA_MODELS[camera_type]
+    params = np.asarray(params, dtype=np.float64).reshape(len(camera_ids), num_params)
+
+    records = np.empty(len(camera_ids), dtype=camera_dtype(num_params))
+    records['camera_id'] = camera_ids
+    records['model_id'] = model_id
+    records['width'] = widths
+    records['height'] = heights
+    records['params'] = params
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(records)))
+        f.write(records.tobytes())
+
+
+def write_images_binary(path: str, image_ids: np.ndarray, qvecs: np.ndarray, tvecs: np.ndarray,
+                        camera_ids: np.ndarray, names: Sequence[str],
+                        points2D_xy: np.ndarray, points2D_point3D_ids: np.ndarray,
+                        points2D_counts: np.ndarray):
+    """
+    images.bin 기록
+
+    2D 관측은 이미지 순서대로 이어붙인 배열로 받는다
+    (이미지 i의 점 = points2D_xy[offset_i : offset_i + points2D_counts[i]])
+
+    Args:
+        image_ids: (S,) 이미지 ID
+        qvecs: (S, 4) cam_from_world 회전 [w, x, y, z]
+        tvecs: (S, 3) cam_from_world 이동
+        camera_ids: (S,) 각 이미지의 카메라 ID
+        names: 이미지 파일 이름 S개
+        points2D_xy: (M, 2) 모든 이미지의 2D 관측
+        points2D_point3D_ids: (M,) 대응하는 point3D ID (-1 = 없음)
+        points2D_counts: (S,) 이미지별 2D 관측 수
+    """
+    header_dtype = np.dtype([
+        ('image_id', '<i4'), ('qvec', '<f8', (4,)), ('tvec', '<f8', (3,)), ('camera_id', '<i4')
+    ])
+    headers = np.empty(len(image_ids), dtype=header_dtype)
+    headers['image_id'] = image_ids
+    headers['qvec'] = qvecs
+    headers['tvec'] = tvecs
+    headers['camera_id'] = camera_ids
+
+    points2D = np.empty(len(points2D_xy), dtype=POINT2D_DTYPE)
+    points2D['xy'] = points2D_xy
+    points2D['point3D_id'] = points2D_point3D_ids
+    offsets = np.concatenate([[0], np.cumsum(points2D_counts)])
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(headers)))
+        for i in range(len(headers)):
+            f.write(headers[i:i + 1].tobytes())
+            f.write(names[i].encode('utf-8') + b'\x00')
+            f.write(struct.pack('<Q', int(points2D_counts[i])))
+            f.write(points2D[offsets[i]:offsets[i + 1]].tobytes())
+
+
+def write_points3D_binary(path: str, xyz: np.ndarray, rgb: np.ndarray,
+                          image_ids: np.ndarray, point2D_idxs: np.ndarray,
+                          errors: Optional[np.ndarray] = None):
+    """
+    points3D.bin 기록 (track 길이 1, point3D ID = 1..N)
+
+    Args:
+        xyz: (N, 3) 3D 점
+        rgb: (N, 3) uint8 색상
+        image_ids: (N,) 점을 관측한 이미지 ID
+        point2D_idxs: (N,) 그 이미지 안에서의 2D 관측 인덱스
+        errors: (N,) reprojection error (None = -1, pycolmap 기본값)
+    """
+    records = np.empty(len(xyz), dtype=POINT3D_TRACK1_DTYPE)
+    records['point3D_id'] = np.arange(1, len(xyz) + 1)
+    records['xyz'] = xyz
+    records['rgb'] = rgb
+    records['error'] = -1.0 if errors is None else errors
+    records['track_length'] = 1
+    records['image_id'] = image_ids
+    records['point2D_idx'] = point2D_idxs
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(records)))
+        f.write(records.tobytes())
+
+
+def write_colmap_model_wo_track(output_dir: str, points3d: np.ndarray, points_xyf: np.ndarray,
+                                points_rgb: np.ndarray, extrinsics: np.ndarray, intrinsics: np.ndarray,
+                                image_size: np.ndarray, image_names: Optional[List[str]] = None,
+                                camera_type: str = 'PINHOLE', shared_camera: bool = False):
+    """
+    feed-forward (BA 없음) 결과를 COLMAP 바이너리로 직접 저장
+
+    batch_np_matrix_to_pycolmap_wo_track + Reconstruction.write()와 같은 모델을 만든다:
+    - 카메라 i+1 = 이미지 i+1 (shared_camera면 카메라 1 하나)
+    - point3D j+1은 이미지 (frame+1)에서 한 번 관측되고, 2D 관측 순서는 points_xyf 순서를 따름
+
+    Args:
+        output_dir: sparse 모델 디렉토리
+        points3d: (P, 3) 3D 점
+        points_xyf: (P, 3) [x, y, frame index] 2D 관측
+        points_rgb: (P, 3) uint8 색상
+        extrinsics: (S, 3, 4) cam_from_world
+        intrinsics: (S, 3, 3)
+        image_size: (2,) [width, height] 또는 이미지별 (S, 2)
+        image_names: 이미지 이름 (None = image_{i+1})
+        camera_type: 'PINHOLE' 또는 'SIMPLE_PINHOLE'
+        shared_camera: 첫 번째 카메라를 모든 이미지가 공유
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    num_frames = len(extrinsics)
+    num_points = len(points3d)
+    if image_names is None:
+        image_names = [f"image_{i + 1}" for i in range(num_frames)]
+
+    # ===== Cameras =====
+    intrinsics = np.asarray(intrinsics, dtype=np.float64)
+    if camera_type == 'PINHOLE':
+        params = intrinsics[:, [0, 1, 0, 1], [0, 1, 2, 2]]
+    elif camera_type == 'SIMPLE_PINHOLE':
+        focal = (intrinsics[:, 0, 0] + intrinsics[:, 1, 1]) / 2
+        params = np.stack([focal, intrinsics[:, 0, 2], intrinsics[:, 1, 2]], axis=1)
+    else:
+        raise ValueError(f"Camera type {camera_type} is not supported yet")
+
+    image_size = np.broadcast_to(np.asarray(image_size), (num_frames, 2))
+    num_cameras = 1 if shared_camera else num_frames
+    write_cameras_binary(
+        os.path.join(output_dir, 'cameras.bin'), np.arange(1, num_cameras + 1), camera_type,
+        image_size[:num_cameras, 0], image_size[:num_cameras, 1], params[:num_cameras]
+    )
+
+    # ===== Images (2D 관측은 frame 순서로 stable 정렬) =====
+    frame_idx = np.asarray(points_xyf[:, 2]).astype(np.int32)
+    order = np.argsort(frame_idx, kind='stable')
+    counts = np.bincount(frame_idx, minlength=num_frames)[:num_frames]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # 이미지 안에서의 2D 관측 인덱스 (point3D track 요소)
+    point2D_idxs = np.empty(num_points, dtype=np.int64)
+    point2D_idxs[order] = np.arange(num_points) - starts[frame_idx[order]]
+
+    extrinsics = np.asarray(extrinsics, dtype=np.float64)
+    camera_ids = np.ones(num_frames, dtype=np.int64) if shared_camera else np.arange(1, num_frames + 1)
+    write_images_binary(
+        os.path.join(output_dir, 'images.bin'),
+        np.arange(1, num_frames + 1), rotmat_to_qvec(extrinsics[:, :3, :3]), extrinsics[:, :3, 3],
+        camera_ids, image_names,
+        np.asarray(points_xyf[order, :2], dtype=np.float64), order + 1, counts
+    )
+
+    # ===== Points3D =====
+    write_points3D_binary(
+        os.path.join(output_dir, 'points3D.bin'), points3d, points_rgb, frame_idx + 1, point2D_idxs
+    )
+
+
+# ===== Readers (round-trip 확인용) =====
+
+def read_cameras_binary(path: str) -> Dict[str, np.ndarray]:
+    """cameras.bin → {'camera_id', 'model', 'width', 'height', 'params'} (모든 카메라가 같은 모델일 때 bulk read)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    num_cameras = struct.unpack_from('<Q', data, 0)[0]
+    if num_cameras == 0:
+        return {'camera_id': np.zeros(0, np.int32), 'model': None, 'width': np.zeros(0, np.uint64),
+                'height': np.zeros(0, np.uint64), 'params': np.zeros((0, 0))}
+
+    model_id = struct.unpack_from('<i', data, 8 + 4)[0]
+    num_params = CAMERA_MODELS[CAMERA_MODEL_NAMES[model_id]][1]
+    records = np.frombuffer(data, dtype=camera_dtype(num_params), count=num_cameras, offset=8)
+    if np.any(records['model_id'] != model_id):
+        raise ValueError(f"Mixed camera models are not supported: {path}")
+    return {
+        'camera_id': records['camera_id'].copy(),
+        'model': CAMERA_MODEL_NAMES[model_id],
+        'width': records['width'].copy(),
+        'height': records['height'].copy(),
+        'params': records['params'].copy(),
+    }
+
+
+def read_images_binary(path: str) -> List[Dict]:
+    """images.bin → 이미지별 {'image_id', 'qvec', 'tvec', 'camera_id', 'name', 'xy', 'point3D_id'}"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    num_images = struct.unpack_from('<Q', data, 0)[0]
+    offset = 8
+    images = []
+    for _ in range(num_images):
+        image_id, qw, qx, qy, qz, tx, ty, tz, camera_id = struct.unpack_from('<i7di', data, offset)
+        offset += struct.calcsize('<i7di')
+        name_end = data.index(b'\x00', offset)
+        name = data[offset:name_end].decode('utf-8')
+        offset = name_end + 1
+        num_points2D = struct.unpack_from('<Q', data, offset)[0]
+        offset += 8
+        points2D = np.frombuffer(data, dtype=POINT2D_DTYPE, count=num_points2D, offset=offset)
+        offset += points2D.nbytes
+        images.append({
+            'image_id': image_id,
+            'qvec': np.array([qw, qx, qy, qz]),
+            'tvec': np.array([tx, ty, tz]),
+            'camera_id': camera_id,
+            'name': name,
+            'xy': points2D['xy'].copy(),
+            'point3D_id': points2D['point3D_id'].copy(),
+        })
+    return images
+
+
+def read_points3D_binary(path: str) -> Dict[str, np.ndarray]:
+    """
+    points3D.bin → {'point3D_id', 'xyz', 'rgb', 'error', 'tracks'}
+
+    모든 track 길이가 1이면 bulk read, 아니면 점 단위로 읽음
+    tracks: track 길이 1이면 (N, 2) [image_id, point2D_idx], 아니면 (L_i, 2) 배열 리스트
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    num_points = struct.unpack_from('<Q', data, 0)[0]
+
+    if len(data) == 8 + num_points * POINT3D_TRACK1_DTYPE.itemsize:
+        records = np.frombuffer(data, dtype=POINT3D_TRACK1_DTYPE, count=num_points, offset=8)
+        if np.all(records['track_length'] == 1):
+            return {
+                'point3D_id': records['point3D_id'].copy(),
+                'xyz': records['xyz'].copy(),
+                'rgb': records['rgb'].copy(),
+                'error': records['error'].copy(),
+                'tracks': np.stack([records['image_id'], records['point2D_idx']], axis=1),
+            }
+
+    offset = 8
+    ids, xyz, rgb, errors, tracks = [], [], [], [], []
+    for _ in range(num_points):
+        point3D_id, x, y, z, r, g, b, error, track_length = struct.unpack_from('<Q3d3BdQ', data, offset)
+        offset += struct.calcsize('<Q3d3BdQ')
+        track = np.frombuffer(data, dtype='<i4', count=2 * track_length, offset=offset).reshape(-1, 2)
+        offset += track.nbytes
+        ids.append(point3D_id)
+        xyz.append((x, y, z))
+        rgb.append((r, g, b))
+        errors.append(error)
+        tracks.append(track.copy())
+    return {
+        'point3D_id': np.array(ids, dtype=np.uint64),
+        'xyz': np.array(xyz, dtype=np.float64).reshape(-1, 3),
+        'rgb': np.array(rgb, dtype=np.uint8).reshape(-1, 3),
+        'error': np.array(errors, dtype=np.float64),
+        'tracks': tracks,
+    }
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+양자화된 Gaussian splat 압축 포맷 (.gsz) 인코더 / 디코더
+
+float32 Gaussian PLY (SH degree 3 기준 Gaussian당 236 bytes) 대신:
+- Gaussian을 Morton 순서로 정렬하고 CHUNK_SIZE개씩 공간 chunk로 나눔
+- position: chunk bounding box 안에서 11/10/11 bit → uint32
+- scale: chunk별 log-scale 범위 안에서 축당 8 bit
+- opacity: sigmoid 값을 8 bit
+- rotation: smallest-three (가장 큰 성분 index 2 bit + 나머지 3개 x 10 bit) → uint32
+- sh0: float16, shN: float16 또는 256개 codebook index (uint8, 32개 center는 균등 grid로 고정)
+→ Gaussian당 108 bytes (fp16) / 63 bytes (codebook)
+
+컨테이너는 np.savez (zip, 비압축)이고 배열 이름 / meta(JSON)로 구성된다.
+디코더는 gaussian_ply와 같은 레이아웃의 표준 Gaussian PLY를 다시 만들어 준다 (Gaussian 순서는 Morton 순서).
+
+사용법:
+    python scripts/export/compressed_splat.py encode ckpts/ckpt_29999_rank0.pt point_cloud_29999.gsz
+    python scripts/export/compressed_splat.py encode ply/point_cloud_29999.ply point_cloud_29999.gsz --sh codebook
+    python scripts/export/compressed_splat.py decode point_cloud_29999.gsz point_cloud_29999_decoded.ply
+    python scripts/export/compressed_splat.py report ply/point_cloud_29999.ply   # 크기 / 속도 / 속성별 오차
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from gaussian_ply import BASE_PROPERTY_NAMES, gaussian_property_names, load_splats, splat_columns, write_gaussian_columns
+from ply_io import read_ply
+
+FORMAT_VERSION = 1
+CHUNK_SIZE = 256
+POSITION_BITS = (11, 10, 11)
+SCALE_BITS = 8
+ROTATION_BITS = 10
+CODEBOOK_SIZE = 256
+CODEBOOK_GRID_SIZE = 32  # codebook 중 [최소, 최대] 균등 grid에 고정된 center 수 (최대 오차 제한)
+SH_MODES = ('fp16', 'codebook')
+
+
+# ---------------------------------------------------------------------------
+# 입력: 활성화된 Gaussian 속성 (gaussian_ply.splat_columns와 같은 순서)
+# ---------------------------------------------------------------------------
+
+def load_gaussian_columns(path: str) -> List[np.ndarray]:
+    """
+    체크포인트(.pt) 또는 Gaussian PLY에서 [means, scales, quats, opacity, sh0, sh_rest] 로드
+
+    값은 PLY와 같은 활성화된 값 (scale = exp, quat 정규화, opacity = sigmoid)
+    """
+    if path.endswith('.pt'):
+        splats, _ = load_splats(path)
+        return splat_columns(splats)
+
+    vertices = read_ply(path)
+    names = list(vertices.dtype.names)
+    num_sh_rest = (len(names) - len(BASE_PROPERTY_NAMES)) // 3
+    if names != gaussian_property_names(num_sh_rest) or any(
+            vertices.dtype.fields[name][0] != np.dtype('<f4') for name in names):
+        raise ValueError(f'{path} is not a float32 Gaussian PLY written by gaussian_ply')
+    data = np.asarray(vertices).view('<f4').reshape(len(vertices), len(names))
+    splits = np.cumsum([3, 3, 4, 1, 3])
+    return np.split(data, splits, axis=1)
+
+
+# ---------------------------------------------------------------------------
+# 양자화 helper
+# ---------------------------------------------------------------------------
+
+def _spread_bits_10(values: np.ndarray) -> np.ndarray:
+    """10 bit 정수의 각 bit 사이에 0 두 개씩 삽입 (3D Morton code용)"""
+    v = values.astype(np.uint32) & 0x3FF
+    v = (v | (v << 16)) & 0x030000FF
+    v = (v | (v << 8)) & 0x0300F00F
+    v = (v | (v << 4)) & 0x030C30C3
+    v = (v | (v << 2)) & 0x09249249
+    return v
+
+
+def morton_order(means: np.ndarray) -> np.ndarray:
+    """
+    위치의 Morton (Z-order) 정렬 순서
+
+    bounds는 1 / 99 percentile 기준 (멀리 떨어진 floater 몇 개가 나머지를 한 cell로 몰지 않게)
+    """
+    lo = np.percentile(means, 1, axis=0)
+    hi = np.percentile(means, 99, axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    cells = np.clip((means - lo) / span * 1023, 0, 1023).astype(np.uint32)
+    codes = _spread_bits_10(cells[:, 0]) | (_spread_bits_10(cells[:, 1]) << 1) | (_spread_bits_10(cells[:, 2]) << 2)
+    return np.argsort(codes, kind='stable')
+
+
+def _chunk_bounds(values: np.ndarray, chunk_size: int) -> np.ndarray:
+    """chunk별 (min, max) → (C, 2, D) float32"""
+    if len(values) == 0:
+        return np.zeros((0, 2, values.shape[1]), dtype=np.float32)
+    starts = np.arange(0, len(values), chunk_size)
+    return np.stack([np.minimum.reduceat(values, starts, axis=0),
+                     np.maximum.reduceat(values, starts, axis=0)], axis=1).astype(np.float32)
+
+
+def _quantize(values: np.ndarray, bounds: np.ndarray, chunk_ids: np.ndarray, bits: int) -> np.ndarray:
+    levels = (1 << bits) - 1
+    lo, hi = bounds[chunk_ids, 0], bounds[chunk_ids, 1]
+    span = np.where(hi > lo, hi - lo, 1.0)
+    return np.clip(np.rint((values - lo) / span * levels), 0, levels).astype(np.uint32)
+
+
+def _dequantize(quantized: np.ndarray, bounds: np.ndarray, chunk_ids: np.ndarray, bits: int) -> np.ndarray:
+    levels = (1 << bits) - 1
+    lo, hi = bounds[chunk_ids, 0], bounds[chunk_ids, 1]
+    return (lo + quantized.astype(np.float32) / levels * (hi - lo)).astype(np.float32)
+
+
+def pack_positions(means: np.ndarray, bounds: np.ndarray, chunk_ids: np.ndarray) -> np.ndarray:
+    """chunk bounding box 기준 위치 → x / y / z 11 / 10 / 11 bit uint32"""
+    packed = np.zeros(len(means), dtype=np.uint32)
+    for axis, bits in enumerate(POSITION_BITS):
+        q = _quantize(means[:, axis], bounds[:, :, axis], chunk_ids, bits)
+        packed = (packed << bits) | q
+    return packed
+
+
+def unpack_positions(packed: np.ndarray, bounds: np.ndarray, chunk_ids: np.ndarray) -> np.ndarray:
+    means = np.empty((len(packed), 3), dtype=np.float32)
+    shift = sum(POSITION_BITS)
+    for axis, bits in enumerate(POSITION_BITS):
+        shift -= bits
+        q = (packed >> shift) & ((1 << bits) - 1)
+        means[:, axis] = _dequantize(q, bounds[:, :, axis], chunk_ids, bits)
+    return means
+
+
+def pack_quaternions(quats: np.ndarray) -> np.ndarray:
+    """정규화된 quaternion → smallest-three uint32 (index 2 bit + 10 bit x 3)"""
+    quats = quats / np.linalg.norm(quats, axis=1, keepdims=True)
+    largest = np.argmax(np.abs(quats), axis=1)
+    # q와 -q는 같은 회전: 가장 큰 성분이 양수가 되도록 부호 통일 → 디코딩 시 sqrt로 복원
+    quats = quats * np.where(quats[np.arange(len(quats)), largest] < 0, -1.0, 1.0)[:, None]
+    others = np.array([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]])[largest]
+    rest = np.take_along_axis(quats, others, axis=1)  # 각 성분 ∈ [-1/√2, 1/√2]
+    levels = (1 << ROTATION_BITS) - 1
+    q = np.clip(np.rint((rest * np.sqrt(2) + 1) / 2 * levels), 0, levels).astype(np.uint32)
+    return (largest.astype(np.uint32) << 30) | (q[:, 0] << 20) | (q[:, 1] << 10) | q[:, 2]
+
+
+def unpack_quaternions(packed: np.ndarray) -> np.ndarray:
+    levels = (1 << ROTATION_BITS) - 1
+    largest = (packed >> 30).astype(np.int64)
+    q = np.stack([(packed >> 20) & levels, (packed >> 10) & levels, packed & levels], axis=1)
+    rest = (q.astype(np.float32) / levels * 2 - 1) / np.sqrt(2, dtype=np.float32)
+    quats = np.empty((len(packed), 4), dtype=np.float32)
+    others = np.array([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]])[largest]
+    np.put_along_axis(quats, others, rest, axis=1)
+    quats[np.arange(len(packed)), largest] = np.sqrt(np.maximum(1 - np.sum(rest ** 2, axis=1), 0))
+    return quats / np.linalg.norm(quats, axis=1, keepdims=True)
+
+
+def fit_codebook(values: np.ndarray, size: int = CODEBOOK_SIZE, grid_size: int = CODEBOOK_GRID_SIZE,
+                 iters: int = 10, sample_size: int = 1 << 20, seed: int = 0) -> np.ndarray:
+    """
+    1D k-means codebook (SH 계수 전체 공유)
+
+    grid_size개 center는 [최소, 최대] 균등 grid에 고정하고 나머지만 Lloyd로 움직인다
+    (quantile 초기화, 정렬된 sample, 경계 = 인접 center의 중점).
+    k-means만 쓰면 드문 꼬리 값 쪽 center가 평균으로 안쪽에 끌려가서 최대 오차가 σ 수준이 되므로,
+    고정 grid로 최대 오차를 (최대 - 최소) / (2 (grid_size - 1)) 이하로 묶음.
+    """
+    values = values.reshape(-1)
+    if len(values) == 0:
+        return np.zeros(size, dtype=np.float32)
+    lo, hi = float(values.min()), float(values.max())
+    if len(values) > sample_size:
+        values = values[np.random.default_rng(seed).integers(0, len(values), sample_size)]
+    values = np.sort(values.astype(np.float64))
+    prefix = np.concatenate([[0.0], np.cumsum(values)])
+
+    grid_size = min(grid_size, size)
+    free = np.quantile(values, (np.arange(size - grid_size) + 0.5) / max(size - grid_size, 1))
+    centers = np.concatenate([free, np.linspace(lo, hi, grid_size)])
+    fixed = np.arange(size) >= size - grid_size
+    order = np.argsort(centers, kind='stable')
+    centers, fixed = centers[order], fixed[order]
+    for _ in range(iters):
+        bounds = np.concatenate([[0], np.searchsorted(values, (centers[1:] + centers[:-1]) / 2), [len(values)]])
+        counts = np.diff(bounds)
+        means = (prefix[bounds[1:]] - prefix[bounds[:-1]]) / np.maximum(counts, 1)
+        # 빈 구간의 center와 grid center는 그대로 둠
+        centers = np.where(fixed | (counts == 0), centers, means)
+        order = np.argsort(centers, kind='stable')
+        centers, fixed = centers[order], fixed[order]
+    return centers.astype(np.float32)
+
+
+def codebook_indices(values: np.ndarray, codebook: np.ndarray, lut_bins: int = 1 << 16) -> np.ndarray:
+    """
+    가장 가까운 codebook index (codebook은 정렬되어 있음)
+
+    수천만 값에 대한 searchsorted 대신 [codebook 최소, 최대]를 lut_bins 구간으로 나눈 lookup table로
+    하한 index를 구하고, 실제 경계를 넘는 값만 index를 올린다 (searchsorted와 같은 결과, 3배 이상 빠름).
+    """
+    edges = ((codebook[1:] + codebook[:-1]) / 2).astype(np.float32)
+    shape = values.shape
+    values = values.reshape(-1)
+    lo, hi = float(codebook[0]), float(codebook[-1])
+    if len(values) == 0 or hi <= lo:
+        return np.searchsorted(edges, values).astype(np.uint8).reshape(shape)
+    width = (hi - lo) / lut_bins
+    lut = np.searchsorted(edges, lo + np.arange(lut_bins) * width).astype(np.int16)
+    # 한 칸 아래 구간의 index에서 시작 (float 반올림으로 하한을 넘지 않게)
+    bins = np.clip((values - lo) / width - 1, 0, lut_bins - 1).astype(np.int64)
+    indices = lut[bins]
+    active = np.arange(len(values))
+    while len(active) > 0:
+        current = indices[active]
+        active = active[(current < len(edges)) & (values[active] > edges[np.minimum(current, len(edges) - 1)])]
+        indices[active] += 1
+    return indices.astype(np.uint8).reshape(shape)
+
+
+# ---------------------------------------------------------------------------
+# 인코딩 / 디코딩
+# ---------------------------------------------------------------------------
+
+def encode_gaussians(columns: List[np.ndarray], sh_mode: str = 'fp16',
+                     chunk_size: int = CHUNK_SIZE) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    활성화된 Gaussian 속성 → 압축 배열 dict
+
+    Returns:
+        arrays: write_compressed에 넘길 배열 dict
+        order: 원본 index 기준 Morton 정렬 순서 (디코딩 결과 i번째 = 원본 order[i]번째)
+    """
+    if sh_mode not in SH_MODES:
+        raise ValueError(f'sh_mode must be one of {SH_MODES}, got {sh_mode}')
+    means, scales, quats, opacity, sh0, sh_rest = columns
+    num_gaussians = len(means)
+    order = morton_order(means) if num_gaussians > 0 else np.zeros(0, dtype=np.int64)
+    chunk_ids = np.arange(num_gaussians) // chunk_size
+
+    means = means[order]
+    log_scales = np.log(np.maximum(scales[order], np.finfo(np.float32).tiny))
+    position_bounds = _chunk_bounds(means, chunk_size)
+    scale_bounds = _chunk_bounds(log_scales, chunk_size)
+
+    arrays = {
+        'position': pack_positions(means, position_bounds, chunk_ids),
+        'position_bounds': position_bounds,
+        'scale': _quantize(log_scales, scale_bounds, chunk_ids, SCALE_BITS).astype(np.uint8),
+        'scale_bounds': scale_bounds,
+        'opacity': np.clip(np.rint(opacity[order, 0] * 255), 0, 255).astype(np.uint8),
+        'rotation': pack_quaternions(quats[order]),
+        'sh0': sh0[order].astype(np.float16),
+    }
+    sh_rest = sh_rest[order]
+    if sh_mode == 'codebook' and sh_rest.size > 0:
+        codebook = fit_codebook(sh_rest)
+        arrays['sh_rest'] = codebook_indices(sh_rest, codebook)
+        arrays['sh_codebook'] = codebook
+    else:
+        arrays['sh_rest'] = sh_rest.astype(np.float16)
+
+    meta = {'version': FORMAT_VERSION, 'num_gaussians': num_gaussians, 'chunk_size': chunk_size,
+            'num_sh_rest': sh_rest.shape[1] // 3, 'sh_mode': sh_mode}
+    arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+    return arrays, order
+
+
+def decode_gaussians(arrays: Dict[str, np.ndarray]) -> List[np.ndarray]:
+    """압축 배열 dict → 활성화된 Gaussian 속성 [means, scales, quats, opacity, sh0, sh_rest] (float32)"""
+    meta = json.loads(bytes(arrays['meta']).decode('utf-8'))
+    if meta['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compressed splat version {meta['version']}")
+    num_gaussians = meta['num_gaussians']
+    chunk_ids = np.arange(num_gaussians) // meta['chunk_size']
+
+    means = unpack_positions(arrays['position'], arrays['position_bounds'], chunk_ids)
+    scales = np.exp(_dequantize(arrays['scale'], arrays['scale_bounds'], chunk_ids, SCALE_BITS))
+    quats = unpack_quaternions(arrays['rotation'])
+    opacity = (arrays['opacity'].astype(np.float32) / 255).reshape(num_gaussians, 1)
+    sh0 = arrays['sh0'].astype(np.float32)
+    if 'sh_codebook' in arrays:  # SH degree 0이면 codebook 모드여도 codebook 없음
+        sh_rest = arrays['sh_codebook'][arrays['sh_rest']]
+    else:
+        sh_rest = arrays['sh_rest'].astype(np.float32)
+    sh_rest = sh_rest.reshape(num_gaussians, meta['num_sh_rest'] * 3)
+    return [means, scales, quats, opacity, sh0, sh_rest]
+
+
+def write_compressed(path: str, arrays: Dict[str, np.ndarray]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:  # 파일 객체로 넘겨야 np.savez가 확장자(.npz)를 붙이지 않음
+        np.savez(f, **arrays)
+
+
+def read_compressed(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def read_compressed_meta(path: str) -> dict:
+    """meta만 읽기 (zip 안의 다른 배열은 읽지 않음)"""
+    with np.load(path) as data:
+        return json.loads(bytes(data['meta']).decode('utf-8'))
+
+
+def extract_compressed_from_checkpoint(ckpt_path: str, output_path: str, sh_mode: str = 'fp16') -> Tuple[int, int]:
+    """
+    체크포인트에서 압축 splat 파일 추출 (gaussian_ply.extract_ply_from_checkpoint의 압축 버전)
+
+    Returns:
+        (Gaussian 수, 파일 크기 bytes)
+    """
+    arrays, _ = encode_gaussians(load_gaussian_columns(ckpt_path), sh_mode)
+    write_compressed(output_path, arrays)
+    return len(arrays['position']), os.path.getsize(output_path)
+
+
+def decode_to_ply(input_path: str, output_path: str) -> int:
+    """압축 splat 파일 → 표준 Gaussian PLY, Gaussian 수 반환"""
+    columns = decode_gaussians(read_compressed(input_path))
+    write_gaussian_columns(output_path, columns)
+    return len(columns[0])
+
+
+# ---------------------------------------------------------------------------
+# 리포트
+# ---------------------------------------------------------------------------
+
+def attribute_errors(original: List[np.ndarray], decoded: List[np.ndarray], order: np.ndarray) -> Dict[str, float]:
+    """디코딩 결과와 원본(같은 순서로 정렬)의 속성별 오차"""
+    means, scales, quats, opacity, sh0, sh_rest = [column[order] for column in original]
+    d_means, d_scales, d_quats, d_opacity, d_sh0, d_sh_rest = decoded
+
+    extent = float(np.max(np.percentile(means, 99, axis=0) - np.percentile(means, 1, axis=0)))
+    position_error = np.linalg.norm(d_means - means, axis=1)
+    quats = quats / np.linalg.norm(quats, axis=1, keepdims=True)
+    dots = np.clip(np.abs(np.sum(quats * d_quats, axis=1)), 0, 1)
+    errors = {
+        'position_rms / extent': float(np.sqrt(np.mean(position_error ** 2))) / extent,
+        'position_max / extent': float(position_error.max()) / extent,
+        'scale_rel_max': float(np.max(np.abs(d_scales / scales - 1))),
+        'rotation_max_deg': float(np.degrees(2 * np.arccos(dots.min()))),
+        'opacity_max': float(np.max(np.abs(d_opacity - opacity))),
+        'sh0_max': float(np.max(np.abs(d_sh0 - sh0))),
+    }
+    if sh_rest.size > 0:
+        sh_error = np.abs(d_sh_rest - sh_rest)
+        errors['sh_rest_rms'] = float(np.sqrt(np.mean(sh_error ** 2)))
+        errors['sh_rest_p99.9'] = float(np.quantile(sh_error, 0.999))  # 꼬리 오차
+        errors['sh_rest_max'] = float(sh_error.max())
+    return errors
+
+
+def report(path: str, sh_modes=SH_MODES):
+    """압축 모드별 파일 크기 / 인코딩·디코딩 속도 / 속성별 오차 출력"""
+    columns = load_gaussian_columns(path)
+    num_gaussians = len(columns[0])
+    num_floats = sum(column.shape[1] for column in columns)
+    with tempfile.TemporaryDirectory(prefix='compressed_splat') as tmp_dir:
+        ply_path = os.path.join(tmp_dir, 'reference.ply')
+        start = time.perf_counter()
+        write_gaussian_columns(ply_path, columns)
+        t_ply = time.perf_counter() - start
+        ply_size = os.path.getsize(ply_path)
+        print(f"📦 {path}: {num_gaussians:,} Gaussians ({num_floats} floats), "
+              f"PLY {ply_size / 1024 ** 2:.1f} MB ({ply_size / max(num_gaussians, 1):.0f} B/Gaussian, "
+              f"write {t_ply:.2f}s)")
+
+        for sh_mode in sh_modes:
+            out_path = os.path.join(tmp_dir, f'{sh_mode}.gsz')
+            start = time.perf_counter()
+            arrays, order = encode_gaussians(columns, sh_mode)
+            write_compressed(out_path, arrays)
+            t_encode = time.perf_counter() - start
+
+            start = time.perf_counter()
+            decoded = decode_gaussians(read_compressed(out_path))
+            t_decode = time.perf_counter() - start
+            start = time.perf_counter()
+            write_gaussian_columns(os.path.join(tmp_dir, f'{sh_mode}_decoded.ply'), decoded)
+            t_decode_ply = time.perf_counter() - start
+
+            size = os.path.getsize(out_path)
+            print(f"  🗜️  {sh_mode:<8} {size / 1024 ** 2:8.1f} MB ({size / max(num_gaussians, 1):.1f} B/Gaussian, "
+                  f"{ply_size / size:.1f}x smaller) | encode {t_encode:.2f}s "
+                  f"({num_gaussians / t_encode / 1e6:.1f}M/s) | decode {t_decode:.2f}s "
+                  f"({num_gaussians / t_decode / 1e6:.1f}M/s) + PLY {t_decode_ply:.2f}s")
+            errors = attribute_errors(columns, decoded, order)
+            print('      ' + ', '.join(f'{name} {value:.2e}' for name, value in errors.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quantized Gaussian splat format (.gsz) encoder / decoder')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    encode_parser = subparsers.add_parser('encode', help='체크포인트 / Gaussian PLY → .gsz')
+    encode_parser.add_argument('input', help='ckpt_*.pt 또는 Gaussian PLY')
+    encode_parser.add_argument('output', help='출력 .gsz 경로')
+    encode_parser.add_argument('--sh', choices=SH_MODES, default='fp16', help='shN 저장 방식 (default: fp16)')
+
+    decode_parser = subparsers.add_parser('decode', help='.gsz → 표준 Gaussian PLY')
+    decode_parser.add_argument('input', help='.gsz 경로')
+    decode_parser.add_argument('output', help='출력 PLY 경로')
+
+    report_parser = subparsers.add_parser('report', help='크기 / 속도 / 속성별 오차 비교')
+    report_parser.add_argument('inputs', nargs='+', help='ckpt_*.pt 또는 Gaussian PLY')
+    report_parser.add_argument('--sh', choices=SH_MODES, nargs='+', default=list(SH_MODES), help='비교할 shN 모드')
+
+    args = parser.parse_args()
+    if args.command == 'encode':
+        start = time.perf_counter()
+        arrays, _ = encode_gaussians(load_gaussian_columns(args.input), args.sh)
+        write_compressed(args.output, arrays)
+        print(f"✅ {args.input} → {args.output} ({len(arrays['position']):,} Gaussians, "
+              f"{os.path.getsize(args.output) / 1024 ** 2:.1f} MB, {time.perf_counter() - start:.1f}s)")
+    elif args.command == 'decode':
+        start = time.perf_counter()
+        num_gaussians = decode_to_ply(args.input, args.output)
+        print(f"✅ {args.input} → {args.output} ({num_gaussians:,} Gaussians, "
+              f"{os.path.getsize(args.output) / 1024 ** 2:.1f} MB, {time.perf_counter() - start:.1f}s)")
+    elif args.command == 'report':
+        for path in args.inputs:
+            report(path, args.sh)
+
+
+if __name__ == '__main__':
+    main()
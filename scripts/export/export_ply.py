@@ -13,10 +13,13 @@ from pathlib import Path
 sys.path.append('/workspace/gsplat')
 from gsplat.exporter import export_splats
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import gaussian_ply
+
 def load_checkpoint(ckpt_path):
-    """체크포인트 파일 로드"""
+    """체크포인트 파일 로드 (memory-mapped, splats만 실제로 읽힘)"""
     print(f"체크포인트 로딩: {ckpt_path}")
-    ckpt = torch.load(ckpt_path, map_location='cpu')
+    ckpt = gaussian_ply.load_checkpoint(ckpt_path)
     return ckpt
 
 def extract_splat_data(ckpt):
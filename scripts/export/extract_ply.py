@@ -1,112 +1,172 @@
 #!/usr/bin/env python3
 """
-기존 gsplat 체크포인트에서 PLY 파일 추출
+gsplat 체크포인트 → Gaussian PLY 일괄 변환
+
+결과 디렉토리(run_pipeline.sh P1/P4/P5의 results/<pipeline>_<scan>_<timestamp>/ckpts)나
+results/ 전체를 주면 ckpt_*_rank*.pt를 모두 찾아 프로세스 풀에서 병렬로 변환한다.
+출력은 체크포인트 옆 ply/ 디렉토리 (gsplat과 같은 이름 point_cloud_<step>.ply)이고,
+이미 체크포인트보다 새 PLY가 있으면 건너뜀.
+--format gsz면 양자화 압축 포맷 point_cloud_<step>.gsz로 저장 (compressed_splat.py, decode로 PLY 복원).
+
+체크포인트는 mmap으로 splats만 읽고 변환이 끝나면 바로 해제하므로,
+메모리는 대략 workers × (splats 크기)로 제한된다.
+
+사용법:
+    python scripts/export/extract_ply.py ./results/P4_scan1_standard_20250101_120000
+    python scripts/export/extract_ply.py ./results --workers 4
+    python scripts/export/extract_ply.py ckpt_29999_rank0.pt --output-dir ./ply --force
+    python scripts/export/extract_ply.py ./results --format gsz --sh codebook
 """
 
-import torch
-import numpy as np
-from plyfile import PlyData, PlyElement
+import argparse
+import multiprocessing
 import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from compressed_splat import SH_MODES, encode_gaussians, read_compressed_meta, write_compressed
+from gaussian_ply import load_splats, splat_columns, write_gaussian_columns
+
+CKPT_PATTERN = re.compile(r'ckpt_(\d+)_rank(\d+)\.pt$')
+
 
-def extract_ply_from_checkpoint(ckpt_path, output_path, step_name):
-    """체크포인트에서 PLY 파일 추출"""
-    print(f"Loading checkpoint: {ckpt_path}")
-    ckpt = torch.load(ckpt_path, map_location='cpu')
-    
-    splats = ckpt['splats']
-    
-    # Gaussian splat 파라미터 추출
-    means = splats['means'].cpu().numpy()  # (N, 3)
-    scales = torch.exp(splats['scales']).cpu().numpy()  # (N, 3) 
-    quats = torch.nn.functional.normalize(splats['quats'], p=2, dim=-1).cpu().numpy()  # (N, 4)
-    opacities = torch.sigmoid(splats['opacities']).cpu().numpy()  # (N, 1)
-    
-    # SH coefficients for colors
-    sh0 = splats['sh0'].cpu().numpy()  # (N, 3) - DC component
-    if 'shN' in splats and splats['shN'].numel() > 0:
-        shN = splats['shN'].cpu().numpy()  # (N, SH_coeffs, 3)
+def find_checkpoints(paths):
+    """파일 / 디렉토리(재귀) 목록에서 ckpt_*_rank*.pt 수집 (디렉토리, step, rank 순 정렬)"""
+    found = set()
+    for path in map(Path, paths):
+        if path.is_file():
+            found.add(path)
+        elif path.is_dir():
+            found.update(p for p in path.rglob('ckpt_*_rank*.pt') if CKPT_PATTERN.search(p.name))
+        else:
+            print(f"⚠️  경로 없음: {path}")
+
+    def sort_key(path):
+        match = CKPT_PATTERN.search(path.name)
+        return (str(path.parent), int(match.group(1)), int(match.group(2))) if match else (str(path.parent), -1, -1)
+
+    return sorted(found, key=sort_key)
+
+
+def output_path_for(ckpt_path: Path, output_dir=None, suffix: str = '.ply') -> Path:
+    """ckpt_<step>_rank0.pt → <ckpts/..>/ply/point_cloud_<step>.ply (rank > 0이면 _rank<r> 추가)"""
+    match = CKPT_PATTERN.search(ckpt_path.name)
+    if match:
+        step, rank = match.groups()
+        name = f'point_cloud_{step}{suffix}' if rank == '0' else f'point_cloud_{step}_rank{rank}{suffix}'
     else:
-        shN = np.zeros((means.shape[0], 0, 3))
-    
-    print(f"Extracted {means.shape[0]} Gaussians")
-    print(f"Means shape: {means.shape}")
-    print(f"Scales shape: {scales.shape}")
-    print(f"Quats shape: {quats.shape}")
-    print(f"Opacities shape: {opacities.shape}")
-    print(f"SH0 shape: {sh0.shape}")
-    print(f"SHN shape: {shN.shape}")
-    
-    # PLY 파일 생성을 위한 데이터 준비
-    dtype_list = [
-        ('x', 'f4'), ('y', 'f4'), ('z', 'f4'),           # positions
-        ('scale_0', 'f4'), ('scale_1', 'f4'), ('scale_2', 'f4'),  # scales
-        ('rot_0', 'f4'), ('rot_1', 'f4'), ('rot_2', 'f4'), ('rot_3', 'f4'),  # quaternions
-        ('opacity', 'f4'),                                # opacity
-        ('f_dc_0', 'f4'), ('f_dc_1', 'f4'), ('f_dc_2', 'f4'),  # SH DC component
-    ]
-    
-    # Additional SH coefficients if present
-    for i in range(shN.shape[1]):
-        for j in range(3):
-            dtype_list.append((f'f_rest_{i*3+j}', 'f4'))
-    
-    # Create structured array
-    n_points = means.shape[0]
-    vertices = np.zeros(n_points, dtype=dtype_list)
-    
-    # Fill basic data
-    vertices['x'] = means[:, 0]
-    vertices['y'] = means[:, 1] 
-    vertices['z'] = means[:, 2]
-    
-    vertices['scale_0'] = scales[:, 0]
-    vertices['scale_1'] = scales[:, 1]
-    vertices['scale_2'] = scales[:, 2]
-    
-    vertices['rot_0'] = quats[:, 0]  # w component first
-    vertices['rot_1'] = quats[:, 1]  # x
-    vertices['rot_2'] = quats[:, 2]  # y  
-    vertices['rot_3'] = quats[:, 3]  # z
-    
-    vertices['opacity'] = opacities.squeeze()
-    
-    vertices['f_dc_0'] = sh0[:, 0, 0]
-    vertices['f_dc_1'] = sh0[:, 0, 1]
-    vertices['f_dc_2'] = sh0[:, 0, 2]
-    
-    # Fill additional SH coefficients
-    for i in range(shN.shape[1]):
-        for j in range(3):
-            vertices[f'f_rest_{i*3+j}'] = shN[:, i, j]
-    
-    # Create PLY element
-    el = PlyElement.describe(vertices, 'vertex')
-    
-    # Write PLY file
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'wb') as f:
-        PlyData([el]).write(f)
-    
-    print(f"✅ PLY file saved: {output_path}")
-    print(f"📊 Contains {n_points} Gaussians with {shN.shape[1]} SH bands")
+        name = ckpt_path.stem + suffix
+    if output_dir is not None:
+        return Path(output_dir) / name
+    base_dir = ckpt_path.parent.parent if ckpt_path.parent.name == 'ckpts' else ckpt_path.parent
+    return base_dir / 'ply' / name
 
-if __name__ == "__main__":
-    # 기존 7k step 체크포인트에서 PLY 추출
-    ckpt_path = "/workspace/labsRoom/gsplat_results_30k_final/ckpts/ckpt_6999_rank0.pt"
-    output_dir = "/workspace/labsRoom_ply_outputs"
-    
-    os.makedirs(output_dir, exist_ok=True)
-    
-    if os.path.exists(ckpt_path):
-        extract_ply_from_checkpoint(
-            ckpt_path, 
-            f"{output_dir}/point_cloud_7000.ply", 
-            "7000"
-        )
-        print("🎉 Successfully extracted PLY from existing checkpoint!")
+
+def is_up_to_date(ckpt_path: Path, ply_path: Path, sh_mode=None) -> bool:
+    """출력이 체크포인트보다 새로운지 (.gsz면 저장된 sh_mode도 요청과 같아야 함)"""
+    if not (ply_path.exists() and ply_path.stat().st_size > 0 and ply_path.stat().st_mtime >= ckpt_path.stat().st_mtime):
+        return False
+    if sh_mode is None:
+        return True
+    try:
+        return read_compressed_meta(str(ply_path)).get('sh_mode') == sh_mode
+    except (OSError, ValueError, KeyError):
+        return False  # 손상된 / 다른 포맷의 파일은 다시 변환
+
+
+def convert_checkpoint(job):
+    """워커: 체크포인트 하나를 PLY (또는 .gsz)로 변환 (임시 파일에 쓰고 rename, 중단돼도 반쪽 PLY가 남지 않음)"""
+    ckpt_path, ply_path, sh_mode = job
+    tmp_path = ply_path.with_name(ply_path.name + '.tmp')
+    start = time.perf_counter()
+    try:
+        splats, step = load_splats(str(ckpt_path))
+        columns = splat_columns(splats)
+        num_gaussians = len(columns[0])
+        del splats
+        if sh_mode is None:
+            write_gaussian_columns(str(tmp_path), columns)
+        else:
+            arrays, _ = encode_gaussians(columns, sh_mode)
+            write_compressed(str(tmp_path), arrays)
+        os.replace(tmp_path, ply_path)
+        return {'ckpt': str(ckpt_path), 'ply': str(ply_path), 'ok': True, 'step': step,
+                'num_gaussians': num_gaussians, 'bytes': ply_path.stat().st_size,
+                'elapsed': time.perf_counter() - start}
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return {'ckpt': str(ckpt_path), 'ply': str(ply_path), 'ok': False,
+                'error': f'{type(e).__name__}: {e}', 'elapsed': time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch gsplat checkpoint → Gaussian PLY conversion')
+    parser.add_argument('paths', nargs='+', help='결과 디렉토리 (재귀 탐색) 또는 ckpt_*_rank*.pt 파일')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='PLY 출력 디렉토리 (default: 체크포인트별 <result>/ply)')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='병렬 변환 프로세스 수 (메모리 ≈ workers × splats 크기, default: min(4, CPU 수))')
+    parser.add_argument('--force', action='store_true', help='최신 PLY가 있어도 다시 변환')
+    parser.add_argument('--format', choices=['ply', 'gsz'], default='ply',
+                        help='출력 포맷: float32 Gaussian PLY 또는 양자화 압축 .gsz (default: ply)')
+    parser.add_argument('--sh', choices=SH_MODES, default='fp16', help='--format gsz의 shN 저장 방식 (default: fp16)')
+    args = parser.parse_args()
+
+    checkpoints = find_checkpoints(args.paths)
+    if not checkpoints:
+        print("❌ 체크포인트를 찾지 못했습니다 (ckpt_*_rank*.pt)")
+        sys.exit(1)
+
+    sh_mode = args.sh if args.format == 'gsz' else None
+    jobs, num_skipped = [], 0
+    for ckpt_path in checkpoints:
+        ply_path = output_path_for(ckpt_path, args.output_dir, '.' + args.format)
+        if not args.force and is_up_to_date(ckpt_path, ply_path, sh_mode):
+            num_skipped += 1
+            continue
+        ply_path.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append((ckpt_path, ply_path, sh_mode))
+
+    print(f"📦 체크포인트 {len(checkpoints)}개: 변환 {len(jobs)}개, 최신이라 건너뜀 {num_skipped}개 "
+          f"(workers {args.workers})")
+    if not jobs:
+        return
+
+    start = time.perf_counter()
+    results = []
+    if args.workers <= 1 or len(jobs) == 1:
+        pool = None
+        result_iter = map(convert_checkpoint, jobs)
     else:
-        print(f"❌ Checkpoint not found: {ckpt_path}")
-        print("Available files:")
-        if os.path.exists("/workspace/labsRoom/gsplat_results_30k_final/ckpts/"):
-            for f in os.listdir("/workspace/labsRoom/gsplat_results_30k_final/ckpts/"):
-                print(f"  - {f}")
\ No newline at end of file
+        # spawn: torch를 import한 부모를 fork하지 않음 (워커당 torch import는 한 번)
+        pool = multiprocessing.get_context('spawn').Pool(min(args.workers, len(jobs)))
+        result_iter = pool.imap_unordered(convert_checkpoint, jobs)
+    try:
+        for result in result_iter:
+            results.append(result)
+            if result['ok']:
+                print(f"✅ {result['ckpt']} → {result['ply']} ({result['num_gaussians']:,} Gaussians, "
+                      f"{result['bytes'] / 1024 ** 2:.1f} MB, {result['elapsed']:.1f}s)")
+            else:
+                print(f"❌ {result['ckpt']}: {result['error']}")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    elapsed = time.perf_counter() - start
+
+    converted = [result for result in results if result['ok']]
+    num_gaussians = sum(result['num_gaussians'] for result in converted)
+    total_mb = sum(result['bytes'] for result in converted) / 1024 ** 2
+    print(f"\n📊 {len(converted)}/{len(jobs)}개 변환, {elapsed:.1f}s: "
+          f"{num_gaussians:,} Gaussians ({num_gaussians / elapsed:,.0f} Gaussians/s), "
+          f"{total_mb:.1f} MB ({total_mb / elapsed:.1f} MB/s)")
+    if len(converted) < len(jobs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
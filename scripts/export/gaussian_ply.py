@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+gsplat 체크포인트 → Gaussian PLY exporter (extract_ply.py / create_intermediate_steps.py 공용)
+
+splats 텐서를 활성화(exp / normalize / sigmoid)한 열들을 np.concatenate로 interleave해서
+contiguous float32 (N, 14 + 3K) 버퍼를 만들고, header + raw bytes로 바로 기록한다.
+property별 structured array 채우기 + plyfile 재직렬화가 없으므로 수백만 Gaussian도 I/O 속도로 저장됨.
+
+파일로 쓸 때는 전체 버퍼 대신 CHUNK_ROWS행씩 같은 버퍼에 concatenate(out=)해서 기록:
+5M Gaussian (1.1 GB) 기준 전체 버퍼를 새로 할당하는 page fault 비용이 없어져 2배 이상 빠르고,
+추가 메모리도 chunk 하나 (수 MB)로 줄어듦.
+
+체크포인트는 torch.load(mmap=True, weights_only=True)로 읽어서 optimizer state 등
+splats 외의 텐서는 디스크에서 읽지 않는다 (peak RSS ≈ splats 크기).
+
+vertex 레이아웃 (기존 extract_ply_from_checkpoint와 동일, 바이트 단위로 같은 파일):
+    x y z | scale_0..2 (exp) | rot_0..3 (정규화, w x y z) | opacity (sigmoid) | f_dc_0..2 | f_rest_{i*3+j}
+"""
+import os
+import pickle
+import sys
+from typing import Dict, List, Tuple
+
+import numpy as np
+import torch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ply_io import PlyStreamWriter, vertex_dtype, write_ply
+
+BASE_PROPERTY_NAMES = (
+    ['x', 'y', 'z']
+    + [f'scale_{i}' for i in range(3)]
+    + [f'rot_{i}' for i in range(4)]
+    + ['opacity']
+    + [f'f_dc_{i}' for i in range(3)]
+)
+
+# 파일 기록 시 한 번에 interleave하는 행 수 (59 floats 기준 3.8 MB, cache에 머무는 크기)
+CHUNK_ROWS = 1 << 14
+
+
+def gaussian_property_names(num_sh_rest: int) -> List[str]:
+    """PLY property 이름 (num_sh_rest = shN 계수 수 K, f_rest는 3K개)"""
+    return BASE_PROPERTY_NAMES + [f'f_rest_{i}' for i in range(num_sh_rest * 3)]
+
+
+def load_checkpoint(ckpt_path: str) -> dict:
+    """
+    체크포인트를 memory-mapped로 로드
+
+    텐서는 파일에 매핑만 되고 실제로 접근한 페이지만 읽히므로, splats만 쓰면
+    optimizer state 등 나머지 텐서는 메모리에 올라오지 않는다.
+    mmap이 안 되는 예전 포맷(_use_new_zipfile_serialization=False)이나 weights_only로
+    풀 수 없는 객체가 들어 있으면 기존 방식(전체 로드)으로 되돌아감.
+    """
+    try:
+        return torch.load(ckpt_path, map_location='cpu', mmap=True, weights_only=True)
+    except (RuntimeError, pickle.UnpicklingError) as e:
+        print(f"⚠️  mmap/weights_only 로드 실패, 전체 로드로 대체: {type(e).__name__}: {str(e).splitlines()[0]}")
+        return torch.load(ckpt_path, map_location='cpu', weights_only=False)
+
+
+def load_splats(ckpt_path: str) -> Tuple[Dict[str, torch.Tensor], int]:
+    """체크포인트에서 splats 텐서와 step 로드 (splats 외 텐서는 읽지 않음)"""
+    ckpt = load_checkpoint(ckpt_path)
+    return ckpt['splats'], ckpt.get('step', 0)
+
+
+def splat_columns(splats: Dict[str, torch.Tensor]) -> List[np.ndarray]:
+    """활성화된 splat 속성들을 (N, k) float32 배열 목록으로 (열 순서는 gaussian_property_names)"""
+    means = splats['means']
+    num_gaussians = means.shape[0]
+    if 'shN' in splats and splats['shN'].numel() > 0:
+        sh_rest = splats['shN'].reshape(num_gaussians, -1)  # (N, K, 3) → f_rest_{i*3+j}
+    else:
+        sh_rest = means.new_zeros((num_gaussians, 0))
+
+    columns = [
+        means,
+        torch.exp(splats['scales']),
+        torch.nn.functional.normalize(splats['quats'], p=2, dim=-1),
+        torch.sigmoid(splats['opacities']).reshape(num_gaussians, 1),
+        splats['sh0'].reshape(num_gaussians, 3),
+        sh_rest,
+    ]
+    return [column.detach().cpu().numpy().astype(np.float32, copy=False) for column in columns]
+
+
+def splats_to_vertices(splats: Dict[str, torch.Tensor]) -> np.ndarray:
+    """
+    splats → contiguous float32 (N, 14 + 3K) vertex 버퍼
+
+    Returns:
+        vertices: (N, 14 + 3K) float32, 열 순서는 gaussian_property_names(K)
+    """
+    return np.concatenate(splat_columns(splats), axis=1)
+
+
+def write_gaussian_ply(output_path: str, vertices: np.ndarray):
+    """(N, 14 + 3K) float32 vertex 버퍼를 Gaussian PLY로 저장"""
+    num_sh_rest = (vertices.shape[1] - len(BASE_PROPERTY_NAMES)) // 3
+    write_ply(output_path, vertices, vertex_dtype(gaussian_property_names(num_sh_rest)))
+
+
+def write_gaussian_columns(output_path: str, columns: List[np.ndarray], chunk_rows: int = CHUNK_ROWS):
+    """
+    splat_columns 결과를 전체 (N, 14 + 3K) 버퍼 없이 chunk_rows행씩 interleave해서 저장
+
+    write_gaussian_ply(output_path, np.concatenate(columns, axis=1))와 같은 파일.
+    """
+    num_gaussians = len(columns[0])
+    num_floats = sum(column.shape[1] for column in columns)
+    dtype = vertex_dtype(gaussian_property_names((num_floats - len(BASE_PROPERTY_NAMES)) // 3))
+    buffer = np.empty((min(chunk_rows, num_gaussians), num_floats), dtype=np.float32)
+    with PlyStreamWriter(output_path, dtype, num_vertices=num_gaussians) as writer:
+        for start in range(0, num_gaussians, chunk_rows):
+            end = min(start + chunk_rows, num_gaussians)
+            chunk = buffer[:end - start]
+            np.concatenate([column[start:end] for column in columns], axis=1, out=chunk)
+            writer.write(chunk)
+
+
+def extract_ply_from_checkpoint(ckpt_path: str, output_path: str) -> Tuple[int, int]:
+    """
+    체크포인트에서 PLY 파일 추출
+
+    Returns:
+        (Gaussian 수, SH rest 계수 수 K)
+    """
+    print(f"📂 Loading checkpoint: {ckpt_path}")
+    splats, step = load_splats(ckpt_path)
+
+    columns = splat_columns(splats)
+    num_gaussians = len(columns[0])
+    num_sh_rest = columns[-1].shape[1] // 3
+    print(f"📊 Extracted {num_gaussians} Gaussians from step {step}")
+
+    write_gaussian_columns(output_path, columns)
+    print(f"✅ PLY file saved: {output_path}")
+    return num_gaussians, num_sh_rest
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+binary_little_endian PLY (vertex element만) NumPy 입출력
+
+점 / Gaussian 배열을 interleave된 버퍼 하나로 만들어 header 뒤에 그대로 기록한다.
+trimesh / plyfile처럼 property별로 다시 직렬화하지 않으므로 쓰기는 디스크 속도에 가깝고,
+이미 interleave된 배열((N, K) float32 또는 structured array)은 복사 없이 memoryview로 기록.
+
+- write_ply: 전체 배열을 한 번에 기록
+- PlyStreamWriter: chunk 단위 append (RAM보다 큰 점군), 닫을 때 header의 vertex 수만 갱신
+- write_point_cloud_ply: xyz + rgb 점군 (demo_colmap sparse/points.ply)
+- read_ply: header 파싱 후 np.memmap으로 읽기 (검증 / 디코딩용)
+"""
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+# numpy dtype ↔ PLY property type
+PLY_TYPES = {
+    'i1': 'char', 'u1': 'uchar', 'i2': 'short', 'u2': 'ushort',
+    'i4': 'int', 'u4': 'uint', 'f4': 'float', 'f8': 'double',
+}
+PLY_TYPE_TO_NUMPY = {ply_type: np.dtype('<' + code) for code, ply_type in PLY_TYPES.items()}
+PLY_TYPE_TO_NUMPY.update({
+    'int8': np.dtype('i1'), 'uint8': np.dtype('u1'), 'int16': np.dtype('<i2'), 'uint16': np.dtype('<u2'),
+    'int32': np.dtype('<i4'), 'uint32': np.dtype('<u4'), 'float32': np.dtype('<f4'), 'float64': np.dtype('<f8'),
+})
+
+# streaming 모드에서 vertex 수를 나중에 채우기 위해 예약하는 자릿수
+_COUNT_WIDTH = 20
+
+
+def vertex_dtype(names: Sequence[str], dtype='<f4') -> np.dtype:
+    """모든 property가 같은 타입인 vertex structured dtype"""
+    return np.dtype([(name, dtype) for name in names])
+
+
+def ply_header(num_vertices: int, dtype: np.dtype, comments: Sequence[str] = (), count_width: int = 0) -> bytes:
+    """
+    structured dtype으로 PLY header 생성
+
+    count_width > 0이면 vertex 수 뒤를 공백으로 채워 header 길이를 고정 (streaming 모드에서 덮어쓰기용)
+    """
+    lines = ['ply', 'format binary_little_endian 1.0']
+    lines += [f'comment {comment}' for comment in comments]
+    lines.append(f'element vertex {num_vertices}'.ljust(len('element vertex ') + count_width))
+    for name in dtype.names:
+        field_dtype, _ = dtype.fields[name]
+        if field_dtype.shape:
+            raise ValueError(f"PLY property '{name}' must be a scalar field, got shape {field_dtype.shape}")
+        code = field_dtype.str[1:]
+        if code not in PLY_TYPES:
+            raise ValueError(f"Unsupported PLY property type for '{name}': {field_dtype}")
+        lines.append(f'property {PLY_TYPES[code]} {name}')
+    lines.append('end_header')
+    return ('\n'.join(lines) + '\n').encode('ascii')
+
+
+def as_vertex_buffer(vertices: np.ndarray, dtype: Optional[np.dtype] = None) -> np.ndarray:
+    """
+    기록할 배열을 packed little-endian structured array로 정리
+
+    vertices는 structured array 또는 (N, K) 배열 (이 경우 dtype 필수, K개 property가 같은 타입).
+    이미 C-contiguous이고 dtype이 맞으면 복사 없이 view만 반환.
+    """
+    if vertices.dtype.names is None:
+        if dtype is None:
+            raise ValueError('dtype (property names) is required for a plain (N, K) array')
+        field_types = {dtype.fields[name][0] for name in dtype.names}
+        if len(field_types) != 1 or vertices.ndim != 2 or vertices.shape[1] != len(dtype.names):
+            raise ValueError(f'Cannot view a {vertices.shape} {vertices.dtype} array as {dtype}')
+        vertices = np.ascontiguousarray(vertices, dtype=field_types.pop())
+        return vertices.view(dtype).reshape(-1)
+
+    packed = np.dtype([(name, vertices.dtype.fields[name][0].newbyteorder('<')) for name in vertices.dtype.names])
+    if dtype is not None and dtype != packed:
+        raise ValueError(f'Structured array dtype {vertices.dtype} does not match {dtype}')
+    if vertices.dtype == packed and vertices.flags.c_contiguous:
+        return vertices
+    out = np.empty(len(vertices), dtype=packed)
+    for name in packed.names:
+        out[name] = vertices[name]
+    return out
+
+
+def write_ply(path: str, vertices: np.ndarray, dtype: Optional[np.dtype] = None, comments: Sequence[str] = ()):
+    """
+    vertex 배열을 binary PLY로 저장 (header + raw bytes 한 번)
+
+    Args:
+        path: 출력 경로
+        vertices: structured array, 또는 (N, K) 배열 + dtype (vertex_dtype(names))
+        dtype: (N, K) 배열의 property 이름 / 타입
+        comments: header comment 줄
+    """
+    buffer = as_vertex_buffer(vertices, dtype)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(ply_header(len(buffer), buffer.dtype, comments))
+        f.write(memoryview(buffer).cast('B'))
+
+
+class PlyStreamWriter:
+    """
+    chunk 단위로 vertex를 append하는 PLY writer
+
+    header는 vertex 수 자리를 고정 폭으로 예약해 먼저 기록하고, close()에서 실제 개수로 덮어씀.
+    vertex 수를 미리 알면 (num_vertices) 일반 header를 쓰고 close()에서 개수만 확인.
+    메모리에는 한 chunk만 올라가므로 RAM보다 큰 점군도 기록 가능.
+
+        with PlyStreamWriter(path, point_cloud_dtype()) as writer:
+            for points, colors in chunks:
+                writer.write(pack_point_cloud(points, colors))
+    """
+
+    def __init__(self, path: str, dtype: np.dtype, comments: Sequence[str] = (), num_vertices: Optional[int] = None):
+        self.path = path
+        self.dtype = as_vertex_buffer(np.empty(0, dtype=dtype)).dtype
+        self.comments = list(comments)
+        self.expected_vertices = num_vertices
+        self.num_vertices = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, 'wb')
+        if num_vertices is None:
+            self.file.write(ply_header(0, self.dtype, self.comments, count_width=_COUNT_WIDTH))
+        else:
+            self.file.write(ply_header(num_vertices, self.dtype, self.comments))
+
+    def write(self, vertices: np.ndarray):
+        """structured array 또는 (N, K) 배열 chunk 추가"""
+        buffer = as_vertex_buffer(vertices, self.dtype)
+        self.file.write(memoryview(buffer).cast('B'))
+        self.num_vertices += len(buffer)
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.expected_vertices is None:
+            self.file.seek(0)
+            self.file.write(ply_header(self.num_vertices, self.dtype, self.comments, count_width=_COUNT_WIDTH))
+        self.file.close()
+        if self.expected_vertices is not None and self.num_vertices != self.expected_vertices:
+            raise ValueError(f'{self.path}: header declares {self.expected_vertices} vertices, '
+                             f'{self.num_vertices} were written')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()  # 기록 중 오류: 원래 예외를 그대로 전달
+
+
+def point_cloud_dtype(with_color: bool = True) -> np.dtype:
+    """x, y, z float32 (+ red, green, blue uchar) — 일반 점군 뷰어가 읽는 레이아웃"""
+    fields = [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]
+    if with_color:
+        fields += [('red', 'u1'), ('green', 'u1'), ('blue', 'u1')]
+    return np.dtype(fields)
+
+
+def pack_point_cloud(points: np.ndarray, colors: Optional[np.ndarray] = None) -> np.ndarray:
+    """(N, 3) 점 + (N, 3) uint8 색상을 interleave된 structured array 하나로 (한 번 복사)"""
+    points = np.asarray(points)
+    out = np.empty(len(points), dtype=point_cloud_dtype(colors is not None))
+    for axis, name in enumerate(('x', 'y', 'z')):
+        out[name] = points[:, axis]
+    if colors is not None:
+        colors = np.asarray(colors)
+        if colors.dtype != np.uint8:
+            colors = np.clip(colors * 255 if np.issubdtype(colors.dtype, np.floating) else colors, 0, 255)
+        for channel, name in enumerate(('red', 'green', 'blue')):
+            out[name] = colors[:, channel]
+    return out
+
+
+def write_point_cloud_ply(path: str, points: np.ndarray, colors: Optional[np.ndarray] = None,
+                          chunk_size: int = 0):
+    """
+    점군을 binary PLY로 저장 (trimesh.PointCloud(points, colors).export(path) 대체)
+
+    Args:
+        points: (N, 3) 좌표
+        colors: (N, 3) uint8 RGB (float이면 [0, 1]로 간주), None이면 좌표만
+        chunk_size: > 0이면 chunk_size개씩 나눠 기록 (interleave 버퍼가 chunk 크기로 제한됨)
+    """
+    if chunk_size <= 0 or len(points) <= chunk_size:
+        write_ply(path, pack_point_cloud(points, colors))
+        return
+    with PlyStreamWriter(path, point_cloud_dtype(colors is not None)) as writer:
+        for start in range(0, len(points), chunk_size):
+            end = start + chunk_size
+            writer.write(pack_point_cloud(points[start:end], None if colors is None else colors[start:end]))
+
+
+def read_ply_header(path: str):
+    """header 파싱 → (vertex 수, structured dtype, 데이터 시작 offset, comments)"""
+    with open(path, 'rb') as f:
+        if f.readline().strip() != b'ply':
+            raise ValueError(f'Not a PLY file: {path}')
+        num_vertices, fields, comments, element = None, [], [], None
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f'Unexpected end of PLY header: {path}')
+            tokens = line.decode('ascii').split()
+            if not tokens:
+                continue
+            if tokens[0] == 'format' and tokens[1] != 'binary_little_endian':
+                raise ValueError(f'Only binary_little_endian PLY is supported, got {tokens[1]}: {path}')
+            elif tokens[0] == 'comment':
+                comments.append(line.decode('ascii')[len('comment '):].rstrip('\n'))
+            elif tokens[0] == 'element':
+                element = tokens[1]
+                if element != 'vertex':
+                    raise ValueError(f"Only the 'vertex' element is supported, got '{element}': {path}")
+                num_vertices = int(tokens[2])
+            elif tokens[0] == 'property':
+                if tokens[1] == 'list':
+                    raise ValueError(f'List properties are not supported: {path}')
+                fields.append((tokens[2], PLY_TYPE_TO_NUMPY[tokens[1]]))
+            elif tokens[0] == 'end_header':
+                return num_vertices, np.dtype(fields), f.tell(), comments
+
+
+def read_ply(path: str, mmap: bool = True) -> np.ndarray:
+    """vertex structured array 반환 (mmap=True면 read-only np.memmap)"""
+    num_vertices, dtype, offset, _ = read_ply_header(path)
+    if num_vertices == 0:
+        return np.empty(0, dtype=dtype)
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(num_vertices,))
+    return np.fromfile(path, dtype=dtype, count=num_vertices, offset=offset)
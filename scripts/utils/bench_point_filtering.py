@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Point budget 샘플링 벤치마크: randomly_limit_trues (uniform random) vs voxel_limit_trues
+
+VGGT 출력처럼 카메라 근처가 훨씬 촘촘한 합성 점군 (S, H, W, 3)을 만들고,
+- 소요 시간
+- 공간 커버리지 (샘플이 차지하는 coarse voxel 수, 전체 점군 bbox 대각선 / 100 크기)
+- 샘플의 평균 confidence
+를 비교한다. 작은 입력에서는 정렬 기반 참조 구현과 결과가 같은지도 확인한다.
+
+사용법:
+    python scripts/utils/bench_point_filtering.py --frames 30 60 100 --max-points 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from point_filtering import voxel_downsample, voxel_limit_trues
+
+
+def randomly_limit_trues(mask: np.ndarray, max_trues: int) -> np.ndarray:
+    """vggt.utils.helper.randomly_limit_trues와 동일 (비교용)"""
+    true_indices = np.flatnonzero(mask)
+    if len(true_indices) <= max_trues:
+        return mask
+    sampled = np.random.choice(true_indices, size=max_trues, replace=False)
+    limited = np.zeros(mask.size, dtype=bool)
+    limited[sampled] = True
+    return limited.reshape(mask.shape)
+
+
+def make_depth_cloud(num_frames: int, size: int = 518, seed: int = 0):
+    """
+    카메라들이 원 궤도에서 중심을 바라보는 장면: 바닥 평면 + 먼 배경 (거리 6에서 절단).
+    카메라마다 가까운 바닥은 픽셀이 몰려 매우 촘촘하고, 먼 곳은 듬성듬성
+    """
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:size, 0:size].astype(np.float32)
+    rays = np.stack([(xs - size / 2) / (size / 2), (ys - size / 2) / (size / 2), np.ones_like(xs)], axis=-1)
+
+    points = np.empty((num_frames, size, size, 3), dtype=np.float32)
+    for f in range(num_frames):
+        angle = 2 * np.pi * f / num_frames
+        center = np.array([3 * np.cos(angle), -1.0, 3 * np.sin(angle)], dtype=np.float32)
+        forward = -center / np.linalg.norm(center)
+        right = np.cross([0, 1, 0], forward)
+        right /= np.linalg.norm(right)
+        down = np.cross(forward, right)
+        world_rays = rays @ np.stack([right, down, forward]).astype(np.float32)
+
+        # 바닥 (y = 0) 교차, 못 만나면 먼 배경
+        t = np.where(world_rays[..., 1] > 1e-3, -center[1] / np.maximum(world_rays[..., 1], 1e-3), 6.0)
+        t = np.minimum(t, 6.0)
+        points[f] = center + world_rays * t[..., None]
+
+    conf = rng.gamma(2.0, 2.0, size=points.shape[:3]).astype(np.float32) + 1.0
+    return points, conf
+
+
+def reference_voxel_downsample(points, conf, voxel_size):
+    """정렬 기반 참조 구현: 셀마다 (conf 최대, 동점이면 인덱스 최대)"""
+    coords = np.floor((points - points.min(axis=0)) / voxel_size).astype(np.int64)
+    _, inverse = np.unique(coords, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.lexsort((np.arange(len(points)), conf, inverse))
+    last = np.r_[inverse[order][1:] != inverse[order][:-1], True]
+    return np.sort(order[last])
+
+
+def coverage(points: np.ndarray, cell: float) -> int:
+    return len(np.unique(np.floor(points / cell).astype(np.int64), axis=0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Point budget sampling benchmark')
+    parser.add_argument('--frames', type=int, nargs='+', default=[30, 60, 100], help='프레임 수 (518x518 점/프레임)')
+    parser.add_argument('--max-points', type=int, default=100000, help='point budget (default: 100000)')
+    parser.add_argument('--voxel-size', type=float, default=0.0, help='voxel 크기 (0 = budget에 맞춰 자동)')
+    args = parser.parse_args()
+
+    # 정확성: 작은 입력에서 참조 구현과 비교
+    rng = np.random.default_rng(0)
+    small = rng.normal(size=(200000, 3)).astype(np.float32)
+    small_conf = rng.integers(0, 50, 200000).astype(np.float32)  # 동점 포함
+    assert np.array_equal(voxel_downsample(small, small_conf, 0.1), reference_voxel_downsample(small, small_conf, 0.1))
+    print("✅ voxel_downsample == 정렬 기반 참조 구현")
+
+    for num_frames in args.frames:
+        points, conf = make_depth_cloud(num_frames)
+        mask = conf >= 2.0
+        candidates = points[mask]
+        cell = float(np.linalg.norm(np.ptp(candidates, axis=0))) / 100
+
+        start = time.perf_counter()
+        random_mask = randomly_limit_trues(mask, args.max_points)
+        t_random = time.perf_counter() - start
+
+        start = time.perf_counter()
+        voxel_mask = voxel_limit_trues(points, conf, mask, args.max_points, args.voxel_size)
+        t_voxel = time.perf_counter() - start
+
+        print(f"\n📦 {num_frames} frames, {mask.sum():,} candidate points → budget {args.max_points:,}")
+        print(f"   {'':8}{'time':>8}{'kept':>12}{'coverage':>10}{'mean conf':>11}")
+        print(f"   {'all':8}{'':>8}{len(candidates):>12,}{coverage(candidates, cell):>10,}{conf[mask].mean():>11.2f}")
+        for name, sampled, elapsed in (('random', random_mask, t_random), ('voxel', voxel_mask, t_voxel)):
+            print(f"   {name:8}{elapsed:>7.2f}s{sampled.sum():>12,}{coverage(points[sampled], cell):>10,}"
+                  f"{conf[sampled].mean():>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+VGGT feed-forward 점군 필터링 / 샘플링 (COLMAP export 전 단계)
+
+- voxel_limit_trues: randomly_limit_trues 대체. voxel grid 셀마다 confidence가 가장 높은 점 하나만 남겨
+  카메라 근처 밀집 영역이 point budget을 독식하지 않도록 공간적으로 고르게 샘플링
+  (정렬 없이 vectorized linear-probing hash로 O(N))
+- adaptive_conf_threshold: 목표 점 수 / percentile을 맞추는 confidence threshold를
+  히스토그램 한 번으로 결정 (전체 정렬 없음)
+- multiview_consistency_mask: 각 프레임의 점을 가까운 K개 view에 reprojection해서
+  예측 depth와 어긋나는 floater 제거
+"""
+import numpy as np
+
+
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)  # Fibonacci hashing
+
+
+def voxel_keys(points: np.ndarray, voxel_size: float):
+    """
+    3D 점 (N, 3) → voxel 좌표 (3, N) int64 와 고유한 int64 선형 키 (N,)
+
+    grid 원점은 점군의 최솟값 (좌표가 음수가 아니라 floor 대신 truncation).
+    (N, 3)의 axis=0 reduction은 느리므로 (3, N) contiguous로 바꿔서 계산.
+    grid가 int64 범위를 넘으면 키는 None
+    """
+    coords = np.ascontiguousarray(points.T)
+    coords -= coords.min(axis=1, keepdims=True)
+    coords /= voxel_size
+    voxel_coords = coords.astype(np.int64)
+    dims = voxel_coords.max(axis=1) + 1
+    if np.prod(dims.astype(np.float64)) >= 2 ** 62:
+        return voxel_coords, None
+    keys = voxel_coords[2] * dims[1]
+    keys += voxel_coords[1]
+    keys *= dims[0]
+    keys += voxel_coords[0]
+    return voxel_coords, keys
+
+
+def hash_group_ids(keys: np.ndarray) -> np.ndarray:
+    """
+    int64 키 → 압축된 group id (같은 키 = 같은 id), 정렬 없이 O(N)
+
+    크기 2^k >= 2N open-addressing 테이블에 vectorized linear probing으로 삽입한다.
+    같은 키는 항상 같은 slot 순서를 밟으므로 같은 slot에 모이고, 라운드마다 아직
+    자리를 못 찾은 원소만 다음 slot으로 이동한다 (load factor <= 0.5 → 라운드 수 작음).
+
+    Returns:
+        (N,) int64 slot id (0 <= id < table size, 키마다 고유)
+    """
+    num = len(keys)
+    bits = max(int(np.ceil(np.log2(max(2 * num, 2)))), 1)
+    table_size = 1 << bits
+    mask = np.int64(table_size - 1)
+
+    table = np.full(table_size, -1, dtype=np.int64)  # slot → 키 (-1 = 비어 있음)
+    keys = keys.astype(np.int64, copy=False)
+    if num > 0 and keys.min() < 0:
+        raise ValueError("hash_group_ids expects non-negative keys")
+
+    slots = ((keys.astype(np.uint64) * _HASH_MULTIPLIER) >> np.uint64(64 - bits)).astype(np.int64)
+    pending = np.arange(num)
+    while len(pending) > 0:
+        pending_slots = slots[pending]
+        pending_keys = keys[pending]
+
+        # 빈 slot 선점 (여러 키가 같은 빈 slot을 노리면 마지막 쓰기가 이김)
+        empty = table[pending_slots] == -1
+        table[pending_slots[empty]] = pending_keys[empty]
+
+        # slot 주인이 자기 키가 아니면 다음 slot으로
+        collided = table[pending_slots] != pending_keys
+        pending = pending[collided]
+        slots[pending] = (slots[pending] + 1) & mask
+
+    return slots
+
+
+def voxel_downsample(points: np.ndarray, conf: np.ndarray, voxel_size: float) -> np.ndarray:
+    """
+    voxel grid 셀마다 confidence가 가장 높은 점 하나를 고름
+
+    Args:
+        points: (N, 3) 3D 점
+        conf: (N,) confidence
+        voxel_size: voxel 한 변 길이 (점군 좌표 단위)
+
+    Returns:
+        남길 점의 인덱스 (오름차순)
+    """
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    voxel_coords, keys = voxel_keys(points, voxel_size)
+    if keys is not None:
+        # depth map 순서의 점은 이웃 픽셀이 같은 voxel에 들어가는 경우가 많음
+        # → 연속으로 같은 키는 run 하나로 묶어서 run 대표만 hash
+        run_start = np.empty(len(keys), dtype=bool)
+        run_start[0] = True
+        np.not_equal(keys[1:], keys[:-1], out=run_start[1:])
+        run_id = np.cumsum(run_start) - 1
+        group_ids = hash_group_ids(keys[run_start])[run_id]
+    else:
+        # 극단적으로 넓은 grid (outlier) → 정렬 기반으로 대체
+        group_ids = np.unique(voxel_coords.T, axis=0, return_inverse=True)[1].reshape(-1)
+
+    conf = conf.astype(np.float32, copy=False)
+    best_conf = np.full(group_ids.max() + 1, -np.inf, dtype=np.float32)
+    np.maximum.at(best_conf, group_ids, conf)
+
+    # 동점이면 인덱스가 가장 큰 점 하나 (마지막 쓰기가 이김)
+    candidates = np.flatnonzero(conf == best_conf[group_ids])
+    winner = np.full(len(best_conf), -1, dtype=np.int64)
+    winner[group_ids[candidates]] = candidates
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[winner[winner >= 0]] = True
+    return np.flatnonzero(keep)
+
+
+def _auto_voxel_size(points: np.ndarray, max_points: int) -> float:
+    """budget에 맞는 voxel 크기 초기값: 점군이 표면이라 가정하고 (robust extent)^2 / budget"""
+    stride = max(len(points) // 100000, 1)
+    low, high = np.percentile(points[::stride], [1, 99], axis=0)
+    extent = float(np.linalg.norm(high - low))
+    return max(extent / np.sqrt(max_points), 1e-12)
+
+
+def _search_voxel_size(points: np.ndarray, conf: np.ndarray, max_points: int,
+                       max_iters: int = 12, min_fill: float = 0.8) -> np.ndarray:
+    """
+    budget의 min_fill 이상, max_points 이하가 되는 voxel 크기 탐색
+
+    점유 voxel 수 ~ voxel_size^-d 로 보고 log-log secant로 갱신 (d는 직전 두 시도에서 추정,
+    초기값 2 = 표면), 이미 찾은 초과/미달 구간 밖으로 나가면 기하 평균으로 이분.
+
+    Returns:
+        찾은 voxel 크기에서의 voxel_downsample 결과 (budget 이하 중 가장 많은 점).
+        모든 시도가 budget을 넘으면 마지막 결과 (호출 측에서 confidence 상위로 자름)
+    """
+    target = (1 + min_fill) / 2 * max_points
+    voxel_size = _auto_voxel_size(points, max_points)
+    too_small, large_enough = None, None  # budget 초과 / 이하였던 voxel 크기
+    best, previous = None, None
+    for _ in range(max_iters):
+        keep = voxel_downsample(points, conf, voxel_size)
+        count = max(len(keep), 1)
+        if count > max_points:
+            too_small = voxel_size
+        else:
+            if best is None or len(keep) > len(best):
+                best = keep
+            if count >= min_fill * max_points:
+                break
+            large_enough = voxel_size
+
+        dim = 2.0
+        if previous is not None and previous[0] != voxel_size and previous[1] != count:
+            dim = np.clip(-np.log(count / previous[1]) / np.log(voxel_size / previous[0]), 1.0, 3.0)
+        previous = (voxel_size, count)
+
+        voxel_size = voxel_size * (count / target) ** (1.0 / dim)
+        if too_small is not None and large_enough is not None and not too_small < voxel_size < large_enough:
+            voxel_size = np.sqrt(too_small * large_enough)
+
+    return best if best is not None else keep
+
+
+def voxel_limit_trues(points_3d: np.ndarray, conf: np.ndarray, mask: np.ndarray,
+                      max_points: int, voxel_size: float = 0.0, max_iters: int = 12) -> np.ndarray:
+    """
+    randomly_limit_trues 대체: mask에서 True인 점들을 voxel grid로 샘플링해 최대 max_points개만 남김
+
+    Args:
+        points_3d: (..., 3) 3D 점 (예: (S, H, W, 3) unproject 결과)
+        conf: (...) confidence (예: depth_conf)
+        mask: (...) bool, 후보 점 (예: depth_conf >= threshold)
+        max_points: point budget
+        voxel_size: voxel 한 변 길이. 0이면 budget을 넘지 않는 크기를 자동 탐색
+        max_iters: 자동 탐색 최대 반복 수
+
+    Returns:
+        mask와 같은 shape의 bool 배열 (최대 max_points개 True)
+    """
+    flat_idx = np.flatnonzero(mask)
+    if len(flat_idx) <= max_points and voxel_size <= 0:
+        return mask.copy()
+
+    points = points_3d.reshape(-1, 3)[flat_idx]
+    finite = np.isfinite(points).all(axis=1)
+    if not finite.all():
+        flat_idx, points = flat_idx[finite], points[finite]
+    point_conf = conf.reshape(-1)[flat_idx]
+
+    if voxel_size > 0:
+        keep = voxel_downsample(points, point_conf, voxel_size)
+    else:
+        keep = _search_voxel_size(points, point_conf, max_points, max_iters)
+
+    if len(keep) > max_points:
+        # 그래도 넘치면 confidence 상위 max_points개 (O(N) partition)
+        top = np.argpartition(-point_conf[keep], max_points - 1)[:max_points]
+        keep = keep[top]
+
+    limited = np.zeros(mask.size, dtype=bool)
+    limited[flat_idx[keep]] = True
+    return limited.reshape(mask.shape)
+
+
+def adaptive_conf_threshold(conf: np.ndarray, target_count: int = None, percentile: float = None,
+                            num_bins: int = 4096) -> float:
+    """
+    conf >= threshold 인 점이 target_count개 (또는 상위 (100 - percentile)%)가 되는 threshold
+
+    VGGT confidence는 꼬리가 긴 분포라 log(conf) 위의 균등 히스토그램 (min/max + np.histogram,
+    전부 O(N))을 만들고, 위에서부터 누적한 개수가 목표를 넘는 bin 안에서 선형 보간한다.
+    오차는 bin 하나 안의 점 수 이내.
+
+    Args:
+        conf: confidence 배열 (예: (S, H, W) depth_conf)
+        target_count: 남길 점 수
+        percentile: 이 percentile 이상만 남김 (예: 80 → 상위 20%), target_count 대신 사용
+        num_bins: log-space bin 수
+
+    Returns:
+        threshold (conf >= threshold 로 사용)
+    """
+    values = conf.reshape(-1)
+    if percentile is not None:
+        target_count = int(round(len(values) * (1.0 - percentile / 100.0)))
+    if target_count is None:
+        raise ValueError("Either target_count or percentile must be given")
+    target_count = int(np.clip(target_count, 1, len(values)))
+
+    log_conf = np.log(np.maximum(values, np.finfo(np.float32).tiny))
+    low, high = float(log_conf.min()), float(log_conf.max())
+    if high <= low:
+        return float(np.exp(low))
+
+    hist, edges = np.histogram(log_conf, bins=num_bins, range=(low, high))
+    kept_from = np.cumsum(hist[::-1])[::-1]  # kept_from[b] = bin b 이상에 있는 점 수
+
+    b = int(np.flatnonzero(kept_from >= target_count).max())
+    above = kept_from[b + 1] if b + 1 < num_bins else 0
+    frac = (target_count - above) / max(hist[b], 1)  # bin b에서 위쪽으로 남길 비율
+    log_threshold = edges[b + 1] - frac * (edges[b + 1] - edges[b])
+    return float(np.exp(log_threshold))
+
+
+def nearest_views(extrinsic: np.ndarray, num_views: int) -> np.ndarray:
+    """
+    카메라 중심 거리 기준으로 프레임마다 가장 가까운 num_views개 다른 프레임
+
+    Args:
+        extrinsic: (S, 3, 4) cam_from_world
+        num_views: K
+
+    Returns:
+        (S, K) 이웃 프레임 인덱스 (K = min(num_views, S - 1))
+    """
+    rotation, translation = extrinsic[:, :3, :3], extrinsic[:, :3, 3]
+    centers = -np.einsum('sji,sj->si', rotation, translation)  # -R^T t
+    dist = np.linalg.norm(centers[:, None] - centers[None], axis=-1)
+    np.fill_diagonal(dist, np.inf)
+    num_views = min(num_views, len(extrinsic) - 1)
+    return np.argsort(dist, axis=1)[:, :num_views]
+
+
+def multiview_consistency_mask(points_3d: np.ndarray, depth_map: np.ndarray,
+                               extrinsic: np.ndarray, intrinsic: np.ndarray,
+                               mask: np.ndarray = None, num_views: int = 4,
+                               rel_thresh: float = 0.05, min_consistent: int = 1) -> np.ndarray:
+    """
+    Multi-view depth consistency 필터
+
+    프레임 i의 점 X를 이웃 view j에 투영해 (u, v, z)를 구하고, j의 예측 depth D_j(u, v)와
+    |z - D_j| / z < rel_thresh 이면 일치로 센다. 일치하는 이웃이 min_consistent개 이상인 점만 남김.
+    (이웃 이미지 밖, 카메라 뒤, 이웃의 해당 픽셀이 mask=False인 경우는 일치로 세지 않음)
+
+    프레임 단위로 (후보 점 수 x K) 배열을 한 번에 계산 (CPU NumPy)
+
+    Args:
+        points_3d: (S, H, W, 3) world 좌표 점 (unproject_depth_map_to_point_map 결과)
+        depth_map: (S, H, W, 1) 또는 (S, H, W) 예측 depth
+        extrinsic: (S, 3, 4) cam_from_world
+        intrinsic: (S, 3, 3)
+        mask: (S, H, W) bool 후보 점 / 유효 depth (None = 전체)
+        num_views: 비교할 이웃 view 수 K
+        rel_thresh: 허용 상대 depth 오차
+        min_consistent: 남기기 위해 필요한 일치 view 수
+
+    Returns:
+        (S, H, W) bool, mask 중 consistency를 통과한 점
+    """
+    depth_map = depth_map.reshape(depth_map.shape[:3])
+    num_frames, height, width = depth_map.shape
+    if mask is None:
+        mask = np.ones(depth_map.shape, dtype=bool)
+
+    neighbors = nearest_views(extrinsic, num_views)
+    if neighbors.shape[1] == 0:
+        return mask.copy()
+
+    flat_depth = depth_map.reshape(num_frames, -1)
+    flat_valid = mask.reshape(num_frames, -1)
+    consistent = np.zeros(mask.shape, dtype=bool)
+
+    for i in range(num_frames):
+        pixel_idx = np.flatnonzero(flat_valid[i])
+        if len(pixel_idx) == 0:
+            continue
+        points = points_3d[i].reshape(-1, 3)[pixel_idx].astype(np.float32)  # (P, 3)
+        views = neighbors[i]
+
+        # (K, P, 3) 이웃 카메라 좌표계
+        cam_points = np.einsum('kij,pj->kpi', extrinsic[views, :3, :3], points) + extrinsic[views, None, :3, 3]
+        z = cam_points[..., 2]
+        in_front = z > 1e-6
+        safe_z = np.where(in_front, z, 1.0)
+        u = intrinsic[views, None, 0, 0] * cam_points[..., 0] / safe_z + intrinsic[views, None, 0, 2]
+        v = intrinsic[views, None, 1, 1] * cam_points[..., 1] / safe_z + intrinsic[views, None, 1, 2]
+
+        col = np.rint(u).astype(np.int64)
+        row = np.rint(v).astype(np.int64)
+        inside = in_front & (col >= 0) & (col < width) & (row >= 0) & (row < height)
+        lookup = np.where(inside, row * width + col, 0)
+
+        ref_depth = np.take_along_axis(flat_depth[views], lookup, axis=1)
+        ref_valid = np.take_along_axis(flat_valid[views], lookup, axis=1)
+        agree = inside & ref_valid & (np.abs(z - ref_depth) < rel_thresh * safe_z)
+
+        consistent[i].reshape(-1)[pixel_idx] = agree.sum(axis=0) >= min_consistent
+
+    return consistent
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+VGGT 상주 추론 워커 (demo_colmap.py용)
+
+모델(VGGT-1B)을 한 번만 로드해 GPU에 올려 둔 채로, 로컬 Unix 소켓으로 들어오는
+demo_colmap.py 인자(scene 디렉토리 등)를 순서대로 처리한다.
+짧은 P2/P4 실행에서 매번 반복되던 모델 생성 / 체크포인트 로드 / CUDA 초기화를 없앰.
+
+프로토콜: 연결마다 JSON 한 줄 요청 → JSON 한 줄 응답
+    {"argv": [...demo_colmap.py 인자...], "cwd": "..."} → {"ok": true, "elapsed": 12.3}
+    {"cmd": "ping"} / {"cmd": "shutdown"}
+요청은 한 번에 하나씩 처리되고, 대기 중인 요청은 소켓 backlog에서 순서를 기다린다.
+
+사용법:
+    # 체크포인트를 safetensors로 한 번 변환 (이후 mmap 로드)
+    PYTHONPATH=./libs/vggt python vggt_server.py convert --output ./checkpoints/vggt_1b.safetensors
+
+    # 워커 시작
+    PYTHONPATH=./libs/vggt python vggt_server.py serve --socket /tmp/vggt_server.sock \\
+        --checkpoint ./checkpoints/vggt_1b.safetensors
+
+    # scene 처리 요청 (둘 다 동일)
+    python vggt_server.py submit --socket /tmp/vggt_server.sock -- --scene_dir ./datasets/DTU/scan1_standard
+    PYTHONPATH=./libs/vggt python demo_colmap.py --server_socket /tmp/vggt_server.sock --scene_dir ...
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+import traceback
+
+DEFAULT_SOCKET = "/tmp/vggt_server.sock"
+
+
+def _send_request(socket_path: str, request: dict) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+    if not line:
+        return {"ok": False, "error": "worker closed the connection"}
+    return json.loads(line)
+
+
+def submit_scene(socket_path: str, argv: list) -> bool:
+    """
+    demo_colmap.py 인자를 워커에 보내고 처리가 끝날 때까지 대기
+
+    상대 경로는 워커가 요청자의 현재 디렉토리 기준으로 해석함
+    """
+    print(f"📨 VGGT 워커에 요청: {socket_path} {' '.join(argv)}")
+    response = _send_request(socket_path, {"argv": list(argv), "cwd": os.getcwd()})
+    if response.get("ok"):
+        print(f"✅ 완료: {response['elapsed']:.1f}s")
+        return True
+    print(f"❌ 실패: {response.get('error')}")
+    return False
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = {}
+        try:
+            request = json.loads(line)
+            response = self.server.worker.handle(request)
+        except (Exception, SystemExit) as e:  # 잘못된 인자(argparse SystemExit)도 워커는 계속 동작
+            traceback.print_exc()
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+        if request.get("cmd") == "shutdown":
+            # serve_forever를 다른 스레드에서 멈춰야 함 (현재 스레드에서 호출하면 deadlock)
+            import threading
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class VGGTWorker:
+    """모델을 상주시키고 demo_colmap.demo_fn을 요청마다 호출"""
+
+    def __init__(self, checkpoint: str = None, device: str = "auto", use_compile: bool = False):
+        import torch
+        import demo_colmap
+
+        self.torch = torch
+        self.demo_colmap = demo_colmap
+        self.checkpoint = checkpoint
+        self.device = demo_colmap.select_device(device)
+
+        start = time.time()
+        self.model = demo_colmap.load_model(self.device, checkpoint, use_compile=use_compile)
+        print(f"🧠 모델 로드 완료 ({self.device}, {time.time() - start:.1f}s)")
+        self.num_processed = 0
+
+    def handle(self, request: dict) -> dict:
+        cmd = request.get("cmd", "run")
+        if cmd == "ping":
+            return {"ok": True, "num_processed": self.num_processed}
+        if cmd == "shutdown":
+            return {"ok": True}
+        if cmd != "run":
+            return {"ok": False, "error": f"unknown cmd: {cmd}"}
+
+        args = self.demo_colmap.parse_args(request["argv"])
+        if args.checkpoint is not None and args.checkpoint != self.checkpoint:
+            print(f"⚠️  요청의 --checkpoint {args.checkpoint} 무시 (워커 모델: {self.checkpoint or 'hub'})")
+
+        cwd = os.getcwd()
+        start = time.time()
+        try:
+            os.chdir(request.get("cwd", cwd))
+            with self.torch.no_grad():
+                self.demo_colmap.demo_fn(args, model=self.model)
+        finally:
+            os.chdir(cwd)
+            if self.torch.cuda.is_available():
+                self.torch.cuda.empty_cache()
+
+        self.num_processed += 1
+        return {"ok": True, "elapsed": time.time() - start, "scene_dir": args.scene_dir or args.scene_list}
+
+
+def serve(socket_path: str, checkpoint: str = None, device: str = "auto", use_compile: bool = False):
+    if os.path.exists(socket_path):
+        try:
+            _send_request(socket_path, {"cmd": "ping"})
+            raise RuntimeError(f"A worker is already listening on {socket_path}")
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(socket_path)  # 이전 워커가 남긴 소켓 파일
+
+    worker = VGGTWorker(checkpoint, device, use_compile)
+    with socketserver.UnixStreamServer(socket_path, _RequestHandler) as server:
+        server.worker = worker
+        print(f"🚀 VGGT 워커 대기 중: {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+    print(f"👋 VGGT 워커 종료 ({worker.num_processed}개 scene 처리)")
+
+
+def convert(output: str, checkpoint: str = None):
+    """hub(또는 .pt) 체크포인트를 mmap 로드 가능한 safetensors로 저장"""
+    import demo_colmap
+    from safetensors.torch import save_file
+
+    state_dict = demo_colmap.load_vggt_state_dict(checkpoint)
+    state_dict = {k: v.contiguous() for k, v in state_dict.items()}
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    save_file(state_dict, output)
+    print(f"💾 저장: {output} ({os.path.getsize(output) / 1024 ** 3:.2f} GB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VGGT resident inference worker for demo_colmap.py")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="모델을 로드하고 요청 대기")
+    serve_parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Unix 소켓 경로")
+    serve_parser.add_argument("--checkpoint", type=str, default=None,
+                              help="로컬 체크포인트 (.safetensors / .pt, None = hub에서 다운로드)")
+    serve_parser.add_argument("--device", type=str, default="auto", help="auto / cuda / cuda:N / cpu")
+    serve_parser.add_argument("--compile", action="store_true", help="aggregator / head를 torch.compile")
+
+    submit_parser = subparsers.add_parser("submit", help="demo_colmap.py 인자로 scene 처리 요청")
+    submit_parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Unix 소켓 경로")
+    submit_parser.add_argument("demo_args", nargs=argparse.REMAINDER, help="-- 뒤에 demo_colmap.py 인자")
+
+    stop_parser = subparsers.add_parser("stop", help="워커 종료")
+    stop_parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Unix 소켓 경로")
+
+    convert_parser = subparsers.add_parser("convert", help="체크포인트를 safetensors로 변환")
+    convert_parser.add_argument("--output", type=str, required=True, help="저장할 .safetensors 경로")
+    convert_parser.add_argument("--checkpoint", type=str, default=None, help="원본 .pt (None = hub)")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.checkpoint, args.device, args.compile)
+    elif args.command == "submit":
+        demo_args = args.demo_args[1:] if args.demo_args[:1] == ["--"] else args.demo_args
+        sys.exit(0 if submit_scene(args.socket, demo_args) else 1)
+    elif args.command == "stop":
+        print(_send_request(args.socket, {"cmd": "shutdown"}))
+    elif args.command == "convert":
+        convert(args.output, args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()